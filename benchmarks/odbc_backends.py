@@ -0,0 +1,114 @@
+"""Compare the pyodbc and arrow-odbc reader backends against a live SQL Server.
+
+Each backend is run in its own subprocess so that peak RSS is measured
+independently. Only the SQL Server read is timed; nothing is uploaded.
+
+Example:
+    python benchmarks/odbc_backends.py --sql-server my-server --sql-database my-db \\
+        --sql-query "SELECT * FROM dbo.wide_table" --batch-size 100000
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import time
+
+from sql_to_bq.transfer import READER_BACKENDS, build_connection_string
+
+
+def peak_rss_mb() -> float:
+    """Return the peak resident set size of this process in MB."""
+    try:
+        import resource
+    except ImportError:
+        import psutil
+        return psutil.Process().memory_info().peak_wset / (1024 * 1024)
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and in kilobytes elsewhere
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def run_backend(args: argparse.Namespace) -> dict:
+    """Read the whole query with one backend and return its measurements."""
+    import polars as pl
+
+    conn_str = build_connection_string(
+        args.sql_server, args.sql_database, args.sql_username, args.sql_password, args.sql_driver
+    )
+
+    start_time = time.time()
+    rows = 0
+    bytes_read = 0
+
+    if args.backend == "arrow-odbc":
+        from sql_to_bq.transfer import _read_arrow_batches
+        batches = _read_arrow_batches(
+            conn_str,
+            args.sql_query,
+            args.batch_size,
+            max_text_size=args.odbc_max_text_size,
+            max_binary_size=args.odbc_max_binary_size,
+        )
+    else:
+        import pyodbc
+        batches = pl.read_database(
+            query=args.sql_query,
+            connection=pyodbc.connect(conn_str),
+            iter_batches=True,
+            batch_size=args.batch_size,
+        )
+
+    for df in batches:
+        rows += df.shape[0]
+        bytes_read += df.estimated_size()
+
+    elapsed = time.time() - start_time
+    return {
+        "backend": args.backend,
+        "rows": rows,
+        "seconds": elapsed,
+        "rows_per_second": rows / elapsed if elapsed > 0 else 0,
+        "mb_read": bytes_read / (1024 * 1024),
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark SQL Server reader backends')
+    parser.add_argument('--sql-server', required=True, help='SQL Server hostname')
+    parser.add_argument('--sql-database', required=True, help='SQL Server database name')
+    parser.add_argument('--sql-query', required=True, help='Query to read')
+    parser.add_argument('--sql-username', help='SQL Server username (if not using Windows auth)')
+    parser.add_argument('--sql-password', help='SQL Server password (if not using Windows auth)')
+    parser.add_argument('--sql-driver', default='ODBC Driver 17 for SQL Server', help='ODBC driver name')
+    parser.add_argument('--batch-size', type=int, default=100000, help='Rows per fetched batch')
+    parser.add_argument('--odbc-max-text-size', type=int, help='Upper bound for (N)VARCHAR(MAX) values with arrow-odbc')
+    parser.add_argument('--odbc-max-binary-size', type=int, help='Upper bound for VARBINARY(MAX) values with arrow-odbc')
+    parser.add_argument('--backends', default=','.join(READER_BACKENDS), help='Comma-separated backends to compare')
+    parser.add_argument('--backend', help=argparse.SUPPRESS)
+
+    args = parser.parse_args()
+
+    if args.backend:
+        print(json.dumps(run_backend(args)))
+        return
+
+    results = []
+    for backend in args.backends.split(","):
+        command = [sys.executable, __file__, *sys.argv[1:], "--backend", backend]
+        completed = subprocess.run(command, capture_output=True, text=True)
+        if completed.returncode != 0:
+            print(f"{backend}: failed\n{completed.stderr}", file=sys.stderr)
+            continue
+        results.append(json.loads(completed.stdout.strip().splitlines()[-1]))
+
+    print(f"{'backend':<12} {'rows':>12} {'seconds':>10} {'rows/s':>12} {'MB read':>10} {'peak RSS MB':>12}")
+    for r in results:
+        print(f"{r['backend']:<12} {r['rows']:>12} {r['seconds']:>10.2f} {r['rows_per_second']:>12.0f} "
+              f"{r['mb_read']:>10.1f} {r['peak_rss_mb']:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
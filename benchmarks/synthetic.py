@@ -0,0 +1,264 @@
+"""In-process stand-ins for SQL Server and BigQuery used by the pipeline benchmark.
+
+`SyntheticConnection` behaves like a pyodbc connection to a table of generated
+rows. It understands the statements SQLServerToBigQueryTransfer issues (catalog
+row counts, key lookups, OFFSET/FETCH and TOP keyset pages, and plain SELECTs
+for streaming), so the real chunk loop runs unchanged. `FakeBigQueryClient`
+accepts load jobs and records the bytes it was sent, and `FakeWriteClient` does
+the same for Storage Write API appends.
+"""
+
+import datetime
+import re
+import time
+import uuid
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+COLUMN_TYPES = ("int", "float", "decimal", "text", "datetime")
+
+# SQL Server type name, precision and scale reported for each column type
+SQL_TYPES = {
+    "int": ("int", 10, 0),
+    "float": ("float", 53, 0),
+    "decimal": ("decimal", 18, 2),
+    "text": ("nvarchar", 0, 0),
+    "datetime": ("datetime2", 27, 7),
+}
+
+OFFSET_PATTERN = re.compile(r"OFFSET\s+(\d+)\s+ROWS\s+FETCH\s+NEXT\s+(\d+)\s+ROWS", re.IGNORECASE)
+TOP_PATTERN = re.compile(r"SELECT\s+TOP\s+\((\d+)\)", re.IGNORECASE)
+
+
+class SyntheticTable:
+    """A table of `rows` generated rows: an INT `id` key plus columns of the given types.
+
+    `text` columns hold strings of `text_width` characters. Rows are generated on
+    demand, so the table costs no memory until it is fetched.
+    """
+
+    def __init__(self, rows: int, columns: Sequence[str] = ("int", "float", "text", "datetime"), text_width: int = 32):
+        unknown = [c for c in columns if c not in COLUMN_TYPES]
+        if unknown:
+            raise ValueError(f"Unknown column types: {', '.join(unknown)}")
+
+        self.rows = rows
+        self.columns = list(columns)
+        self.text_width = text_width
+        self.names = ["id"] + [f"{kind}_{i}" for i, kind in enumerate(self.columns)]
+
+        python_types = {"int": int, "float": float, "decimal": Decimal, "text": str, "datetime": datetime.datetime}
+        # Like pyodbc, report precision and scale so Polars can type DECIMAL columns
+        self.description = [("id", int, None, 10, 10, 0, False)] + [
+            (name, python_types[kind], None, SQL_TYPES[kind][1], SQL_TYPES[kind][1], SQL_TYPES[kind][2], True)
+            for name, kind in zip(self.names[1:], self.columns)
+        ]
+        self.metadata = [("id", "int", 10, 0, 0)] + [
+            (name, *SQL_TYPES[kind], 1) for name, kind in zip(self.names[1:], self.columns)
+        ]
+        self._epoch = datetime.datetime(2024, 1, 1)
+        self._text = "x" * text_width
+
+    def row(self, i: int) -> Tuple[Any, ...]:
+        values: List[Any] = [i]
+        for kind in self.columns:
+            if kind == "int":
+                values.append(i * 7)
+            elif kind == "float":
+                values.append(i * 0.5)
+            elif kind == "decimal":
+                values.append(Decimal(i) / 100)
+            elif kind == "text":
+                values.append(f"{i:010d}{self._text}"[:self.text_width])
+            else:
+                values.append(self._epoch + datetime.timedelta(seconds=i))
+        return tuple(values)
+
+
+class SyntheticCursor:
+    """DB-API cursor over a SyntheticTable, with optional per-statement latency."""
+
+    def __init__(self, table: SyntheticTable, query_latency: float = 0.0):
+        self.table = table
+        self.query_latency = query_latency
+        self.description: Optional[List[Tuple[Any, ...]]] = None
+        self.rowcount = -1
+        self._pending: List[Tuple[Any, ...]] = []
+        self._range: Optional[range] = None
+
+    # pyodbc takes parameters positionally or as one sequence; Polars passes them as `parameters`
+    def execute(self, query: str, *args: Any, parameters: Optional[Sequence[Any]] = None) -> "SyntheticCursor":
+        if parameters is not None:
+            parameters = list(parameters)
+        elif len(args) == 1 and isinstance(args[0], (list, tuple)):
+            parameters = list(args[0])
+        else:
+            parameters = list(args)
+
+        if self.query_latency:
+            time.sleep(self.query_latency)
+
+        self._pending = []
+        self._range = None
+        rows = self.table.rows
+
+        if "COUNT(*)" in query or "dm_db_partition_stats" in query:
+            self._result([("count", int)], [(rows,)])
+        elif "sys.indexes" in query:
+            self._result([("index_id", int), ("name", str)], [(1, "id")])
+        elif "sys.columns" in query or "dm_exec_describe_first_result_set" in query:
+            self._result(
+                [("name", str), ("type", str), ("precision", int), ("scale", int), ("is_nullable", bool)],
+                self.table.metadata
+            )
+        elif "MIN(" in query and "MAX(" in query:
+            self._result([("low", int), ("high", int)], [(0, rows - 1) if rows else (None, None)])
+        else:
+            start, stop = 0, rows
+            offset = OFFSET_PATTERN.search(query)
+            top = TOP_PATTERN.search(query)
+            if offset:
+                start = int(offset.group(1))
+                stop = min(start + int(offset.group(2)), rows)
+            elif top:
+                # Keyset pages seek past the last id, which is the only parameter
+                start = parameters[-1] + 1 if parameters else 0
+                stop = min(start + int(top.group(1)), rows)
+            self.description = self.table.description
+            self._range = range(start, max(start, stop))
+            self.rowcount = len(self._range)
+        return self
+
+    def _result(self, columns: List[Tuple[str, type]], rows: List[Tuple[Any, ...]]) -> None:
+        self.description = [(name, kind, None, None, None, None, True) for name, kind in columns]
+        self._pending = rows
+        self.rowcount = len(rows)
+
+    def fetchmany(self, size: int = 1) -> List[Tuple[Any, ...]]:
+        if self._range is not None:
+            chunk, self._range = self._range[:size], self._range[size:]
+            return [self.table.row(i) for i in chunk]
+        rows, self._pending = self._pending[:size], self._pending[size:]
+        return rows
+
+    def fetchall(self) -> List[Tuple[Any, ...]]:
+        if self._range is not None:
+            return self.fetchmany(len(self._range))
+        return self.fetchmany(len(self._pending))
+
+    def fetchone(self) -> Optional[Tuple[Any, ...]]:
+        rows = self.fetchmany(1)
+        return rows[0] if rows else None
+
+    def close(self) -> None:
+        self._pending = []
+        self._range = None
+
+
+class SyntheticConnection:
+    """pyodbc-like connection whose cursors read a SyntheticTable."""
+
+    def __init__(self, table: SyntheticTable, query_latency: float = 0.0):
+        self.table = table
+        self.query_latency = query_latency
+
+    def cursor(self) -> SyntheticCursor:
+        return SyntheticCursor(self.table, self.query_latency)
+
+    def close(self) -> None:
+        pass
+
+
+class FakeLoadJob:
+    """Finished load job with an optional simulated completion delay."""
+
+    def __init__(self, latency: float = 0.0):
+        self.job_id = f"bench-{uuid.uuid4()}"
+        self.latency = latency
+        self._submitted = time.time()
+
+    def done(self) -> bool:
+        return time.time() - self._submitted >= self.latency
+
+    def result(self) -> "FakeLoadJob":
+        remaining = self.latency - (time.time() - self._submitted)
+        if remaining > 0:
+            time.sleep(remaining)
+        return self
+
+
+class FakeBigQueryClient:
+    """BigQuery client stand-in that reads every uploaded file and records its size."""
+
+    def __init__(self, job_latency: float = 0.0):
+        self.job_latency = job_latency
+        self.load_jobs = 0
+        self.bytes_loaded = 0
+
+    def load_table_from_file(self, file_obj: Any, destination: str, job_config: Any = None) -> FakeLoadJob:
+        # Read the whole file as the real client would while uploading it
+        while True:
+            block = file_obj.read(1024 * 1024)
+            if not block:
+                break
+            self.bytes_loaded += len(block)
+        self.load_jobs += 1
+        return FakeLoadJob(self.job_latency)
+
+    def get_table(self, table_ref: str) -> Dict[str, Any]:
+        # The storage-write sink only checks that the table exists
+        return {"table_ref": table_ref}
+
+    def query(self, statement: str) -> FakeLoadJob:
+        if not statement.startswith("TRUNCATE TABLE"):
+            raise NotImplementedError("The benchmark client only supports load jobs and truncation")
+        return FakeLoadJob()
+
+
+class FakeWriteStream:
+    def __init__(self, name: str):
+        self.name = name
+
+
+class FakeAppendResponse:
+    """Successful AppendRows response."""
+
+    class error:
+        code = 0
+        message = ""
+
+    row_errors: List[Any] = []
+
+
+class FakeCommitResponse:
+    stream_errors: List[Any] = []
+
+
+class FakeWriteClient:
+    """Storage Write API client stand-in that records the bytes appended to each stream."""
+
+    def __init__(self, append_latency: float = 0.0):
+        self.append_latency = append_latency
+        self.appends = 0
+        self.bytes_appended = 0
+        self.streams: List[str] = []
+
+    def create_write_stream(self, parent: str, write_stream: Any) -> FakeWriteStream:
+        self.streams.append(f"{parent}/streams/{len(self.streams)}")
+        return FakeWriteStream(self.streams[-1])
+
+    def append_rows(self, requests: Any, metadata: Any = ()) -> List[FakeAppendResponse]:
+        responses = []
+        for request in requests:
+            self.bytes_appended += len(request.arrow_rows.rows.serialized_record_batch)
+            self.appends += 1
+            responses.append(FakeAppendResponse())
+        if self.append_latency:
+            time.sleep(self.append_latency)
+        return responses
+
+    def finalize_write_stream(self, name: str) -> None:
+        pass
+
+    def batch_commit_write_streams(self, request: Any) -> FakeCommitResponse:
+        return FakeCommitResponse()
@@ -0,0 +1,218 @@
+"""Benchmark the full transfer pipeline against synthetic SQL Server and BigQuery stand-ins.
+
+SQLServerToBigQueryTransfer runs unchanged on top of an in-process source that
+generates rows and a BigQuery client that only records the bytes it receives
+(see synthetic.py), so the numbers isolate this package's own read, convert,
+encode and upload overhead from network and server time. Add latency with
+--query-latency and --job-latency to see how the pipeline hides it. --sink
+compares load jobs with Storage Write API appends and local Parquet output.
+
+Each configuration runs in its own subprocess so that peak RSS is measured
+independently. Save a run with --output and pass it to --compare on a later
+commit to see the change in throughput per configuration.
+
+Parallel reads are not covered: their worker processes open their own pyodbc
+connections and cannot use the synthetic source.
+
+Example:
+    python benchmarks/transfer_pipeline.py --rows 100000,1000000 --chunk-sizes 10000,100000 \\
+        --modes offset,keyset,stream --output baseline.json
+"""
+
+import argparse
+import json
+import logging
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from synthetic import (  # noqa: E402
+    COLUMN_TYPES, FakeBigQueryClient, FakeWriteClient, SyntheticConnection, SyntheticTable
+)
+
+BENCHMARK_MODES = ("offset", "keyset", "stream")
+BENCHMARK_SINKS = ("load-job", "storage-write", "parquet")
+
+
+def run_config(args: argparse.Namespace) -> dict:
+    """Run one transfer against the synthetic source and return its measurements."""
+    from sql_to_bq.transfer import SQLServerToBigQueryTransfer
+
+    logging.getLogger("sql-to-bq-transfer").setLevel(logging.WARNING)
+
+    table = SyntheticTable(args.rows, args.columns.split(","), text_width=args.text_width)
+    bq_client = FakeBigQueryClient(job_latency=args.job_latency)
+    write_client = FakeWriteClient(append_latency=args.job_latency)
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        transfer = SQLServerToBigQueryTransfer(
+            sql_server="synthetic",
+            sql_database="synthetic",
+            sql_table="dbo.synthetic",
+            bq_project="benchmark",
+            bq_dataset="benchmark",
+            bq_table="synthetic",
+            chunk_size=args.chunk_size,
+            read_mode=args.mode,
+            key_column="id" if args.mode == "keyset" else None,
+            queue_depth=args.queue_depth,
+            upload_workers=args.upload_workers,
+            max_inflight_jobs=args.max_inflight_jobs,
+            explicit_schema=args.explicit_schema,
+            memory_budget_mb=args.memory_budget,
+            parquet_compression=args.parquet_compression,
+            narrow_types=args.narrow_types,
+            metrics_file=os.path.join(work_dir, "metrics.jsonl"),
+            sink=args.sink,
+            sink_path=os.path.join(work_dir, "dataset") if args.sink == "parquet" else None,
+            sql_conn=SyntheticConnection(table, query_latency=args.query_latency),
+            bq_client=bq_client,
+            bq_write_client=write_client,
+        )
+        result = transfer.transfer_data()
+
+    if not result["success"]:
+        raise RuntimeError(result["error"])
+
+    elapsed = result["time_taken"]
+    if args.sink == "parquet":
+        mb_uploaded = result["mb_written"]
+    else:
+        mb_uploaded = (bq_client.bytes_loaded + write_client.bytes_appended) / (1024 * 1024)
+    return {
+        "config": config_name(args.rows, args.chunk_size, args.mode, args.queue_depth, args.sink),
+        "rows": result["rows_transferred"],
+        "chunk_size": args.chunk_size,
+        "mode": args.mode,
+        "queue_depth": args.queue_depth,
+        "seconds": elapsed,
+        "rows_per_second": result["rows_per_second"],
+        "mb_per_second": result["mb_per_second"],
+        "mb_uploaded": mb_uploaded,
+        "load_jobs": bq_client.load_jobs or write_client.appends,
+        "peak_rss_mb": result.get("peak_rss_mb"),
+        "stage_seconds": {stage: stats["total"] for stage, stats in result["stage_metrics"]["stages"].items()},
+    }
+
+
+def config_name(rows: int, chunk_size: int, mode: str, queue_depth: int, sink: str = "load-job") -> str:
+    name = f"{mode}/rows={rows}/chunk={chunk_size}/queue={queue_depth}"
+    # Load-job runs keep the names that earlier result files were saved with
+    return name if sink == "load-job" else f"{sink}:{name}"
+
+
+def print_results(results: list, baseline: dict) -> None:
+    stages = []
+    for r in results:
+        stages.extend(stage for stage in r["stage_seconds"] if stage not in stages)
+
+    header = f"{'config':<58} {'rows/s':>10} {'MB/s':>8} {'MB up':>8} {'jobs':>5} {'peak MB':>8}"
+    header += "".join(f" {stage:>9}" for stage in stages)
+    if baseline:
+        header += f" {'vs base':>8}"
+    print(header)
+
+    for r in results:
+        line = (f"{r['config']:<58} {r['rows_per_second']:>10.0f} {r['mb_per_second']:>8.1f} "
+                f"{r['mb_uploaded']:>8.1f} {r['load_jobs']:>5} {r['peak_rss_mb'] or 0:>8.1f}")
+        line += "".join(f" {r['stage_seconds'].get(stage, 0):>9.3f}" for stage in stages)
+        if baseline:
+            before = baseline.get(r["config"])
+            if before and before["rows_per_second"] > 0:
+                line += f" {(r['rows_per_second'] / before['rows_per_second'] - 1) * 100:>+7.1f}%"
+            else:
+                line += f" {'-':>8}"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the transfer pipeline with a synthetic source and sink')
+    parser.add_argument('--rows', default='100000,1000000', help='Comma-separated table sizes in rows')
+    parser.add_argument('--chunk-sizes', default='10000,100000', help='Comma-separated chunk sizes in rows')
+    parser.add_argument('--modes', default=','.join(BENCHMARK_MODES), help='Comma-separated read modes to run')
+    parser.add_argument('--queue-depths', default='0,2', help='Comma-separated queue depths (0 is serial)')
+    parser.add_argument('--upload-workers', type=int, default=1, help='Upload threads for pipelined runs')
+    parser.add_argument('--max-inflight-jobs', type=int, default=1, help='Load jobs allowed in flight at once')
+    parser.add_argument('--columns', default='int,float,text,datetime',
+                        help=f'Comma-separated column types besides the id key ({", ".join(COLUMN_TYPES)})')
+    parser.add_argument('--text-width', type=int, default=32, help='Characters per text value')
+    parser.add_argument('--explicit-schema', action='store_true', help='Cast chunks to an explicit schema')
+    parser.add_argument('--memory-budget', type=int, help='Memory budget in MB for adaptive chunk sizes')
+    parser.add_argument('--parquet-compression', help='Parquet codec for uploaded chunks')
+    parser.add_argument('--narrow-types', action='store_true', help='Narrow column types before encoding')
+    parser.add_argument('--sink', default='load-job', choices=BENCHMARK_SINKS, help='Where chunks are written')
+    parser.add_argument('--query-latency', type=float, default=0.0, help='Simulated seconds per SQL statement')
+    parser.add_argument('--job-latency', type=float, default=0.0, help='Simulated seconds per load job or append')
+    parser.add_argument('--output', help='Write the results as JSON to this file')
+    parser.add_argument('--compare', help='Results file from an earlier run to compare throughput against')
+    parser.add_argument('--run', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--chunk-size', type=int, help=argparse.SUPPRESS)
+    parser.add_argument('--mode', help=argparse.SUPPRESS)
+    parser.add_argument('--queue-depth', type=int, help=argparse.SUPPRESS)
+
+    args = parser.parse_args()
+
+    if args.run:
+        args.rows = int(args.rows)
+        print(json.dumps(run_config(args)))
+        return
+
+    for mode in args.modes.split(","):
+        if mode not in BENCHMARK_MODES:
+            parser.error(f"--modes must be drawn from {', '.join(BENCHMARK_MODES)}")
+    if args.narrow_types and args.sink != "load-job":
+        parser.error("--narrow-types only applies to --sink load-job")
+
+    baseline = {}
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = {r["config"]: r for r in json.load(f)["results"]}
+
+    # Options shared by every configuration are passed through to each subprocess
+    shared = [
+        "--upload-workers", str(args.upload_workers),
+        "--max-inflight-jobs", str(args.max_inflight_jobs),
+        "--columns", args.columns,
+        "--text-width", str(args.text_width),
+        "--query-latency", str(args.query_latency),
+        "--job-latency", str(args.job_latency),
+        "--sink", args.sink,
+    ]
+    if args.explicit_schema:
+        shared.append("--explicit-schema")
+    if args.narrow_types:
+        shared.append("--narrow-types")
+    if args.memory_budget is not None:
+        shared.extend(["--memory-budget", str(args.memory_budget)])
+    if args.parquet_compression:
+        shared.extend(["--parquet-compression", args.parquet_compression])
+
+    results = []
+    for rows in args.rows.split(","):
+        for chunk_size in args.chunk_sizes.split(","):
+            for mode in args.modes.split(","):
+                for queue_depth in args.queue_depths.split(","):
+                    name = config_name(int(rows), int(chunk_size), mode, int(queue_depth), args.sink)
+                    command = [
+                        sys.executable, __file__, "--run", *shared,
+                        "--rows", rows, "--chunk-size", chunk_size, "--mode", mode, "--queue-depth", queue_depth,
+                    ]
+                    completed = subprocess.run(command, capture_output=True, text=True)
+                    if completed.returncode != 0:
+                        print(f"{name}: failed\n{completed.stderr}", file=sys.stderr)
+                        continue
+                    results.append(json.loads(completed.stdout.strip().splitlines()[-1]))
+
+    print_results(results, baseline)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"created": time.time(), "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""Durable transfer checkpoints used to resume long-running transfers."""
+
+import base64
+import datetime
+import json
+import logging
+import os
+import threading
+import time
+from decimal import Decimal
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger("sql-to-bq-transfer")
+
+
+def encode_value(value: Any) -> Any:
+    """Encode a key value as JSON, tagging types JSON cannot represent."""
+    if isinstance(value, datetime.datetime):
+        return {"type": "datetime", "value": value.isoformat()}
+    if isinstance(value, datetime.date):
+        return {"type": "date", "value": value.isoformat()}
+    if isinstance(value, datetime.time):
+        return {"type": "time", "value": value.isoformat()}
+    if isinstance(value, Decimal):
+        return {"type": "decimal", "value": str(value)}
+    if isinstance(value, bytes):
+        return {"type": "bytes", "value": base64.b64encode(value).decode("ascii")}
+    return value
+
+
+def decode_value(value: Any) -> Any:
+    """Reverse `encode_value`."""
+    if not isinstance(value, dict):
+        return value
+    kind, raw = value["type"], value["value"]
+    if kind == "datetime":
+        return datetime.datetime.fromisoformat(raw)
+    if kind == "date":
+        return datetime.date.fromisoformat(raw)
+    if kind == "time":
+        return datetime.time.fromisoformat(raw)
+    if kind == "decimal":
+        return Decimal(raw)
+    if kind == "bytes":
+        return base64.b64decode(raw)
+    raise ValueError(f"Unknown checkpoint value type: {kind}")
+
+
+def encode_position(position: Any) -> Any:
+    """Encode an offset or a key tuple for the checkpoint file."""
+    if isinstance(position, (list, tuple)):
+        return [encode_value(v) for v in position]
+    return position
+
+
+def decode_position(position: Any) -> Any:
+    """Reverse `encode_position`, returning key positions as tuples."""
+    if isinstance(position, list):
+        return tuple(decode_value(v) for v in position)
+    return position
+
+
+class Checkpoint:
+    """Record of the chunks whose load jobs have committed, rewritten atomically after each one.
+
+    Chunks are numbered in read order. Commits may arrive out of order when uploads
+    run concurrently, so only the contiguous prefix of committed chunks advances the
+    saved position; resuming from it never skips or duplicates a chunk.
+    """
+
+    def __init__(self, path: str, source: Dict[str, Any]):
+        self.path = path
+        self.source = source
+        self.position: Any = None
+        self.rows_loaded = 0
+        self.chunks_loaded = 0
+        self.last_job_id: Optional[str] = None
+        self.completed = False
+
+        self._pending: Dict[int, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path: str) -> "Checkpoint":
+        with open(path) as f:
+            state = json.load(f)
+
+        checkpoint = cls(path, state["source"])
+        checkpoint.position = decode_position(state["position"])
+        checkpoint.rows_loaded = state["rows_loaded"]
+        checkpoint.chunks_loaded = state["chunks_loaded"]
+        # Files written by older versions kept every job id
+        legacy_job_ids = state.get("job_ids") or [None]
+        checkpoint.last_job_id = state.get("last_job_id", legacy_job_ids[-1])
+        checkpoint.completed = state["completed"]
+        return checkpoint
+
+    def mark_committed(self, seq: int, position: Any, rows: int, job_id: Optional[str]) -> None:
+        """Record that chunk `seq` has committed and save if the committed prefix advanced."""
+        with self._lock:
+            self._pending[seq] = {"position": position, "rows": rows, "job_id": job_id}
+
+            advanced = False
+            while self.chunks_loaded in self._pending:
+                chunk = self._pending.pop(self.chunks_loaded)
+                self.position = chunk["position"]
+                self.rows_loaded += chunk["rows"]
+                self.chunks_loaded += 1
+                if chunk["job_id"]:
+                    self.last_job_id = chunk["job_id"]
+                advanced = True
+
+            if advanced:
+                self._save()
+
+    def mark_completed(self) -> None:
+        with self._lock:
+            self.completed = True
+            self._save()
+
+    def save(self) -> None:
+        with self._lock:
+            self._save()
+
+    def _save(self) -> None:
+        state = {
+            "source": self.source,
+            "position": encode_position(self.position),
+            "rows_loaded": self.rows_loaded,
+            "chunks_loaded": self.chunks_loaded,
+            "last_job_id": self.last_job_id,
+            "completed": self.completed,
+            "updated_at": time.time(),
+        }
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        # Write then rename so a crash mid-write never leaves a truncated checkpoint
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "w") as f:
+            json.dump(state, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.path)
+
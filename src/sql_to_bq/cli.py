@@ -1,8 +1,24 @@
 """Command-line interface for SQL Server to BigQuery transfer."""
 
 import argparse
+import json
+import logging
 import sys
-from .transfer import SQLServerToBigQueryTransfer, logger
+from .encoding import PARQUET_COMPRESSIONS
+from .orchestrator import TransferOrchestrator
+from .sinks import SINKS, STORAGE_WRITE_STREAMS
+from .transfer import SQLServerToBigQueryTransfer, READ_MODES, READER_BACKENDS, WRITE_MODES, logger
+
+def configure_logging(log_file="transfer.log"):
+    """Log to stdout and, unless `log_file` is empty, append to `log_file`."""
+    handlers = [logging.StreamHandler(sys.stdout)]
+    if log_file:
+        handlers.insert(0, logging.FileHandler(log_file))
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        handlers=handlers
+    )
 
 def main():
     """Run the transfer from command line."""
@@ -11,23 +27,87 @@ def main():
     parser.add_argument('--sql-database', required=True, help='SQL Server database name')
     parser.add_argument('--sql-table', help='SQL Server table name')
     parser.add_argument('--sql-query', help='Custom SQL query to select data')
+    parser.add_argument('--columns', help='Comma-separated columns to select; every other column stays on the server')
+    parser.add_argument('--exclude-columns', help='Comma-separated columns to leave out, such as wide audit columns')
+    parser.add_argument('--where', help='SQL Server predicate that rows of the table or query must match, pushed into every generated query')
+    parser.add_argument('--cast', action='append', default=[], metavar='COLUMN=TYPE', help='Cast a column to a SQL Server type in the generated SELECT, e.g. amount=DECIMAL(18,2); repeatable')
     parser.add_argument('--sql-username', help='SQL Server username (if not using Windows auth)')
     parser.add_argument('--sql-password', help='SQL Server password (if not using Windows auth)')
-    parser.add_argument('--bq-project', required=True, help='BigQuery project ID')
-    parser.add_argument('--bq-dataset', required=True, help='BigQuery dataset name')
-    parser.add_argument('--bq-table', required=True, help='BigQuery table name')
-    parser.add_argument('--key-path', required=True, help='Path to service account key file')
+    parser.add_argument('--bq-project', help='BigQuery project ID (required unless --sink parquet)')
+    parser.add_argument('--bq-dataset', help='BigQuery dataset name (required unless --sink parquet)')
+    parser.add_argument('--bq-table', help='BigQuery table name (required unless --sink parquet)')
+    parser.add_argument('--key-path', help='Path to service account key file (required unless --sink parquet)')
+    parser.add_argument('--sink', default='load-job', choices=SINKS, help='Where chunks are written: BigQuery load jobs, the BigQuery Storage Write API, or a local Parquet dataset')
+    parser.add_argument('--sink-path', help='Directory of the Parquet dataset written by --sink parquet')
+    parser.add_argument('--sink-partition-by', help='Comma-separated columns to Hive-partition the --sink parquet dataset by')
+    parser.add_argument('--storage-write-stream', default='committed', choices=STORAGE_WRITE_STREAMS, help='Storage Write API stream type: committed rows are visible per chunk, pending rows all at once when the transfer ends (with --write-mode append or merge)')
     parser.add_argument('--chunk-size', type=int, default=100000, help='Chunk size for processing')
-    parser.add_argument('--total-rows', type=int,help='Total rows of returned by the table or sql query')
-    parser.add_argument('--write-mode', type=str, default='truncate_append', help='Write mode for BigQuery table (truncate_append or append)')
+    parser.add_argument('--memory-budget', type=int, help='Memory budget in MB; chunk sizes start at --chunk-size and adapt to stay under it')
+    parser.add_argument('--total-rows', type=int, help='Approximate rows returned by the table or sql query, used for progress reporting')
+    parser.add_argument('--exact-count', action='store_true', help='Run a COUNT(*) over the source for progress reporting instead of using the catalog estimate')
+    parser.add_argument('--write-mode', type=str, default='truncate_append', choices=WRITE_MODES, help='Write mode for BigQuery table (truncate_append, append or merge)')
+    parser.add_argument('--read-mode', type=str, default='offset', choices=READ_MODES, help='How chunks are read from SQL Server (offset, keyset or stream)')
+    parser.add_argument('--queue-depth', type=int, default=0, help='Chunks buffered between the SQL reader and BigQuery uploaders (0 reads and uploads serially)')
+    parser.add_argument('--upload-workers', type=int, default=1, help='Number of concurrent BigQuery upload workers when --queue-depth is set')
+    parser.add_argument('--parallelism', type=int, default=1, help='Number of key ranges extracted in parallel worker processes')
+    parser.add_argument('--reader-backend', type=str, default='pyodbc', choices=READER_BACKENDS, help='How rows are fetched from SQL Server (pyodbc row fetch or arrow-odbc columnar bulk fetch)')
+    parser.add_argument('--odbc-max-text-size', type=int, help='Upper bound in characters for (N)VARCHAR(MAX) values with the arrow-odbc backend')
+    parser.add_argument('--odbc-max-binary-size', type=int, help='Upper bound in bytes for VARBINARY(MAX) values with the arrow-odbc backend')
+    parser.add_argument('--upload-memory-limit-mb', type=int, default=512, help='Largest encoded chunk kept in memory for upload before spilling to a temporary file')
+    parser.add_argument('--max-inflight-jobs', type=int, default=1, help='BigQuery load jobs kept running at once before waiting on the oldest')
+    parser.add_argument('--staging-dir', help='Spool chunks to Parquet files in this directory and load them in batches')
+    parser.add_argument('--load-batch-mb', type=int, default=1024, help='Target size of each staged load job in MB when --staging-dir is set')
+    parser.add_argument('--parquet-compression', choices=PARQUET_COMPRESSIONS, help='Parquet codec for uploaded chunks (defaults to zstd, or snappy for --staging-dir files)')
+    parser.add_argument('--parquet-compression-level', type=int, help='Compression level for zstd, gzip or brotli')
+    parser.add_argument('--parquet-row-group-size', type=int, help='Rows per Parquet row group')
+    parser.add_argument('--no-parquet-dictionary', action='store_true', help='Disable Parquet dictionary encoding')
+    parser.add_argument('--no-parquet-statistics', action='store_true', help='Do not write Parquet column statistics')
+    parser.add_argument('--narrow-types', action='store_true', help='Downcast integers that fit in 32 bits and make low-cardinality strings categorical before encoding (load-job sink only)')
+    parser.add_argument('--explicit-schema', action='store_true', help='Build the BigQuery schema from SQL Server column metadata instead of autodetecting it per chunk')
+    parser.add_argument('--schema-cache-dir', help='Directory to cache derived schemas in, one file per source')
+    parser.add_argument('--checkpoint-file', help='JSON file recording progress after each committed chunk')
+    parser.add_argument('--resume', action='store_true', help='Continue from --checkpoint-file in append mode instead of starting over')
+    parser.add_argument('--watermark-column', help='Only transfer rows whose value in this column (rowversion, modified date or identity) is past the stored watermark')
+    parser.add_argument('--watermark-state-file', help='JSON file storing the last applied watermark for --watermark-column')
+    parser.add_argument('--merge-keys', help='Comma-separated key column(s) matched by --write-mode merge (defaults to the key column(s))')
+    parser.add_argument('--staging-table', help='BigQuery table loaded before a merge (defaults to <bq-table>_staging)')
+    parser.add_argument('--max-retries', type=int, default=3, help='Retries for each chunk read or load job that fails with a transient error (0 disables retries)')
+    parser.add_argument('--retry-backoff', type=float, default=1.0, help='Backoff in seconds before the first retry, doubled on each further retry with random jitter')
+    parser.add_argument('--retry-max-backoff', type=float, default=60.0, help='Longest backoff in seconds between retries')
+    parser.add_argument('--metrics-file', help='Append per-chunk stage timings to this JSON-lines file')
+    parser.add_argument('--prometheus-file', help='Write stage histograms and totals to this Prometheus textfile when the transfer ends')
+    parser.add_argument('--key-column', help='Comma-separated key column(s) for keyset reads (defaults to the clustered or primary key)')
+    parser.add_argument('--plan', action='store_true', help='Print the chunk queries, estimated rows, chunk count and target schema as JSON without reading any rows')
+    parser.add_argument('--log-file', default='transfer.log', help='File the log is appended to as well as stdout (an empty value logs to stdout only)')
 
     args = parser.parse_args()
+    configure_logging(args.log_file)
+
+    if args.sink != "parquet":
+        required = [("--bq-project", args.bq_project), ("--bq-dataset", args.bq_dataset), ("--bq-table", args.bq_table)]
+        # Planning never connects to BigQuery, so it needs no credentials
+        if not args.plan:
+            required.append(("--key-path", args.key_path))
+        missing = [flag for flag, value in required if not value]
+        if missing:
+            parser.error(f"{', '.join(missing)} required for --sink {args.sink}")
+
+    column_casts = {}
+    for rule in args.cast:
+        column, _, cast_type = rule.partition("=")
+        if not column.strip() or not cast_type.strip():
+            parser.error(f"--cast expects COLUMN=TYPE, got {rule!r}")
+        column_casts[column.strip()] = cast_type.strip()
 
     transfer = SQLServerToBigQueryTransfer(
         sql_server=args.sql_server,
         sql_database=args.sql_database,
         sql_table=args.sql_table,
         sql_query=args.sql_query,
+        columns=args.columns,
+        exclude_columns=args.exclude_columns,
+        where=args.where,
+        column_casts=column_casts,
         sql_username=args.sql_username,
         sql_password=args.sql_password,
         bq_project=args.bq_project,
@@ -36,17 +116,107 @@ def main():
         key_path=args.key_path,
         chunk_size=args.chunk_size,
         total_rows=args.total_rows,
-        write_mode=args.write_mode
+        exact_count=args.exact_count,
+        memory_budget_mb=args.memory_budget,
+        metrics_file=args.metrics_file,
+        prometheus_file=args.prometheus_file,
+        parquet_compression=args.parquet_compression,
+        parquet_compression_level=args.parquet_compression_level,
+        parquet_row_group_size=args.parquet_row_group_size,
+        parquet_dictionary=not args.no_parquet_dictionary,
+        parquet_statistics=not args.no_parquet_statistics,
+        narrow_types=args.narrow_types,
+        max_retries=args.max_retries,
+        retry_backoff=args.retry_backoff,
+        retry_max_backoff=args.retry_max_backoff,
+        write_mode=args.write_mode,
+        read_mode=args.read_mode,
+        key_column=args.key_column,
+        queue_depth=args.queue_depth,
+        upload_workers=args.upload_workers,
+        parallelism=args.parallelism,
+        reader_backend=args.reader_backend,
+        odbc_max_text_size=args.odbc_max_text_size,
+        odbc_max_binary_size=args.odbc_max_binary_size,
+        upload_memory_limit_mb=args.upload_memory_limit_mb,
+        max_inflight_jobs=args.max_inflight_jobs,
+        staging_dir=args.staging_dir,
+        load_batch_mb=args.load_batch_mb,
+        explicit_schema=args.explicit_schema,
+        schema_cache_dir=args.schema_cache_dir,
+        checkpoint_file=args.checkpoint_file,
+        resume=args.resume,
+        watermark_column=args.watermark_column,
+        watermark_state_file=args.watermark_state_file,
+        merge_keys=args.merge_keys,
+        staging_table=args.staging_table,
+        sink=args.sink,
+        sink_path=args.sink_path,
+        sink_partition_by=args.sink_partition_by,
+        storage_write_stream=args.storage_write_stream
     )
 
+    if args.plan:
+        try:
+            plan = transfer.plan()
+        except Exception as e:
+            logger.error(f"Planning failed: {e}")
+            sys.exit(1)
+        print(json.dumps(plan, indent=2, default=str))
+        return
+
     result = transfer.transfer_data()
 
     if result["success"]:
         logger.info(f"Successfully transferred {result['rows_transferred']} rows in {result['time_taken']:.2f} seconds")
         logger.info(f"Performance: {result['rows_per_second']:.2f} rows/second")
+        if "mb_written" in result:
+            logger.info(f"Wrote {result['files_written']} Parquet file(s), {result['mb_written']:.2f} MB, to {args.sink_path}")
+        else:
+            logger.info(f"Encoded {result['mb_transferred']:.2f} MB in memory to {result['mb_uploaded']:.2f} MB for upload")
+        if result["retries"]:
+            retries = ", ".join(f"{count} {kind}" for kind, count in result["retries"].items())
+            logger.info(f"Retried {retries} after transient errors, losing {result['retry_seconds']:.2f} seconds")
+        for stage, stage_stats in result["stage_metrics"]["stages"].items():
+            logger.info(f"  {stage}: {stage_stats['total']:.2f}s total, p50 {stage_stats['p50']:.3f}s, "
+                        f"p99 {stage_stats['p99']:.3f}s over {stage_stats['count']} events")
     else:
         logger.error(f"Transfer failed: {result['error']}")
         sys.exit(1)
 
+def batch_main():
+    """Run every transfer in a JSON or YAML manifest."""
+    parser = argparse.ArgumentParser(description='Transfer many SQL Server tables or queries to BigQuery from a manifest')
+    parser.add_argument('manifest', help='JSON or YAML manifest listing the transfers to run')
+    parser.add_argument('--max-workers', type=int, help='Transfers run at once (overrides the manifest, default 4)')
+    parser.add_argument('--max-per-server', type=int, help='Transfers extracting from the same SQL Server at once (overrides the manifest, default 2)')
+    parser.add_argument('--summary-file', help='Write the combined summary of all transfer results to this JSON file')
+    parser.add_argument('--log-file', default='transfer.log', help='File the log is appended to as well as stdout (an empty value logs to stdout only)')
+
+    args = parser.parse_args()
+    configure_logging(args.log_file)
+
+    orchestrator = TransferOrchestrator.from_manifest(
+        args.manifest,
+        max_workers=args.max_workers,
+        max_per_server=args.max_per_server
+    )
+    summary = orchestrator.run()
+
+    if args.summary_file:
+        with open(args.summary_file, "w") as f:
+            json.dump(summary, f, indent=2, default=str)
+
+    for result in summary["results"]:
+        if result["success"]:
+            logger.info(f"{result['name']}: transferred {result['rows_transferred']} rows in {result['time_taken']:.2f} seconds")
+        else:
+            logger.error(f"{result['name']}: failed: {result['error']}")
+
+    logger.info(f"{summary['succeeded']} of {summary['tables']} transfers succeeded, "
+                f"{summary['rows_transferred']} rows in {summary['time_taken']:.2f} seconds")
+    if not summary["success"]:
+        sys.exit(1)
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,74 @@
+"""Pooled SQL Server connections with health checks."""
+
+import logging
+import threading
+from typing import Any, Dict, List
+
+logger = logging.getLogger("sql-to-bq-transfer")
+
+HEALTH_CHECK_QUERY = "SELECT 1"
+
+
+def is_healthy(conn: Any) -> bool:
+    """Return whether a connection can still run a trivial query."""
+    try:
+        cursor = conn.cursor()
+        try:
+            cursor.execute(HEALTH_CHECK_QUERY)
+            cursor.fetchone()
+        finally:
+            cursor.close()
+        return True
+    except Exception:
+        return False
+
+
+def close_quietly(conn: Any) -> None:
+    try:
+        conn.close()
+    except Exception:
+        pass
+
+
+class ConnectionPool:
+    """Idle SQL Server connections, kept per connection string and reused across transfers.
+
+    Idle connections are health-checked before they are handed out, so one dropped
+    by the server or the network while it sat in the pool is closed and replaced
+    instead of failing the next read.
+    """
+
+    def __init__(self):
+        self._idle: Dict[str, List[Any]] = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, conn_str: str) -> Any:
+        while True:
+            with self._lock:
+                idle = self._idle.get(conn_str)
+                conn = idle.pop() if idle else None
+            if conn is None:
+                import pyodbc
+
+                return pyodbc.connect(conn_str)
+            if is_healthy(conn):
+                return conn
+            logger.info("Discarding a pooled SQL Server connection that failed its health check")
+            close_quietly(conn)
+
+    def release(self, conn_str: str, conn: Any, reusable: bool = True) -> None:
+        """Return a connection for reuse, or close it after a failure left its state unknown."""
+        if conn is None:
+            return
+        if reusable:
+            with self._lock:
+                self._idle.setdefault(conn_str, []).append(conn)
+            return
+        close_quietly(conn)
+
+    def close(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for connections in idle.values():
+            for conn in connections:
+                close_quietly(conn)
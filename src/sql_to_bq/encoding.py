@@ -0,0 +1,113 @@
+"""Parquet encoding options and column type narrowing applied to chunks before upload."""
+
+from __future__ import annotations
+
+import logging
+from typing import TYPE_CHECKING, Any, Dict, Optional
+
+if TYPE_CHECKING:
+    import polars as pl
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+logger = logging.getLogger("sql-to-bq-transfer")
+
+PARQUET_COMPRESSIONS = ("zstd", "snappy", "gzip", "lz4", "brotli", "uncompressed")
+
+# Codecs that accept a compression level
+LEVELED_COMPRESSIONS = ("zstd", "gzip", "brotli")
+
+# Parquet stores every integer of 32 bits or fewer as INT32, so narrowing further saves nothing
+INT32_MIN = -(2 ** 31)
+INT32_MAX = 2 ** 31 - 1
+
+# Strings become categoricals when at most this share of a chunk's values are distinct
+CATEGORICAL_MAX_RATIO = 0.2
+
+
+def narrow_types(df: pl.DataFrame) -> pl.DataFrame:
+    """Downcast Int64 columns that fit in Int32 and make low-cardinality strings categorical.
+
+    Both map back to the same BigQuery types: INT32 Parquet columns load as INTEGER
+    and dictionary-encoded strings as STRING, with or without an explicit schema.
+    """
+    import polars as pl
+
+    casts = {}
+    rows = df.shape[0]
+    for name, dtype in df.schema.items():
+        column = df.get_column(name)
+        if dtype == pl.Int64:
+            low, high = column.min(), column.max()
+            if low is None or (low >= INT32_MIN and high <= INT32_MAX):
+                casts[name] = pl.Int32
+        elif dtype == pl.String and rows > 0:
+            if column.n_unique() <= rows * CATEGORICAL_MAX_RATIO:
+                casts[name] = pl.Categorical
+    return df.cast(casts) if casts else df
+
+
+class ParquetEncoding:
+    """How chunks are written to Parquet, both for direct uploads and for the staging spool.
+
+    Options left as None keep the writer's default: zstd for chunks written by
+    Polars and snappy for the staging file written by PyArrow.
+    """
+
+    def __init__(
+        self,
+        compression: Optional[str] = None,
+        compression_level: Optional[int] = None,
+        row_group_size: Optional[int] = None,
+        dictionary: bool = True,
+        statistics: bool = True,
+        narrow: bool = False
+    ):
+        if compression is not None and compression not in PARQUET_COMPRESSIONS:
+            raise ValueError(f"parquet_compression must be one of: {', '.join(PARQUET_COMPRESSIONS)}")
+        if compression_level is not None and compression not in LEVELED_COMPRESSIONS:
+            raise ValueError(
+                f"parquet_compression_level requires parquet_compression {', '.join(LEVELED_COMPRESSIONS)}"
+            )
+        if row_group_size is not None and row_group_size <= 0:
+            raise ValueError("parquet_row_group_size must be > 0")
+
+        self.compression = compression
+        self.compression_level = compression_level
+        self.row_group_size = row_group_size
+        self.dictionary = dictionary
+        self.statistics = statistics
+        self.narrow = narrow
+
+    def prepare(self, df: pl.DataFrame) -> pl.DataFrame:
+        """Apply type narrowing to a chunk if it is enabled."""
+        return narrow_types(df) if self.narrow else df
+
+    def write(self, df: pl.DataFrame, sink: Any) -> None:
+        """Write a chunk as a complete Parquet file to `sink`."""
+        options: Dict[str, Any] = {"statistics": self.statistics}
+        if self.compression is not None:
+            options["compression"] = self.compression
+        if self.compression_level is not None:
+            options["compression_level"] = self.compression_level
+        if self.row_group_size is not None:
+            options["row_group_size"] = self.row_group_size
+        if not self.dictionary:
+            # The Polars writer always dictionary-encodes where it pays off; PyArrow can turn it off
+            options["use_pyarrow"] = True
+            options["pyarrow_options"] = {"use_dictionary": False}
+        df.write_parquet(sink, **options)
+
+    def open_writer(self, sink: Any, schema: pa.Schema) -> pq.ParquetWriter:
+        """Open a PyArrow writer for a file that chunks are appended to as row groups."""
+        import pyarrow.parquet as pq
+
+        options: Dict[str, Any] = {"use_dictionary": self.dictionary, "write_statistics": self.statistics}
+        if self.compression is not None:
+            options["compression"] = "none" if self.compression == "uncompressed" else self.compression
+        if self.compression_level is not None:
+            options["compression_level"] = self.compression_level
+        return pq.ParquetWriter(sink, schema, **options)
+
+    def write_table(self, writer: pq.ParquetWriter, table: pa.Table) -> None:
+        writer.write_table(table, row_group_size=self.row_group_size)
@@ -0,0 +1,127 @@
+"""Watermark state and BigQuery MERGE statements for incremental transfers."""
+
+import datetime
+import json
+import logging
+import os
+import time
+from decimal import Decimal
+from typing import Any, Dict, List, Optional
+
+from .checkpoint import decode_value, encode_value
+
+logger = logging.getLogger("sql-to-bq-transfer")
+
+
+def sql_datetime_type(column: Dict[str, Any]) -> Optional[str]:
+    """Return the T-SQL type of a date/time column from its schema metadata, or None for other types."""
+    sql_type = column["type"]
+    if sql_type in ("datetime", "smalldatetime", "date"):
+        return sql_type.upper()
+    if sql_type in ("datetime2", "datetimeoffset", "time"):
+        scale = column.get("scale")
+        return f"{sql_type.upper()}({scale if scale is not None else 7})"
+    return None
+
+
+def sql_literal(value: Any, sql_type: Optional[str] = None) -> str:
+    """Render a watermark value as a T-SQL literal.
+
+    Watermark bounds are inlined rather than bound as parameters so the filtered
+    source can be reused by every read mode, including parallel workers and the
+    arrow-odbc backend, which binds all parameters as VARCHAR.
+
+    Datetimes are cast to `sql_type`, the watermark column's own type, when given:
+    from compatibility level 130 a DATETIME compares with a DATETIME2 by exact
+    value, so a row stored at the captured maximum would not match a DATETIME2
+    bound. DATETIME only parses three fractional digits, hence the inner cast.
+    """
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    if isinstance(value, (int, float, Decimal)):
+        return str(value)
+    if isinstance(value, datetime.datetime):
+        literal = f"CAST('{value.isoformat(sep=' ')}' AS DATETIME2(7))"
+        if sql_type and sql_type != "DATETIME2(7)":
+            literal = f"CAST({literal} AS {sql_type})"
+        return literal
+    if isinstance(value, datetime.date):
+        return f"CAST('{value.isoformat()}' AS DATE)"
+    if isinstance(value, bytes):
+        # ROWVERSION / BINARY(8) values
+        return "0x" + value.hex().upper()
+    if isinstance(value, str):
+        return "N'" + value.replace("'", "''") + "'"
+    raise ValueError(f"Unsupported watermark value type: {type(value).__name__}")
+
+
+def build_merge_statement(target: str, staging: str, columns: List[str], keys: List[str]) -> str:
+    """Build a MERGE that upserts every staged row into the target on the key columns.
+
+    BigQuery column names are case-insensitive, so keys are matched to the staged
+    columns regardless of case and written with the staged spelling.
+    """
+    by_lower = {col.lower(): col for col in columns}
+    missing = [key for key in keys if key.lower() not in by_lower]
+    if missing:
+        raise ValueError(f"Merge key column(s) not in the staged rows: {', '.join(missing)}")
+    keys = [by_lower[key.lower()] for key in keys]
+
+    def quote(name: str) -> str:
+        return f"`{name}`"
+
+    on = " AND ".join(f"T.{quote(key)} = S.{quote(key)}" for key in keys)
+    updates = ", ".join(f"{quote(col)} = S.{quote(col)}" for col in columns if col not in keys)
+    insert_columns = ", ".join(quote(col) for col in columns)
+    insert_values = ", ".join(f"S.{quote(col)}" for col in columns)
+
+    statement = f"MERGE `{target}` T\nUSING `{staging}` S\nON {on}\n"
+    if updates:
+        statement += f"WHEN MATCHED THEN UPDATE SET {updates}\n"
+    statement += f"WHEN NOT MATCHED THEN INSERT ({insert_columns}) VALUES ({insert_values})"
+    return statement
+
+
+class WatermarkState:
+    """The highest watermark value applied to the target, stored as JSON next to the job.
+
+    The file is only rewritten after the rows up to the new watermark have been
+    merged, so a failed run is simply repeated from the previous watermark.
+    """
+
+    def __init__(self, path: str, source: Dict[str, Any]):
+        self.path = path
+        self.source = source
+        self.watermark: Any = None
+
+    @classmethod
+    def load(cls, path: str, source: Dict[str, Any]) -> "WatermarkState":
+        """Read the stored watermark for `source`, or start without one if the file does not exist."""
+        state = cls(path, source)
+        if not os.path.exists(path):
+            return state
+
+        with open(path) as f:
+            saved = json.load(f)
+        if saved["source"] != source:
+            raise ValueError(f"Watermark state {path} was written for a different transfer")
+
+        state.watermark = decode_value(saved["watermark"])
+        return state
+
+    def save(self, watermark: Any) -> None:
+        self.watermark = watermark
+        state = {
+            "source": self.source,
+            "watermark": encode_value(watermark),
+            "updated_at": time.time(),
+        }
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "w") as f:
+            json.dump(state, f)
+        os.replace(temp_path, self.path)
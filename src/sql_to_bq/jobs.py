@@ -0,0 +1,117 @@
+"""Windowed tracking of in-flight BigQuery load jobs."""
+
+import logging
+import threading
+from typing import Any, Callable, List, Optional, Tuple
+
+logger = logging.getLogger("sql-to-bq-transfer")
+
+
+class LoadJobWindow:
+    """Keep up to `max_in_flight` BigQuery load jobs outstanding.
+
+    A background thread polls outstanding jobs and retires them as they finish.
+    `submit` blocks while the window is full and re-raises the first job failure,
+    so callers learn about a failed load on their next submit or on `drain`.
+    """
+
+    def __init__(self, max_in_flight: int, poll_interval: float = 1.0):
+        if max_in_flight < 1:
+            raise ValueError("max_in_flight must be >= 1")
+
+        self.max_in_flight = max_in_flight
+        self.poll_interval = poll_interval
+        self.jobs_submitted = 0
+        self.committed_rows = 0
+
+        self._outstanding: List[Tuple[Any, int, Optional[Callable[[Any], None]]]] = []
+        self._error: Optional[BaseException] = None
+        self._closed = False
+        self._condition = threading.Condition()
+        self._poller = threading.Thread(target=self._poll, name="bq-job-poller", daemon=True)
+        self._poller.start()
+
+    def submit(
+        self,
+        job: Any,
+        rows: int,
+        wait: bool = False,
+        on_commit: Optional[Callable[[Any], None]] = None
+    ) -> None:
+        """Track a submitted load job, blocking while the window is full.
+
+        With `wait=True` the job is finished before returning, which is how a
+        truncating load is kept ahead of any appends. `on_commit` is called with
+        the job once it has finished successfully.
+        """
+        with self._condition:
+            self._raise_if_failed()
+            self.jobs_submitted += 1
+
+            if not wait:
+                while len(self._outstanding) >= self.max_in_flight and self._error is None:
+                    self._condition.wait(self.poll_interval)
+                self._raise_if_failed()
+                self._outstanding.append((job, rows, on_commit))
+                self._condition.notify_all()
+                return
+
+        # Barrier jobs are finished on the caller's thread and never occupy the window
+        job.result()
+        with self._condition:
+            self.committed_rows += rows
+        if on_commit is not None:
+            on_commit(job)
+
+    def drain(self) -> None:
+        """Wait for every outstanding job to finish and raise the first failure."""
+        with self._condition:
+            while self._outstanding and self._error is None:
+                self._condition.wait(self.poll_interval)
+            self._raise_if_failed()
+
+    def close(self) -> None:
+        """Stop the background poller without waiting for outstanding jobs."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self._poller.join()
+
+    def _raise_if_failed(self) -> None:
+        if self._error is not None:
+            raise self._error
+
+    def _poll(self) -> None:
+        while True:
+            with self._condition:
+                while not self._outstanding and not self._closed:
+                    self._condition.wait()
+                if self._closed:
+                    return
+                outstanding = list(self._outstanding)
+
+            for entry in outstanding:
+                job, rows, on_commit = entry
+                try:
+                    if not job.done():
+                        continue
+                    job.result()
+                    if on_commit is not None:
+                        on_commit(job)
+                except Exception as e:
+                    logger.error(f"Load job {getattr(job, 'job_id', '')} failed: {e}")
+                    with self._condition:
+                        if self._error is None:
+                            self._error = e
+                        self._outstanding.remove(entry)
+                        self._condition.notify_all()
+                    continue
+
+                with self._condition:
+                    self._outstanding.remove(entry)
+                    self.committed_rows += rows
+                    self._condition.notify_all()
+
+            with self._condition:
+                if self._outstanding and not self._closed:
+                    self._condition.wait(self.poll_interval)
@@ -0,0 +1,188 @@
+"""Per-stage transfer metrics with JSON-lines and Prometheus textfile export."""
+
+import datetime
+import json
+import logging
+import math
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional, TextIO, Tuple
+
+logger = logging.getLogger("sql-to-bq-transfer")
+
+# Stages timed for each chunk or load job, in pipeline order
+STAGES = (
+    "query",        # statement execution until the first rows are available (arrow-odbc only)
+    "fetch",        # fetching rows into a DataFrame; includes the query with pyodbc
+    "convert",      # Arrow to Polars conversion and casts to the explicit schema
+    "encode",       # writing the chunk as Parquet, or as Arrow batches for the Storage Write API
+    "upload",       # sending the Parquet file with load_table_from_file, or appending the Arrow batches
+    "job_wait",     # blocking on the load job after upload
+    "job_pending",  # time the load job spent queued in BigQuery
+    "job_running",  # time the load job spent running in BigQuery
+)
+
+PERCENTILES = (50, 90, 99)
+
+# Prometheus histogram buckets in seconds
+BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0)
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of `values`."""
+    ordered = sorted(values)
+    rank = max(math.ceil(pct / 100 * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+def load_job_timings(job: Any) -> Tuple[Dict[str, float], Dict[str, float]]:
+    """Return the queued and running seconds and the slot milliseconds of a finished load job."""
+    created, started, ended = (getattr(job, name, None) for name in ("created", "started", "ended"))
+
+    seconds = {}
+    if isinstance(created, datetime.datetime) and isinstance(started, datetime.datetime):
+        seconds["job_pending"] = (started - created).total_seconds()
+    if isinstance(started, datetime.datetime) and isinstance(ended, datetime.datetime):
+        seconds["job_running"] = (ended - started).total_seconds()
+
+    counters = {}
+    # LoadJob has no slot_millis property; the API resource carries it as a string
+    properties = getattr(job, "_properties", None)
+    if isinstance(properties, dict):
+        slot_ms = properties.get("statistics", {}).get("totalSlotMs")
+        if slot_ms is not None:
+            counters["slot_ms"] = int(slot_ms)
+    return seconds, counters
+
+
+class TransferMetrics:
+    """Collect stage timings and counters for a transfer, optionally exporting them.
+
+    Every `record` call is one event (a chunk read, a staged chunk, a load job, a
+    Storage Write API append or a Parquet file written locally). Events are appended
+    to `jsonl_path` as they happen; `finish` writes the stage histograms and totals
+    to `prometheus_path` for the node exporter textfile collector.
+    """
+
+    def __init__(
+        self,
+        jsonl_path: Optional[str] = None,
+        prometheus_path: Optional[str] = None,
+        labels: Optional[Dict[str, str]] = None
+    ):
+        self.jsonl_path = jsonl_path
+        self.prometheus_path = prometheus_path
+        self.labels = labels or {}
+        self.stage_seconds: Dict[str, List[float]] = {stage: [] for stage in STAGES}
+        self.counters: Dict[str, float] = {}
+
+        self._file: Optional[TextIO] = None
+        self._lock = threading.Lock()
+
+    def record(
+        self,
+        event: str,
+        seconds: Optional[Dict[str, float]] = None,
+        counters: Optional[Dict[str, float]] = None,
+        **fields: Any
+    ) -> None:
+        """Add an event's stage timings and counters and append it to the JSON-lines file."""
+        seconds = {stage: value for stage, value in (seconds or {}).items() if value is not None}
+        counters = counters or {}
+
+        with self._lock:
+            for stage, value in seconds.items():
+                self.stage_seconds.setdefault(stage, []).append(value)
+            for name, value in counters.items():
+                self.counters[name] = self.counters.get(name, 0) + value
+
+            if self.jsonl_path:
+                if self._file is None:
+                    directory = os.path.dirname(self.jsonl_path)
+                    if directory:
+                        os.makedirs(directory, exist_ok=True)
+                    self._file = open(self.jsonl_path, "a")
+                line = {
+                    "ts": time.time(),
+                    "event": event,
+                    **self.labels,
+                    **fields,
+                    **{f"{stage}_seconds": value for stage, value in seconds.items()},
+                    **counters,
+                }
+                self._file.write(json.dumps(line, default=str) + "\n")
+                self._file.flush()
+
+    def summary(self) -> Dict[str, Any]:
+        """Return count, total, mean, percentiles and max for every stage that was timed."""
+        with self._lock:
+            stages = {}
+            for stage, values in self.stage_seconds.items():
+                if not values:
+                    continue
+                stats = {
+                    "count": len(values),
+                    "total": sum(values),
+                    "mean": sum(values) / len(values),
+                }
+                for pct in PERCENTILES:
+                    stats[f"p{pct}"] = percentile(values, pct)
+                stats["max"] = max(values)
+                stages[stage] = stats
+            return {"stages": stages, "counters": dict(self.counters)}
+
+    def finish(self, totals: Dict[str, float]) -> None:
+        """Close the JSON-lines file and write the Prometheus textfile with `totals` as gauges."""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+        if self.prometheus_path:
+            try:
+                self._write_prometheus(totals)
+            except OSError as e:
+                logger.warning(f"Could not write Prometheus metrics to {self.prometheus_path}: {e}")
+
+    def _label_text(self, **extra: str) -> str:
+        labels = {**self.labels, **extra}
+        if not labels:
+            return ""
+        pairs = []
+        for key, value in labels.items():
+            escaped = str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+            pairs.append(f'{key}="{escaped}"')
+        return "{" + ",".join(pairs) + "}"
+
+    def _write_prometheus(self, totals: Dict[str, float]) -> None:
+        lines = [
+            "# HELP sql_to_bq_stage_seconds Time spent in each transfer stage per chunk or load job.",
+            "# TYPE sql_to_bq_stage_seconds histogram",
+        ]
+        with self._lock:
+            stage_seconds = {stage: list(values) for stage, values in self.stage_seconds.items() if values}
+            counters = dict(self.counters)
+
+        for stage, values in stage_seconds.items():
+            for bound in BUCKETS:
+                count = sum(1 for value in values if value <= bound)
+                lines.append(f"sql_to_bq_stage_seconds_bucket{self._label_text(stage=stage, le=str(bound))} {count}")
+            lines.append(f"sql_to_bq_stage_seconds_bucket{self._label_text(stage=stage, le='+Inf')} {len(values)}")
+            lines.append(f"sql_to_bq_stage_seconds_sum{self._label_text(stage=stage)} {sum(values)}")
+            lines.append(f"sql_to_bq_stage_seconds_count{self._label_text(stage=stage)} {len(values)}")
+
+        for name, value in {**counters, **totals}.items():
+            metric = f"sql_to_bq_{name}"
+            lines.append(f"# TYPE {metric} gauge")
+            lines.append(f"{metric}{self._label_text()} {value}")
+
+        directory = os.path.dirname(self.prometheus_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        # The textfile collector may read at any time, so never expose a partial file
+        temp_path = f"{self.prometheus_path}.tmp"
+        with open(temp_path, "w") as f:
+            f.write("\n".join(lines) + "\n")
+        os.replace(temp_path, self.prometheus_path)
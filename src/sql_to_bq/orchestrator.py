@@ -0,0 +1,222 @@
+"""Run many table transfers from one manifest with shared connections and bounded concurrency."""
+
+from __future__ import annotations
+
+import json
+import logging
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from google.cloud import bigquery
+
+from .connections import ConnectionPool
+from .transfer import SQLServerToBigQueryTransfer, build_connection_string, estimate_table_rows
+
+logger = logging.getLogger("sql-to-bq-transfer")
+
+# Manifest keys used for scheduling rather than passed to SQLServerToBigQueryTransfer
+JOB_KEYS = ("name", "estimated_rows")
+
+
+def load_manifest(path: str) -> Dict[str, Any]:
+    """Read a JSON or YAML manifest.
+
+    The manifest holds a `jobs` list of SQLServerToBigQueryTransfer arguments, plus
+    optional `defaults` merged into every job, `max_workers`, `max_per_server` and
+    a `server_limits` mapping of server name to its own extraction limit.
+    """
+    with open(path) as f:
+        if path.endswith((".yaml", ".yml")):
+            try:
+                import yaml
+            except ImportError as e:
+                raise ImportError(
+                    "YAML manifests require PyYAML; install it with: "
+                    "pip install 'sql-to-bq-transfer[yaml]' or use a JSON manifest"
+                ) from e
+            manifest = yaml.safe_load(f)
+        else:
+            manifest = json.load(f)
+
+    if not isinstance(manifest, dict) or not manifest.get("jobs"):
+        raise ValueError(f"Manifest {path} must contain a non-empty 'jobs' list")
+    return manifest
+
+
+class TransferOrchestrator:
+    """Run the transfers in a manifest on a worker pool, largest tables first.
+
+    At most `max_per_server` transfers (or the server's entry in `server_limits`)
+    extract from the same SQL Server at once. Transfers share pooled SQL Server
+    connections and one BigQuery client per key file and project, and a failed
+    table is recorded in the summary without stopping the others.
+    """
+
+    def __init__(
+        self,
+        jobs: List[Dict[str, Any]],
+        defaults: Optional[Dict[str, Any]] = None,
+        max_workers: int = 4,
+        max_per_server: int = 2,
+        server_limits: Optional[Dict[str, int]] = None
+    ):
+        if max_workers < 1 or max_per_server < 1:
+            raise ValueError("max_workers and max_per_server must be >= 1")
+
+        if any(limit < 1 for limit in (server_limits or {}).values()):
+            raise ValueError("server_limits must all be >= 1")
+
+        self.jobs = [{**(defaults or {}), **job} for job in jobs]
+        self.max_workers = max_workers
+        self.max_per_server = max_per_server
+        self.server_limits = server_limits or {}
+
+        self.pool = ConnectionPool()
+        self._bq_clients: Dict[Tuple[Optional[str], Optional[str]], bigquery.Client] = {}
+        self._bq_lock = threading.Lock()
+
+    @classmethod
+    def from_manifest(cls, path: str, **overrides: Any) -> "TransferOrchestrator":
+        manifest = load_manifest(path)
+        options = {
+            key: manifest[key] for key in ("max_workers", "max_per_server", "server_limits") if key in manifest
+        }
+        options.update({key: value for key, value in overrides.items() if value is not None})
+        return cls(manifest["jobs"], manifest.get("defaults"), **options)
+
+    @staticmethod
+    def job_name(job: Dict[str, Any]) -> str:
+        return job.get("name") or job.get("sql_table") or job.get("bq_table") or "query"
+
+    @staticmethod
+    def _conn_str(job: Dict[str, Any]) -> str:
+        return build_connection_string(
+            job["sql_server"],
+            job["sql_database"],
+            job.get("sql_username"),
+            job.get("sql_password"),
+            job.get("sql_driver", "ODBC Driver 17 for SQL Server"),
+        )
+
+    def _bq_client(self, job: Dict[str, Any]) -> bigquery.Client:
+        key = (job.get("key_path"), job.get("bq_project"))
+        with self._bq_lock:
+            if key not in self._bq_clients:
+                from google.cloud import bigquery
+
+                self._bq_clients[key] = bigquery.Client.from_service_account_json(
+                    job.get("key_path"), project=job.get("bq_project")
+                )
+            return self._bq_clients[key]
+
+    def _server_limit(self, server: str) -> int:
+        return self.server_limits.get(server, self.max_per_server)
+
+    def _estimate_rows(self, job: Dict[str, Any]) -> int:
+        """Return the manifest's row estimate, or the catalog row count for a table source."""
+        if job.get("estimated_rows") is not None:
+            return job["estimated_rows"]
+        if job.get("sql_query") or not job.get("sql_table"):
+            return 0
+
+        conn_str = self._conn_str(job)
+        conn = None
+        try:
+            conn = self.pool.acquire(conn_str)
+            rows = estimate_table_rows(conn, job["sql_table"]) or 0
+        except Exception as e:
+            logger.warning(f"Could not estimate rows for {self.job_name(job)}: {e}")
+            self.pool.release(conn_str, conn, reusable=False)
+            return 0
+        self.pool.release(conn_str, conn)
+        return rows
+
+    def _run_job(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        """Run one transfer, turning any setup error into a failed result."""
+        name = self.job_name(job)
+        options = {key: value for key, value in job.items() if key not in JOB_KEYS}
+        start_time = time.time()
+        logger.info(f"[{name}] Starting transfer")
+
+        conn_str = None
+        conn = None
+        transfer = None
+        result: Dict[str, Any] = {}
+        try:
+            conn_str = self._conn_str(job)
+            conn = self.pool.acquire(conn_str)
+            # A local Parquet sink never talks to BigQuery
+            bq_client = None if job.get("sink") == "parquet" else self._bq_client(job)
+            transfer = SQLServerToBigQueryTransfer(
+                **options, sql_conn=conn, sql_pool=self.pool, bq_client=bq_client
+            )
+            result = transfer.transfer_data()
+        except Exception as e:
+            logger.error(f"[{name}] Transfer failed: {e}")
+            result = {"success": False, "error": str(e), "time_taken": time.time() - start_time, "rows_transferred": 0}
+        finally:
+            if conn_str is not None:
+                # The transfer may have replaced the connection after a read error, or failed to;
+                # read the attribute, since the property would try to connect again
+                if transfer is not None:
+                    conn = transfer._sql_conn
+                try:
+                    self.pool.release(conn_str, conn, reusable=transfer is not None and result.get("success", False))
+                except Exception as e:
+                    logger.warning(f"[{name}] Could not release the SQL Server connection: {e}")
+
+        logger.info(f"[{name}] Finished: {result.get('rows_transferred', 0)} rows, success={result['success']}")
+        return {"name": name, **result}
+
+    def run(self) -> Dict[str, Any]:
+        """Run every job and return a summary with each job's `transfer_data` result."""
+        start_time = time.time()
+
+        estimates = [(self._estimate_rows(job), index) for index, job in enumerate(self.jobs)]
+        # Largest first, keeping manifest order among equal estimates
+        pending = [self.jobs[index] for _, index in sorted(estimates, key=lambda e: (-e[0], e[1]))]
+        logger.info(f"Running {len(pending)} transfer(s) with {self.max_workers} worker(s), "
+                    f"at most {self.max_per_server} per SQL Server")
+
+        active: Dict[str, int] = {}
+        running: Dict[Future, Dict[str, Any]] = {}
+        results: List[Dict[str, Any]] = []
+
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="transfer") as executor:
+                while pending or running:
+                    # Start the largest jobs whose server still has room
+                    for job in list(pending):
+                        if len(running) >= self.max_workers:
+                            break
+                        server = job.get("sql_server")
+                        if active.get(server, 0) >= self._server_limit(server):
+                            continue
+                        pending.remove(job)
+                        active[server] = active.get(server, 0) + 1
+                        running[executor.submit(self._run_job, job)] = job
+
+                    done, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        job = running.pop(future)
+                        active[job.get("sql_server")] -= 1
+                        results.append(future.result())
+        finally:
+            self.pool.close()
+
+        total_time = time.time() - start_time
+        succeeded = sum(1 for result in results if result["success"])
+        rows_transferred = sum(result.get("rows_transferred", 0) for result in results)
+        return {
+            "success": succeeded == len(results),
+            "tables": len(results),
+            "succeeded": succeeded,
+            "failed": len(results) - succeeded,
+            "rows_transferred": rows_transferred,
+            "time_taken": total_time,
+            "rows_per_second": rows_transferred / total_time if total_time > 0 else 0,
+            "results": results,
+        }
@@ -0,0 +1,142 @@
+"""Retry policy with exponential backoff and classification of transient SQL Server and BigQuery errors."""
+
+import logging
+import random
+import re
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger("sql-to-bq-transfer")
+
+# SQLSTATEs for lost connections, timeouts and deadlock victims
+TRANSIENT_SQLSTATES = {"08S01", "08001", "08003", "08004", "08007", "HYT00", "HYT01", "40001"}
+
+# SQL Server error numbers: deadlock victim, lock timeout, broken transport, and Azure SQL throttling/failover
+TRANSIENT_SQL_ERRORS = {1205, 1222, 233, 64, 10053, 10054, 10060, 40143, 40197, 40501, 40613, 49918, 49919, 49920}
+
+# pyodbc messages end with "(<native error>) (SQLExecDirectW)"; arrow-odbc reports "State: ..., Native error: ..."
+SQLSTATE_PATTERN = re.compile(r"State: ([0-9A-Z]{5})")
+NATIVE_ERROR_PATTERN = re.compile(r"\((\d+)\) \(SQL\w+\)|Native error: (-?\d+)")
+
+# Reasons in a BigQuery error payload that mean the same request can succeed later
+TRANSIENT_BIGQUERY_REASONS = {
+    "backendError", "internalError", "badGateway", "rateLimitExceeded",
+    "jobBackendError", "jobInternalError", "jobRateLimitExceeded",
+}
+
+
+def is_retryable_sql_error(error: BaseException) -> bool:
+    """Return whether a SQL Server read failed for a reason that a retry on a new connection can fix."""
+    import pyodbc
+
+    if isinstance(error, pyodbc.OperationalError):
+        return True
+
+    text = str(error)
+    states = set(SQLSTATE_PATTERN.findall(text))
+    if isinstance(error, pyodbc.Error) and error.args and isinstance(error.args[0], str):
+        states.add(error.args[0])
+    if states & TRANSIENT_SQLSTATES:
+        return True
+
+    for pyodbc_code, arrow_code in NATIVE_ERROR_PATTERN.findall(text):
+        if int(pyodbc_code or arrow_code) in TRANSIENT_SQL_ERRORS:
+            return True
+    return isinstance(error, (ConnectionError, TimeoutError))
+
+
+def is_retryable_bigquery_error(error: BaseException) -> bool:
+    """Return whether a BigQuery upload or load job failed with a 5xx, rate limit or transport error."""
+    from google.api_core import exceptions as api_exceptions
+    from google.api_core.retry import if_transient_error
+
+    if if_transient_error(error):
+        return True
+    if isinstance(error, (api_exceptions.BadGateway, api_exceptions.GatewayTimeout)):
+        return True
+    if isinstance(error, api_exceptions.GoogleAPICallError):
+        reasons = {detail.get("reason") for detail in error.errors or [] if isinstance(detail, dict)}
+        return bool(reasons & TRANSIENT_BIGQUERY_REASONS)
+    return isinstance(error, (ConnectionError, TimeoutError))
+
+
+class RetryStats:
+    """Retries made and time lost to failed attempts and backoff, by operation kind."""
+
+    def __init__(self):
+        self.retries: Dict[str, int] = {}
+        self.seconds_lost = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, kind: str, seconds: float, count: int = 1) -> None:
+        with self._lock:
+            self.retries[kind] = self.retries.get(kind, 0) + count
+            self.seconds_lost += seconds
+
+    def as_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"retries": dict(self.retries), "retry_seconds": self.seconds_lost}
+
+
+class RetryPolicy:
+    """Retry an operation on transient errors with capped exponential backoff and full jitter.
+
+    Attempt `n` waits a random time between zero and `initial_backoff * multiplier ** (n - 1)`,
+    capped at `max_backoff`, so workers that failed together do not retry in lockstep.
+    """
+
+    def __init__(
+        self,
+        max_retries: int = 3,
+        initial_backoff: float = 1.0,
+        max_backoff: float = 60.0,
+        multiplier: float = 2.0
+    ):
+        if max_retries < 0:
+            raise ValueError("max_retries must be >= 0")
+        if initial_backoff < 0 or max_backoff < 0:
+            raise ValueError("retry backoff must be >= 0")
+
+        self.max_retries = max_retries
+        self.initial_backoff = initial_backoff
+        self.max_backoff = max_backoff
+        self.multiplier = multiplier
+
+    def backoff(self, attempt: int) -> float:
+        """Return the delay after failed attempt `attempt` (starting at 1)."""
+        ceiling = min(self.max_backoff, self.initial_backoff * self.multiplier ** (attempt - 1))
+        return random.uniform(0, ceiling)
+
+    def call(
+        self,
+        operation: Callable[[], Any],
+        is_retryable: Callable[[BaseException], bool],
+        description: str,
+        kind: str,
+        stats: Optional[RetryStats] = None,
+        on_retry: Optional[Callable[[BaseException], None]] = None
+    ) -> Any:
+        """Run `operation`, retrying retryable failures up to `max_retries` times.
+
+        `on_retry` runs before each new attempt, for instance to replace a broken
+        connection. The time spent on failed attempts, backoff and `on_retry` is
+        added to `stats` under `kind`.
+        """
+        attempt = 1
+        while True:
+            attempt_start = time.time()
+            try:
+                return operation()
+            except Exception as e:
+                if attempt > self.max_retries or not is_retryable(e):
+                    raise
+                delay = self.backoff(attempt)
+                logger.warning(f"{description} failed (attempt {attempt} of {self.max_retries + 1}), "
+                               f"retrying in {delay:.1f}s: {e}")
+                time.sleep(delay)
+                if on_retry is not None:
+                    on_retry(e)
+                if stats is not None:
+                    stats.record(kind, time.time() - attempt_start)
+                attempt += 1
@@ -0,0 +1,169 @@
+"""Derive BigQuery schemas and Polars cast plans from SQL Server column metadata."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    import polars as pl
+    from google.cloud import bigquery
+
+logger = logging.getLogger("sql-to-bq-transfer")
+
+# BigQuery NUMERIC holds 38 digits with up to 9 after the decimal point
+NUMERIC_MAX_SCALE = 9
+NUMERIC_MAX_INTEGER_DIGITS = 29
+
+INTEGER_TYPES = {"tinyint", "smallint", "int", "bigint"}
+FLOAT_TYPES = {"real", "float"}
+DECIMAL_TYPES = {"decimal", "numeric", "money", "smallmoney"}
+DATETIME_TYPES = {"datetime", "datetime2", "smalldatetime"}
+BINARY_TYPES = {
+    "binary", "varbinary", "image", "timestamp", "rowversion",
+    "geography", "geometry", "hierarchyid",
+}
+
+TABLE_COLUMNS_QUERY = """
+SELECT c.name, TYPE_NAME(c.system_type_id), c.precision, c.scale, c.is_nullable
+FROM sys.columns c
+WHERE c.object_id = OBJECT_ID(?)
+ORDER BY c.column_id
+"""
+
+QUERY_COLUMNS_QUERY = """
+SELECT name, TYPE_NAME(system_type_id), precision, scale, is_nullable
+FROM sys.dm_exec_describe_first_result_set(?, NULL, 0)
+WHERE is_hidden = 0
+ORDER BY column_ordinal
+"""
+
+
+class SourceSchema:
+    """Column metadata for a SQL Server table or query and its BigQuery equivalent.
+
+    Character types, XML, UNIQUEIDENTIFIER and anything unrecognised map to STRING.
+    """
+
+    def __init__(self, columns: List[Dict[str, Any]]):
+        self.columns = columns
+
+    @classmethod
+    def from_sql_server(cls, conn: Any, sql_table: Optional[str] = None, sql_query: Optional[str] = None) -> "SourceSchema":
+        """Read column types from sys.columns for a table or from the query's first result set."""
+        cursor = conn.cursor()
+        try:
+            if sql_query:
+                cursor.execute(QUERY_COLUMNS_QUERY, sql_query)
+            else:
+                cursor.execute(TABLE_COLUMNS_QUERY, sql_table)
+            rows = cursor.fetchall()
+        finally:
+            cursor.close()
+
+        if not rows:
+            raise ValueError(f"Could not read column metadata for {sql_table or 'the source query'}")
+
+        return cls([
+            {
+                "name": name,
+                "type": type_name.lower(),
+                "precision": precision,
+                "scale": scale,
+                "nullable": bool(nullable),
+            }
+            for name, type_name, precision, scale, nullable in rows
+        ])
+
+    @classmethod
+    def load(cls, path: str) -> "SourceSchema":
+        with open(path) as f:
+            return cls(json.load(f)["columns"])
+
+    def save(self, path: str) -> None:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "w") as f:
+            json.dump({"columns": self.columns}, f, indent=2)
+        os.replace(temp_path, path)
+
+    @staticmethod
+    def cache_path(cache_dir: str, *source_parts: Optional[str]) -> str:
+        """Return the cache file for a source identified by server, database and table or query."""
+        digest = hashlib.sha1("|".join(part or "" for part in source_parts).encode("utf-8")).hexdigest()
+        return os.path.join(cache_dir, f"schema_{digest[:16]}.json")
+
+    @staticmethod
+    def _decimal_type(column: Dict[str, Any]) -> str:
+        scale = column["scale"] or 0
+        integer_digits = (column["precision"] or 38) - scale
+        if scale <= NUMERIC_MAX_SCALE and integer_digits <= NUMERIC_MAX_INTEGER_DIGITS:
+            return "NUMERIC"
+        return "BIGNUMERIC"
+
+    def bigquery_types(self) -> List[Tuple[str, str]]:
+        """Return each column's name and BigQuery type."""
+        types = []
+        for column in self.columns:
+            sql_type = column["type"]
+            if sql_type == "bit":
+                field_type = "BOOLEAN"
+            elif sql_type in INTEGER_TYPES:
+                field_type = "INTEGER"
+            elif sql_type in FLOAT_TYPES:
+                field_type = "FLOAT"
+            elif sql_type in DECIMAL_TYPES:
+                field_type = self._decimal_type(column)
+            elif sql_type == "date":
+                field_type = "DATE"
+            elif sql_type in DATETIME_TYPES:
+                field_type = "DATETIME"
+            elif sql_type == "datetimeoffset":
+                field_type = "TIMESTAMP"
+            elif sql_type == "time":
+                field_type = "TIME"
+            elif sql_type in BINARY_TYPES:
+                field_type = "BYTES"
+            else:
+                field_type = "STRING"
+            types.append((column["name"], field_type))
+        return types
+
+    def bigquery_fields(self) -> List[bigquery.SchemaField]:
+        """Return the BigQuery schema; every field is NULLABLE so appends to existing tables stay compatible."""
+        from google.cloud import bigquery
+
+        return [bigquery.SchemaField(name, field_type, mode="NULLABLE") for name, field_type in self.bigquery_types()]
+
+    def cast_plan(self) -> Dict[str, pl.DataType]:
+        """Return the Polars dtype each column is cast to before it is written to Parquet."""
+        import polars as pl
+
+        plan = {}
+        for column in self.columns:
+            sql_type = column["type"]
+            if sql_type == "bit":
+                dtype = pl.Boolean
+            elif sql_type in INTEGER_TYPES:
+                dtype = pl.Int64
+            elif sql_type in FLOAT_TYPES:
+                dtype = pl.Float64
+            elif sql_type in DECIMAL_TYPES:
+                dtype = pl.Decimal(column["precision"] or 38, column["scale"] or 0)
+            elif sql_type == "date":
+                dtype = pl.Date
+            elif sql_type in DATETIME_TYPES:
+                dtype = pl.Datetime("us")
+            elif sql_type == "datetimeoffset":
+                dtype = pl.Datetime("us", "UTC")
+            elif sql_type == "time":
+                dtype = pl.Time
+            elif sql_type in BINARY_TYPES:
+                dtype = pl.Binary
+            else:
+                dtype = pl.String
+            plan[column["name"]] = dtype
+        return plan
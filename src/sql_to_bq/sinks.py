@@ -0,0 +1,747 @@
+"""Destinations that transfer chunks are written to: BigQuery load jobs, the Storage Write API or local Parquet."""
+
+from __future__ import annotations
+
+import abc
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional
+from urllib.parse import quote
+
+from .encoding import ParquetEncoding
+from .jobs import LoadJobWindow
+from .metrics import TransferMetrics, load_job_timings
+from .retry import RetryPolicy, RetryStats, is_retryable_bigquery_error
+from .staging import ParquetSpool
+
+if TYPE_CHECKING:
+    import polars as pl
+    import pyarrow as pa
+    from google.cloud import bigquery
+
+logger = logging.getLogger("sql-to-bq-transfer")
+
+SINKS = ("load-job", "storage-write", "parquet")
+STORAGE_WRITE_STREAMS = ("committed", "pending")
+
+# AppendRows requests are limited to 10 MB; leave room for the request envelope
+MAX_APPEND_BYTES = 8 * 1024 * 1024
+
+# gRPC status returned for an append at an offset the stream already holds
+ALREADY_EXISTS = 6
+
+HIVE_NULL_PARTITION = "__HIVE_DEFAULT_PARTITION__"
+
+
+def log_encoding(rows: int, counters: Dict[str, float], encoded_as: str = "Parquet") -> None:
+    """Log a chunk's size in memory, after narrowing and once encoded."""
+    sizes = [f"{counters['bytes_in_memory'] / 1024 / 1024:.2f} MB in memory"]
+    if "bytes_narrowed" in counters:
+        sizes.append(f"{counters['bytes_narrowed'] / 1024 / 1024:.2f} MB narrowed")
+    sizes.append(f"{counters['bytes_encoded'] / 1024 / 1024:.2f} MB {encoded_as}")
+    logger.info(f"Encoded {rows} rows: {', '.join(sizes)}")
+
+
+def bigquery_arrow_table(df: pl.DataFrame) -> pa.Table:
+    """Convert a chunk to Arrow with the plain string, binary and non-dictionary types BigQuery reads."""
+    import pyarrow as pa
+
+    # View types, and their predicates, only exist in newer pyarrow releases
+    is_string_view = getattr(pa.types, "is_string_view", lambda data_type: False)
+    is_binary_view = getattr(pa.types, "is_binary_view", lambda data_type: False)
+
+    table = df.to_arrow()
+    fields = []
+    for field in table.schema:
+        data_type = field.type
+        if pa.types.is_dictionary(data_type):
+            data_type = data_type.value_type
+        if pa.types.is_large_string(data_type) or is_string_view(data_type):
+            data_type = pa.string()
+        elif pa.types.is_large_binary(data_type) or is_binary_view(data_type):
+            data_type = pa.binary()
+        fields.append(field.with_type(data_type))
+    schema = pa.schema(fields)
+    return table if schema.equals(table.schema) else table.cast(schema)
+
+
+class Sink(abc.ABC):
+    """Destination for converted chunks.
+
+    `write` may be called from several upload threads at once, except that the
+    first chunk of a transfer is always written before any other. `finish` makes
+    everything written durable and `close` releases the sink whether or not the
+    transfer succeeded.
+    """
+
+    def __init__(self, metrics: TransferMetrics):
+        self.metrics = metrics
+        self.job_stats: List[Dict[str, Any]] = []
+
+    @property
+    def committed_rows(self) -> Optional[int]:
+        """Rows durably written so far, or None when every chunk is durable once `write` returns."""
+        return None
+
+    @abc.abstractmethod
+    def write(
+        self,
+        df: pl.DataFrame,
+        is_first_chunk: bool,
+        on_commit: Optional[Callable[[Any], None]] = None,
+        seconds: Optional[Dict[str, float]] = None,
+        counters: Optional[Dict[str, float]] = None
+    ) -> None:
+        """Write a chunk, calling `on_commit` once its rows are durable.
+
+        The first chunk replaces the destination's rows unless the write mode is
+        append. `seconds` and `counters` already measured for the chunk are
+        recorded together with the sink's own.
+        """
+
+    def finish(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+    def summary(self) -> Dict[str, Any]:
+        """Return sink-specific entries for the transfer result."""
+        return {}
+
+
+class LoadJobSink(Sink):
+    """Load chunks into BigQuery with Parquet load jobs.
+
+    Each chunk is encoded into a buffer that only spills to a temporary file when
+    it grows past `upload_memory_limit_mb`, and loaded by its own job. With a
+    staging directory chunks are spooled to local files instead, and each file is
+    loaded by a single job. With `max_inflight_jobs` above one, jobs keep running
+    while later chunks are read.
+    """
+
+    def __init__(
+        self,
+        client: bigquery.Client,
+        table_ref: str,
+        write_mode: str,
+        encoding: ParquetEncoding,
+        retry_policy: RetryPolicy,
+        retry_stats: RetryStats,
+        metrics: TransferMetrics,
+        schema: Optional[List[bigquery.SchemaField]] = None,
+        upload_memory_limit_mb: int = 512,
+        max_inflight_jobs: int = 1,
+        staging_dir: Optional[str] = None,
+        load_batch_mb: int = 1024
+    ):
+        super().__init__(metrics)
+        self.client = client
+        self.table_ref = table_ref
+        self.write_mode = write_mode
+        self.encoding = encoding
+        self.retry_policy = retry_policy
+        self.retry_stats = retry_stats
+        self.schema = schema
+        self.upload_memory_limit_mb = upload_memory_limit_mb
+        self.staging_dir = staging_dir
+        self.load_batch_mb = load_batch_mb
+        self.load_window = LoadJobWindow(max_inflight_jobs) if max_inflight_jobs > 1 else None
+
+        self._spool: Optional[ParquetSpool] = None
+        self._spool_commits: List[Callable[[Any], None]] = []
+        self._staging_lock = threading.Lock()
+        # Staged chunks are only durable once the batch holding them is loaded
+        self._staged_rows_committed = 0
+        self._committed_lock = threading.Lock()
+
+    @property
+    def committed_rows(self) -> Optional[int]:
+        if self.staging_dir:
+            with self._committed_lock:
+                return self._staged_rows_committed
+        return self.load_window.committed_rows if self.load_window is not None else None
+
+    def job_config(self, is_first_chunk: bool) -> bigquery.LoadJobConfig:
+        """Build the Parquet load job configuration for a chunk or staged batch."""
+        from google.cloud import bigquery
+
+        if self.write_mode in ("truncate_append", "merge"):
+            write_disposition = (
+                bigquery.WriteDisposition.WRITE_TRUNCATE if is_first_chunk
+                else bigquery.WriteDisposition.WRITE_APPEND
+            )
+        else:
+            write_disposition = bigquery.WriteDisposition.WRITE_APPEND
+
+        if self.schema is not None:
+            return bigquery.LoadJobConfig(
+                source_format=bigquery.SourceFormat.PARQUET,
+                write_disposition=write_disposition,
+                schema=self.schema,
+                autodetect=False,
+            )
+
+        return bigquery.LoadJobConfig(
+            source_format=bigquery.SourceFormat.PARQUET,
+            write_disposition=write_disposition,
+            autodetect=True,
+        )
+
+    def write(
+        self,
+        df: pl.DataFrame,
+        is_first_chunk: bool,
+        on_commit: Optional[Callable[[Any], None]] = None,
+        seconds: Optional[Dict[str, float]] = None,
+        counters: Optional[Dict[str, float]] = None
+    ) -> None:
+        seconds = dict(seconds or {})
+        counters = dict(counters or {})
+
+        if self.staging_dir:
+            self._stage_chunk(df, is_first_chunk, on_commit, seconds, counters)
+            return
+
+        job_config = self.job_config(is_first_chunk)
+
+        try:
+            # SpooledTemporaryFile treats max_size=0 as unbounded, so a zero limit spills on the first write
+            spool_limit = max(self.upload_memory_limit_mb * 1024 * 1024, 1)
+            with tempfile.SpooledTemporaryFile(max_size=spool_limit) as buffer:
+                encode_start = time.time()
+                self.encoding.write(df, buffer)
+                seconds["encode"] = time.time() - encode_start
+                upload_bytes = buffer.tell()
+                buffer.seek(0)
+                counters["bytes_encoded"] = upload_bytes
+                log_encoding(df.shape[0], counters)
+
+                self._run_load_job(
+                    buffer, job_config, df.shape[0], upload_bytes,
+                    on_commit=on_commit, seconds=seconds, counters=counters
+                )
+
+        except Exception as e:
+            logger.error(f"Error uploading to BigQuery: {e}")
+            raise
+
+    def finish(self) -> None:
+        if self.staging_dir:
+            with self._staging_lock:
+                self._load_staged_batch()
+
+        if self.load_window is not None:
+            logger.info("Waiting for outstanding load jobs to finish")
+            self.load_window.drain()
+
+    def close(self) -> None:
+        if self._spool is not None:
+            self._spool.discard()
+            self._spool = None
+
+        if self.load_window is not None:
+            self.load_window.close()
+
+    def _run_load_job(
+        self,
+        source_file: Any,
+        job_config: bigquery.LoadJobConfig,
+        rows: int,
+        upload_bytes: int,
+        chunks: int = 1,
+        on_commit: Optional[Callable[[Any], None]] = None,
+        seconds: Optional[Dict[str, float]] = None,
+        counters: Optional[Dict[str, float]] = None
+    ) -> None:
+        """Submit a load job from an open file and wait on it or hand it to the job window.
+
+        `on_commit` is called with the job once it has finished successfully. The
+        job's stage timings and counters, including any already measured in
+        `seconds` and `counters`, are recorded when it commits.
+
+        Transient upload errors are retried from the start of the file. A load job
+        that failed for a transient reason is resubmitted when this method waits on
+        it; jobs handed to the job window are not.
+        """
+        from google.cloud import bigquery
+
+        seconds = dict(seconds or {})
+        submitted: List[Any] = []
+
+        def submit() -> Any:
+            source_file.seek(0)
+            upload_start = time.time()
+            job = self.client.load_table_from_file(
+                source_file,
+                self.table_ref,
+                job_config=job_config
+            )
+            seconds["upload"] = time.time() - upload_start
+            submitted.append(job)
+            return job
+
+        def retryable(error: BaseException) -> bool:
+            # Resubmit only when no job was created or the job itself failed; a job whose
+            # state is unknown may still commit, and loading it again would duplicate rows
+            if submitted and getattr(submitted[-1], "error_result", None) is None:
+                return False
+            return is_retryable_bigquery_error(error)
+
+        description = f"Loading {rows} rows into {self.table_ref}"
+
+        def committed(job: Any) -> None:
+            job_seconds, job_counters = load_job_timings(job)
+            self.metrics.record(
+                "load_job",
+                {**seconds, **job_seconds},
+                {"bytes_uploaded": upload_bytes, **(counters or {}), **job_counters},
+                job_id=job.job_id,
+                rows=rows,
+                chunks=chunks,
+            )
+            if on_commit is not None:
+                on_commit(job)
+
+        if self.load_window is not None:
+            submitted.clear()
+            job = self.retry_policy.call(submit, retryable, description, "load", self.retry_stats)
+            self.job_stats.append({"job_id": job.job_id, "rows": rows, "chunks": chunks, "bytes": upload_bytes})
+
+            # A truncating load must commit before any append is allowed to
+            is_truncate = job_config.write_disposition == bigquery.WriteDisposition.WRITE_TRUNCATE
+            self.load_window.submit(job, rows, wait=is_truncate, on_commit=committed)
+            logger.info(f"Submitted load job {job.job_id} for {rows} rows")
+        else:
+            def load() -> Any:
+                submitted.clear()
+                job = submit()
+                wait_start = time.time()
+                job.result()
+                seconds["job_wait"] = time.time() - wait_start
+                return job
+
+            job = self.retry_policy.call(load, retryable, description, "load", self.retry_stats)
+            self.job_stats.append({"job_id": job.job_id, "rows": rows, "chunks": chunks, "bytes": upload_bytes})
+            logger.info(f"Uploaded {rows} rows to BigQuery")
+            committed(job)
+
+    def _stage_chunk(
+        self,
+        df: pl.DataFrame,
+        is_first_chunk: bool,
+        on_commit: Optional[Callable[[Any], None]] = None,
+        seconds: Optional[Dict[str, float]] = None,
+        counters: Optional[Dict[str, float]] = None
+    ) -> None:
+        """Spool a chunk to the local staging file, loading the file once it reaches the byte budget."""
+        with self._staging_lock:
+            if self._spool is None:
+                self._spool = ParquetSpool(self.staging_dir, self.load_batch_mb * 1024 * 1024, self.encoding)
+
+            encode_start = time.time()
+            size_before = self._spool.size
+            if not self._spool.append(df, is_first_chunk):
+                logger.info("Chunk schema differs from the staged file, starting a new load batch")
+                self._load_staged_batch()
+                self._spool = ParquetSpool(self.staging_dir, self.load_batch_mb * 1024 * 1024, self.encoding)
+                encode_start = time.time()
+                size_before = 0
+                self._spool.append(df, is_first_chunk)
+            counters = {**(counters or {}), "bytes_encoded": self._spool.size - size_before}
+            log_encoding(df.shape[0], counters)
+            self.metrics.record(
+                "stage",
+                {**(seconds or {}), "encode": time.time() - encode_start},
+                counters,
+                rows=df.shape[0],
+                bytes=counters["bytes_encoded"],
+            )
+
+            if on_commit is not None:
+                self._spool_commits.append(on_commit)
+
+            logger.info(f"Staged {df.shape[0]} rows ({self._spool.size / 1024 / 1024:.2f} MB in current batch)")
+
+            if self._spool.is_full:
+                self._load_staged_batch()
+
+    def _load_staged_batch(self) -> None:
+        """Load the current staging file with a single load job and delete it."""
+        spool, self._spool = self._spool, None
+        commits, self._spool_commits = self._spool_commits, []
+        if spool is None or spool.chunks == 0:
+            if spool is not None:
+                spool.discard()
+            return
+
+        def batch_committed(job: Any) -> None:
+            with self._committed_lock:
+                self._staged_rows_committed += batch["rows"]
+            for commit in commits:
+                commit(job)
+
+        try:
+            batch = spool.close()
+            logger.info(f"Loading staged batch of {batch['chunks']} chunk(s), {batch['rows']} rows, "
+                        f"{batch['bytes'] / 1024 / 1024:.2f} MB")
+            with open(batch["path"], "rb") as source_file:
+                self._run_load_job(
+                    source_file,
+                    self.job_config(spool.contains_first_chunk),
+                    batch["rows"],
+                    batch["bytes"],
+                    batch["chunks"],
+                    on_commit=batch_committed
+                )
+        except Exception as e:
+            logger.error(f"Error uploading staged batch to BigQuery: {e}")
+            raise
+        finally:
+            spool.discard()
+
+
+class StorageWriteSink(Sink):
+    """Append chunks as Arrow record batches through the BigQuery Storage Write API.
+
+    Every upload thread appends to its own write stream. Rows in a committed
+    stream are visible as soon as their append is acknowledged; pending streams
+    are committed together by `finish`, so a failed transfer leaves the table as
+    it was. Appends carry explicit stream offsets, so an append retried after a
+    lost response is rejected as already written instead of adding its rows twice.
+
+    The table must exist or `schema` must be given to create it. Truncating runs
+    clear the table with a TRUNCATE TABLE statement before the first append, so
+    they need committed streams: a truncate and a commit cannot be applied
+    together, and a failed commit would leave the table empty. A merge still uses
+    pending streams, since it only truncates its staging table before the commit.
+    """
+
+    def __init__(
+        self,
+        write_client: Any,
+        client: bigquery.Client,
+        table_ref: str,
+        write_mode: str,
+        retry_policy: RetryPolicy,
+        retry_stats: RetryStats,
+        metrics: TransferMetrics,
+        schema: Optional[List[bigquery.SchemaField]] = None,
+        stream_type: str = "committed"
+    ):
+        if stream_type not in STORAGE_WRITE_STREAMS:
+            raise ValueError(f"stream_type must be one of {', '.join(STORAGE_WRITE_STREAMS)}")
+        if stream_type == "pending" and write_mode == "truncate_append":
+            raise ValueError("pending write streams cannot truncate the table; use append or committed streams")
+
+        super().__init__(metrics)
+        self.write_client = write_client
+        self.client = client
+        self.table_ref = table_ref
+        self.write_mode = write_mode
+        self.retry_policy = retry_policy
+        self.retry_stats = retry_stats
+        self.schema = schema
+        self.stream_type = stream_type
+
+        project, dataset, table = table_ref.split(".")
+        self.table_path = f"projects/{project}/datasets/{dataset}/tables/{table}"
+
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._streams: List[Dict[str, Any]] = []
+        self._writer_schema: Optional[pa.Schema] = None
+        self._table_ready = False
+        self._truncate_on_commit = False
+        self._pending_commits: List[Callable[[Any], None]] = []
+        self._pending_rows = 0
+        self._committed_rows = 0
+
+    @property
+    def committed_rows(self) -> Optional[int]:
+        return self._committed_rows if self.stream_type == "pending" else None
+
+    def write(
+        self,
+        df: pl.DataFrame,
+        is_first_chunk: bool,
+        on_commit: Optional[Callable[[Any], None]] = None,
+        seconds: Optional[Dict[str, float]] = None,
+        counters: Optional[Dict[str, float]] = None
+    ) -> None:
+        seconds = dict(seconds or {})
+        counters = dict(counters or {})
+        rows = df.shape[0]
+
+        table = bigquery_arrow_table(df)
+        with self._lock:
+            self._ensure_table()
+            if self._writer_schema is None:
+                self._writer_schema = table.schema
+            else:
+                # Columns that were all NULL in an earlier chunk still need to line up
+                table = table.cast(self._writer_schema)
+
+        truncate = is_first_chunk and self.write_mode in ("truncate_append", "merge")
+        if truncate and self.stream_type == "committed":
+            self._truncate()
+
+        stream = self._stream()
+        encode_start = time.time()
+        batches = self._serialize(table)
+        seconds["encode"] = time.time() - encode_start
+        counters["bytes_encoded"] = sum(len(batch) for batch, _ in batches)
+        log_encoding(rows, counters, "Arrow")
+
+        offset = stream["offset"]
+        upload_start = time.time()
+        self.retry_policy.call(
+            lambda: self._append(stream, batches, offset),
+            is_retryable_bigquery_error,
+            f"Appending {rows} rows to {self.table_ref}",
+            "append",
+            self.retry_stats
+        )
+        seconds["upload"] = time.time() - upload_start
+        stream["offset"] += rows
+        stream["rows"] += rows
+
+        self.metrics.record(
+            "append",
+            seconds,
+            {"bytes_uploaded": counters["bytes_encoded"], **counters},
+            write_stream=stream["name"],
+            rows=rows,
+        )
+
+        if self.stream_type == "committed":
+            logger.info(f"Appended {rows} rows to {self.table_ref}")
+            if on_commit is not None:
+                on_commit(None)
+            return
+
+        with self._lock:
+            self._truncate_on_commit = self._truncate_on_commit or truncate
+            self._pending_rows += rows
+            if on_commit is not None:
+                self._pending_commits.append(on_commit)
+        logger.info(f"Appended {rows} rows to pending stream {stream['name']}")
+
+    def finish(self) -> None:
+        from google.cloud.bigquery_storage_v1 import types as write_types
+
+        names = [stream["name"] for stream in self._streams]
+        for name in names:
+            self.write_client.finalize_write_stream(name=name)
+
+        if self.stream_type == "pending":
+            if self._truncate_on_commit:
+                self._truncate()
+            if names:
+                response = self.write_client.batch_commit_write_streams(
+                    request=write_types.BatchCommitWriteStreamsRequest(parent=self.table_path, write_streams=names)
+                )
+                if response.stream_errors:
+                    errors = "; ".join(f"{error.entity}: {error.error_message}" for error in response.stream_errors)
+                    raise RuntimeError(f"Committing write streams to {self.table_ref} failed: {errors}")
+                logger.info(f"Committed {self._pending_rows} rows from {len(names)} pending stream(s)")
+            self._committed_rows = self._pending_rows
+            for commit in self._pending_commits:
+                commit(None)
+
+    def summary(self) -> Dict[str, Any]:
+        return {"write_streams": [{"name": s["name"], "rows": s["rows"]} for s in self._streams]}
+
+    def _ensure_table(self) -> None:
+        """Create the target table from the explicit schema if it does not exist yet."""
+        if self._table_ready:
+            return
+
+        from google.api_core.exceptions import NotFound
+        from google.cloud import bigquery
+
+        try:
+            self.client.get_table(self.table_ref)
+        except NotFound:
+            if self.schema is None:
+                raise ValueError(f"{self.table_ref} does not exist; the storage-write sink needs an explicit "
+                                 "schema to create it")
+            logger.info(f"Creating {self.table_ref} with {len(self.schema)} columns")
+            self.client.create_table(bigquery.Table(self.table_ref, schema=self.schema))
+        self._table_ready = True
+
+    def _truncate(self) -> None:
+        logger.info(f"Truncating {self.table_ref}")
+        self.client.query(f"TRUNCATE TABLE `{self.table_ref}`").result()
+
+    def _stream(self) -> Dict[str, Any]:
+        """Return the calling thread's write stream, creating it on first use."""
+        stream = getattr(self._local, "stream", None)
+        if stream is None:
+            from google.cloud.bigquery_storage_v1 import types as write_types
+
+            stream_type = (write_types.WriteStream.Type.PENDING if self.stream_type == "pending"
+                           else write_types.WriteStream.Type.COMMITTED)
+            created = self.write_client.create_write_stream(
+                parent=self.table_path,
+                write_stream=write_types.WriteStream(type_=stream_type)
+            )
+            stream = {"name": created.name, "offset": 0, "rows": 0}
+            self._local.stream = stream
+            with self._lock:
+                self._streams.append(stream)
+            logger.info(f"Opened {self.stream_type} write stream {created.name}")
+        return stream
+
+    def _serialize(self, table: pa.Table) -> List[Any]:
+        """Split a chunk into serialized record batches that each fit in one append request."""
+        rows_per_batch = max(1, table.num_rows * MAX_APPEND_BYTES // max(table.nbytes, 1))
+        return [
+            (batch.serialize().to_pybytes(), batch.num_rows)
+            for batch in table.to_batches(max_chunksize=rows_per_batch)
+        ]
+
+    def _append(self, stream: Dict[str, Any], batches: List[Any], offset: int) -> None:
+        """Send a chunk's batches on one AppendRows connection and check every response."""
+        from google.api_core import exceptions as api_exceptions
+        from google.cloud.bigquery_storage_v1 import types as write_types
+
+        writer_schema = write_types.ArrowSchema(serialized_schema=self._writer_schema.serialize().to_pybytes())
+        requests = []
+        for serialized, row_count in batches:
+            request = write_types.AppendRowsRequest(
+                offset=offset,
+                arrow_rows=write_types.AppendRowsRequest.ArrowData(
+                    rows=write_types.ArrowRecordBatch(serialized_record_batch=serialized, row_count=row_count)
+                ),
+            )
+            if not requests:
+                # The first request on a connection names the stream and the schema of the rows
+                request.write_stream = stream["name"]
+                request.arrow_rows.writer_schema = writer_schema
+            requests.append(request)
+            offset += row_count
+
+        responses = self.write_client.append_rows(
+            requests=iter(requests),
+            metadata=(("x-goog-request-params", f"write_stream={stream['name']}"),)
+        )
+        for response in responses:
+            if response.error.code == ALREADY_EXISTS:
+                # Written by an earlier attempt whose response was lost
+                continue
+            if response.error.code:
+                raise api_exceptions.from_grpc_status(response.error.code, response.error.message)
+            if response.row_errors:
+                errors = "; ".join(f"row {error.index}: {error.message}" for error in response.row_errors)
+                raise ValueError(f"Appending to {stream['name']} failed: {errors}")
+
+
+class ParquetDatasetSink(Sink):
+    """Write chunks as files of a local Parquet dataset, optionally Hive-partitioned by columns.
+
+    Each chunk becomes one file per partition, written under a temporary name and
+    renamed into place so that readers never see a partial file. Truncating runs
+    remove the dataset's existing data files before the first chunk is written.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        write_mode: str,
+        encoding: ParquetEncoding,
+        metrics: TransferMetrics,
+        partition_by: Optional[List[str]] = None
+    ):
+        if write_mode == "merge":
+            raise ValueError("The parquet sink cannot merge; use write_mode append or truncate_append")
+
+        super().__init__(metrics)
+        self.path = path
+        self.write_mode = write_mode
+        self.encoding = encoding
+        self.partition_by = partition_by or []
+        self.files: List[str] = []
+        self.bytes_written = 0
+
+        self._run_id = uuid.uuid4().hex[:12]
+        self._seq = 0
+        self._lock = threading.Lock()
+
+    def write(
+        self,
+        df: pl.DataFrame,
+        is_first_chunk: bool,
+        on_commit: Optional[Callable[[Any], None]] = None,
+        seconds: Optional[Dict[str, float]] = None,
+        counters: Optional[Dict[str, float]] = None
+    ) -> None:
+        seconds = dict(seconds or {})
+        counters = dict(counters or {})
+
+        with self._lock:
+            if is_first_chunk and self.write_mode == "truncate_append":
+                self._clear()
+            seq = self._seq
+            self._seq += 1
+
+        if self.partition_by:
+            parts = df.partition_by(self.partition_by, as_dict=True, include_key=False)
+        else:
+            parts = {(): df}
+
+        encode_start = time.time()
+        written = []
+        for key, part in parts.items():
+            directory = os.path.join(self.path, *(
+                f"{column}={HIVE_NULL_PARTITION if value is None else quote(str(value), safe=' ')}"
+                for column, value in zip(self.partition_by, key)
+            ))
+            os.makedirs(directory, exist_ok=True)
+            file_path = os.path.join(directory, f"part-{self._run_id}-{seq:05d}.parquet")
+            temp_path = os.path.join(directory, f".part-{self._run_id}-{seq:05d}.parquet.tmp")
+            self.encoding.write(part, temp_path)
+            os.replace(temp_path, file_path)
+            written.append(file_path)
+        seconds["encode"] = time.time() - encode_start
+
+        counters["bytes_encoded"] = sum(os.path.getsize(file_path) for file_path in written)
+        log_encoding(df.shape[0], counters)
+        self.metrics.record(
+            "write",
+            seconds,
+            {"bytes_written": counters["bytes_encoded"], **counters},
+            rows=df.shape[0],
+            files=len(written),
+        )
+
+        with self._lock:
+            self.files.extend(written)
+            self.bytes_written += counters["bytes_encoded"]
+        logger.info(f"Wrote {df.shape[0]} rows to {len(written)} file(s) under {self.path}")
+        if on_commit is not None:
+            on_commit(None)
+
+    def summary(self) -> Dict[str, Any]:
+        return {"files_written": len(self.files), "mb_written": self.bytes_written / (1024 * 1024)}
+
+    def _clear(self) -> None:
+        """Remove the data files and partition directories a previous run left in the dataset."""
+        if not os.path.isdir(self.path):
+            return
+        removed = 0
+        for entry in os.listdir(self.path):
+            entry_path = os.path.join(self.path, entry)
+            if os.path.isdir(entry_path) and "=" in entry:
+                shutil.rmtree(entry_path)
+                removed += 1
+            elif entry.startswith("part-") and entry.endswith(".parquet"):
+                os.remove(entry_path)
+                removed += 1
+        if removed:
+            logger.info(f"Removed {removed} existing file(s) or partition(s) from {self.path}")
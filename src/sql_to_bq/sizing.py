@@ -0,0 +1,113 @@
+"""Adaptive chunk sizing against a memory budget, and process memory reporting."""
+
+import logging
+import sys
+import threading
+from typing import List, Optional
+
+logger = logging.getLogger("sql-to-bq-transfer")
+
+# A chunk is held as a DataFrame and again as Arrow/Parquet while it is encoded for upload
+ENCODING_OVERHEAD = 2.0
+
+# Grow by this factor per chunk, and only keep growing while it buys this much throughput
+GROWTH_FACTOR = 2.0
+MIN_THROUGHPUT_GAIN = 1.05
+
+
+def peak_rss_bytes() -> Optional[int]:
+    """Return the peak resident set size of this process, or None where it cannot be read."""
+    try:
+        import resource
+    except ImportError:
+        # Not available on Windows
+        return None
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes elsewhere
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class AdaptiveChunkSizer:
+    """Pick each chunk's row count from the measured size and throughput of earlier chunks.
+
+    The bytes per row seen so far cap the chunk at its share of the memory budget,
+    so a chunk of wide rows shrinks the next one immediately. Below that cap chunks
+    grow geometrically for as long as each step still improves combined read and
+    upload throughput, since larger chunks also mean fewer, more efficient load jobs.
+    """
+
+    def __init__(
+        self,
+        budget_bytes: int,
+        initial_rows: int,
+        chunks_in_memory: int = 1,
+        min_rows: int = 100,
+        max_rows: Optional[int] = None
+    ):
+        if budget_bytes <= 0:
+            raise ValueError("budget_bytes must be > 0")
+
+        self.chunk_budget = budget_bytes / (max(chunks_in_memory, 1) * ENCODING_OVERHEAD)
+        self.min_rows = min(min_rows, initial_rows)
+        self.max_rows = max_rows
+        self.current_rows = initial_rows
+        self.chunk_sizes: List[int] = []
+        self.bytes_per_row: Optional[float] = None
+
+        self._read_seconds_per_row: Optional[float] = None
+        self._upload_seconds_per_row: Optional[float] = None
+        self._rate_before_growth: Optional[float] = None
+        self._plateau = False
+        self._observed = False
+        self._lock = threading.Lock()
+
+    def record_read(self, rows: int, nbytes: int, seconds: float) -> None:
+        if rows <= 0:
+            return
+        with self._lock:
+            measured = nbytes / rows
+            # Follow the average, but react at once to a chunk of wider rows
+            if self.bytes_per_row is None:
+                self.bytes_per_row = measured
+            else:
+                self.bytes_per_row = max(measured, (self.bytes_per_row + measured) / 2)
+            self._read_seconds_per_row = seconds / rows
+            self._observed = True
+
+    def record_upload(self, rows: int, seconds: float) -> None:
+        if rows <= 0:
+            return
+        with self._lock:
+            self._upload_seconds_per_row = seconds / rows
+
+    def _rows_per_second(self) -> Optional[float]:
+        seconds_per_row = (self._read_seconds_per_row or 0) + (self._upload_seconds_per_row or 0)
+        return 1 / seconds_per_row if seconds_per_row > 0 else None
+
+    def next_rows(self) -> int:
+        """Return the row count for the next chunk and record it in `chunk_sizes`."""
+        with self._lock:
+            if self._observed:
+                rate = self._rows_per_second()
+                if self._rate_before_growth is not None and rate is not None:
+                    if rate < self._rate_before_growth * MIN_THROUGHPUT_GAIN:
+                        self._plateau = True
+                    self._rate_before_growth = None
+
+                target = self.current_rows if self._plateau else int(self.current_rows * GROWTH_FACTOR)
+                if self.bytes_per_row:
+                    target = min(target, int(self.chunk_budget / self.bytes_per_row))
+                if self.max_rows is not None:
+                    target = min(target, self.max_rows)
+                target = max(target, self.min_rows)
+
+                if target > self.current_rows:
+                    self._rate_before_growth = rate
+                if target != self.current_rows:
+                    logger.info(f"Adjusting chunk size from {self.current_rows} to {target} rows")
+                self.current_rows = target
+                self._observed = False
+
+            self.chunk_sizes.append(self.current_rows)
+            return self.current_rows
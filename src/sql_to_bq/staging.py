@@ -0,0 +1,98 @@
+"""Local Parquet spooling used to coalesce chunks into fewer BigQuery load jobs."""
+
+from __future__ import annotations
+
+import logging
+import os
+import uuid
+from typing import TYPE_CHECKING, Any, Dict, Optional
+
+if TYPE_CHECKING:
+    import polars as pl
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+from .encoding import ParquetEncoding
+
+logger = logging.getLogger("sql-to-bq-transfer")
+
+
+class ParquetSpool:
+    """Append chunks as row groups of one local Parquet file until it reaches a byte budget.
+
+    Only the chunk being written is held in memory; earlier chunks already live on
+    disk as row groups. Once `is_full` the spool is closed and the file is handed
+    to a single load job.
+    """
+
+    def __init__(self, directory: str, max_bytes: int, encoding: Optional[ParquetEncoding] = None):
+        os.makedirs(directory, exist_ok=True)
+        self.path = os.path.join(directory, f"bq_stage_{uuid.uuid4()}.parquet")
+        self.max_bytes = max_bytes
+        self.encoding = encoding or ParquetEncoding()
+        self.rows = 0
+        self.chunks = 0
+        self.contains_first_chunk = False
+
+        self._sink: Optional[pa.OSFile] = None
+        self._writer: Optional[pq.ParquetWriter] = None
+
+    @property
+    def size(self) -> int:
+        """Bytes written to the spool file so far."""
+        return self._sink.tell() if self._sink is not None else 0
+
+    @property
+    def is_full(self) -> bool:
+        return self.size >= self.max_bytes
+
+    def append(self, df: pl.DataFrame, is_first_chunk: bool = False) -> bool:
+        """Write a chunk as a new row group.
+
+        Returns False, without writing, when the chunk cannot be cast to the schema
+        of the rows already in the file.
+        """
+        import pyarrow as pa
+
+        table = df.to_arrow()
+        if self._writer is None:
+            self._sink = pa.OSFile(self.path, "wb")
+            self._writer = self.encoding.open_writer(self._sink, table.schema)
+        else:
+            # Columns that were all NULL in an earlier chunk still need to line up
+            try:
+                table = table.cast(self._writer.schema)
+            except (pa.ArrowInvalid, pa.ArrowNotImplementedError, ValueError):
+                return False
+
+        self.encoding.write_table(self._writer, table)
+        self.rows += df.shape[0]
+        self.chunks += 1
+        self.contains_first_chunk = self.contains_first_chunk or is_first_chunk
+        return True
+
+    def close(self) -> Dict[str, Any]:
+        """Finish the Parquet file and return its path, row, chunk and byte counts."""
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        if self._sink is not None:
+            self._sink.close()
+            self._sink = None
+
+        return {
+            "path": self.path,
+            "rows": self.rows,
+            "chunks": self.chunks,
+            "bytes": os.path.getsize(self.path) if os.path.exists(self.path) else 0,
+        }
+
+    def discard(self) -> None:
+        """Close and delete the spool file."""
+        self.close()
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f"Could not remove staged file {self.path}: {e}")
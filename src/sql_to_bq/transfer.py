@@ -1,27 +1,279 @@
-import polars as pl
-import pyodbc
+from __future__ import annotations
+
 import time
 import logging
 import os
-import uuid
-import tempfile
-from google.cloud import bigquery
-from google.oauth2 import service_account
-from typing import Optional, Dict, Any
-import sys
-import gc
-
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler("transfer.log"),
-        logging.StreamHandler(sys.stdout)
-    ]
-)
+import queue
+import threading
+import multiprocessing
+import datetime
+import re
+from decimal import Decimal
+from .schema import SourceSchema
+from .checkpoint import Checkpoint
+from .incremental import WatermarkState, build_merge_statement, sql_datetime_type, sql_literal
+from .sizing import AdaptiveChunkSizer, peak_rss_bytes
+from .metrics import TransferMetrics
+from .encoding import ParquetEncoding
+from .connections import ConnectionPool, close_quietly
+from .retry import RetryPolicy, RetryStats, is_retryable_sql_error
+from .sinks import SINKS, STORAGE_WRITE_STREAMS, LoadJobSink, ParquetDatasetSink, Sink, StorageWriteSink
+from typing import TYPE_CHECKING, Optional, Dict, Any, List, Tuple, Iterator, Union, Callable
+
+# Polars, pyodbc and the Google clients are imported where they are first used, so that
+# importing this module, validating options and planning a transfer stay fast
+if TYPE_CHECKING:
+    import polars as pl
+    from google.cloud import bigquery
+
 logger = logging.getLogger("sql-to-bq-transfer")
 
+READ_MODES = ("offset", "keyset", "stream")
+WRITE_MODES = ("truncate_append", "append", "merge")
+READER_BACKENDS = ("pyodbc", "arrow-odbc")
+
+# Offset queries listed by plan() before the rest are only counted
+PLAN_MAX_QUERIES = 20
+
+# Target types accepted in column casts, e.g. INT, DECIMAL(18, 2), NVARCHAR(MAX), DATETIME2(3)
+CAST_TYPE_PATTERN = re.compile(r"^[A-Za-z][A-Za-z0-9_ ]*(\(\s*(\d+|MAX)\s*(,\s*\d+\s*)?\))?$", re.IGNORECASE)
+
+
+def build_connection_string(
+    sql_server: str,
+    sql_database: str,
+    sql_username: Optional[str] = None,
+    sql_password: Optional[str] = None,
+    sql_driver: str = "ODBC Driver 17 for SQL Server"
+) -> str:
+    """Build an ODBC connection string, using Windows auth when no credentials are given."""
+    if sql_username and sql_password:
+        return (
+            f'DRIVER={{{sql_driver}}};'
+            f'SERVER={sql_server};'
+            f'DATABASE={sql_database};'
+            f'UID={sql_username};'
+            f'PWD={sql_password}'
+        )
+    return (
+        f'DRIVER={{{sql_driver}}};'
+        f'SERVER={sql_server};'
+        f'DATABASE={sql_database};'
+        f'Trusted_Connection=yes'
+    )
+
+
+def estimate_table_rows(conn: Any, sql_table: str) -> Optional[int]:
+    """Return the catalog row count of a table from sys.dm_db_partition_stats, or None if unknown.
+
+    The count comes from metadata, so it is cheap but may lag in-flight changes.
+    """
+    cursor = conn.cursor()
+    try:
+        cursor.execute(
+            """
+            SELECT SUM(row_count)
+            FROM sys.dm_db_partition_stats
+            WHERE object_id = OBJECT_ID(?) AND index_id IN (0, 1)
+            """,
+            sql_table
+        )
+        row = cursor.fetchone()
+    finally:
+        cursor.close()
+    return int(row[0]) if row and row[0] is not None else None
+
+
+def _quote_identifier(name: str) -> str:
+    """Quote a SQL Server identifier with brackets."""
+    return "[" + name.replace("]", "]]") + "]"
+
+def _keyset_parameters(last_key: Tuple[Any, ...]) -> List[Any]:
+    """Expand the last seen key into the parameters of the keyset predicate."""
+    parameters = []
+    for i in range(len(last_key)):
+        parameters.extend(last_key[:i + 1])
+    return parameters
+
+
+def _odbc_text_parameter(value: Any) -> Optional[str]:
+    """Render a query parameter as text, since arrow-odbc binds every parameter as VARCHAR."""
+    if value is None:
+        return None
+    if isinstance(value, datetime.datetime):
+        # DATETIME only accepts three fractional digits, so keep milliseconds when nothing is lost
+        timespec = "milliseconds" if value.microsecond % 1000 == 0 else "microseconds"
+        return value.isoformat(sep=" ", timespec=timespec)
+    if isinstance(value, bytes):
+        raise ValueError("Binary key values are not supported by the arrow-odbc reader backend")
+    return str(value)
+
+
+def _normalize_arrow_frame(df: pl.DataFrame) -> pl.DataFrame:
+    """Cast arrow-odbc column types to the dtypes the pyodbc path produces.
+
+    arrow-odbc keeps the narrow SQL types (TINYINT as UInt8, REAL as Float32,
+    DATETIME2(7) as nanoseconds) while rows fetched through pyodbc come back as
+    Int64, Float64 and microsecond datetimes.
+    """
+    import polars as pl
+
+    casts = {}
+    for name, dtype in df.schema.items():
+        if dtype.is_integer() and dtype != pl.Int64:
+            casts[name] = pl.Int64
+        elif dtype == pl.Float32:
+            casts[name] = pl.Float64
+        elif isinstance(dtype, pl.Datetime) and dtype.time_unit != "us":
+            casts[name] = pl.Datetime("us", dtype.time_zone)
+    return df.cast(casts) if casts else df
+
+
+def _read_arrow_batches(
+    conn_str: str,
+    query: str,
+    batch_size: int,
+    parameters: Optional[List[Any]] = None,
+    max_text_size: Optional[int] = None,
+    max_binary_size: Optional[int] = None,
+    timings: Optional[Dict[str, float]] = None
+) -> Iterator[pl.DataFrame]:
+    """Execute a query through arrow-odbc and yield columnar batches as DataFrames.
+
+    When a `timings` dict is given, seconds spent executing the query, fetching
+    batches and converting them to Polars are added to its query, fetch and
+    convert entries.
+    """
+    if timings is None:
+        timings = {}
+
+    import polars as pl
+
+    try:
+        from arrow_odbc import read_arrow_batches_from_odbc
+    except ImportError as e:
+        raise ImportError(
+            "The arrow-odbc reader backend requires the arrow-odbc package; "
+            "install it with: pip install 'sql-to-bq-transfer[arrow]'"
+        ) from e
+
+    query_start = time.time()
+    reader = read_arrow_batches_from_odbc(
+        query=query,
+        connection_string=conn_str,
+        batch_size=batch_size,
+        parameters=[_odbc_text_parameter(p) for p in parameters] if parameters else None,
+        max_text_size=max_text_size,
+        max_binary_size=max_binary_size,
+    )
+    timings["query"] = timings.get("query", 0.0) + time.time() - query_start
+
+    batches = iter(reader)
+    while True:
+        fetch_start = time.time()
+        batch = next(batches, None)
+        timings["fetch"] = timings.get("fetch", 0.0) + time.time() - fetch_start
+        if batch is None:
+            return
+
+        convert_start = time.time()
+        df = _normalize_arrow_frame(pl.from_arrow(batch))
+        timings["convert"] = timings.get("convert", 0.0) + time.time() - convert_start
+        yield df
+
+
+def _read_arrow_chunk(
+    conn_str: str,
+    query: str,
+    limit: int,
+    parameters: Optional[List[Any]] = None,
+    timings: Optional[Dict[str, float]] = None,
+    **arrow_options: Any
+) -> pl.DataFrame:
+    """Read a whole chunk through arrow-odbc, joining the batches the driver returns."""
+    import polars as pl
+
+    frames = list(_read_arrow_batches(conn_str, query, limit, parameters, timings=timings, **arrow_options))
+    if not frames:
+        return pl.DataFrame()
+    return pl.concat(frames) if len(frames) > 1 else frames[0]
+
+
+def _extract_partition(
+    conn_str: str,
+    partition_id: int,
+    first_query: str,
+    next_query: str,
+    range_params: List[Any],
+    key_columns: List[str],
+    chunk_size: int,
+    out_queue: Any,
+    reader_backend: str = "pyodbc",
+    arrow_options: Optional[Dict[str, Any]] = None,
+    retry_policy: Optional[RetryPolicy] = None
+) -> None:
+    """Keyset-page through one key range on its own connection and queue each chunk.
+
+    Runs in a worker process. Chunks are sent as (partition_id, DataFrame); the
+    partition ends with (partition_id, stats dict) or (partition_id, error message).
+    Transient read errors are retried on a new connection from the last key seen.
+    """
+    import polars as pl
+    import pyodbc
+
+    start_time = time.time()
+    retry_policy = retry_policy or RetryPolicy(max_retries=0)
+    retry_stats = RetryStats()
+    conn = None
+
+    def reset_connection(error: BaseException) -> None:
+        nonlocal conn
+        if conn is not None:
+            close_quietly(conn)
+            conn = None
+
+    try:
+        last_key = None
+        while True:
+            if last_key is None:
+                query, parameters = first_query, list(range_params)
+            else:
+                query, parameters = next_query, list(range_params) + _keyset_parameters(last_key)
+
+            def read() -> pl.DataFrame:
+                nonlocal conn
+                if reader_backend == "arrow-odbc":
+                    return _read_arrow_chunk(conn_str, query, chunk_size, parameters, **(arrow_options or {}))
+                if conn is None:
+                    conn = pyodbc.connect(conn_str)
+                return pl.read_database(
+                    query=query,
+                    connection=conn,
+                    execute_options={"parameters": parameters} if parameters else None
+                )
+
+            df_chunk = retry_policy.call(
+                read,
+                is_retryable_sql_error,
+                f"Partition {partition_id} read after key {last_key}",
+                "read",
+                retry_stats,
+                on_retry=reset_connection
+            )
+            if not df_chunk.is_empty():
+                out_queue.put((partition_id, df_chunk))
+            if df_chunk.shape[0] < chunk_size:
+                break
+            last_key = df_chunk.select(key_columns).row(-1)
+
+        out_queue.put((partition_id, {"time_taken": time.time() - start_time, **retry_stats.as_dict()}))
+    except Exception as e:
+        out_queue.put((partition_id, str(e)))
+    finally:
+        if conn is not None:
+            conn.close()
+
+
 class SQLServerToBigQueryTransfer:
     """Transfer data from SQL Server to BigQuery using Polars."""
 
@@ -40,9 +292,59 @@ class SQLServerToBigQueryTransfer:
         sql_username: Optional[str] = None,
         sql_password: Optional[str] = None,
         sql_driver: str = "ODBC Driver 17 for SQL Server",
-        write_mode: str = "truncate_append"
+        write_mode: str = "truncate_append",
+        read_mode: str = "offset",
+        key_column: Optional[Union[str, List[str]]] = None,
+        queue_depth: int = 0,
+        upload_workers: int = 1,
+        parallelism: int = 1,
+        reader_backend: str = "pyodbc",
+        odbc_max_text_size: Optional[int] = None,
+        odbc_max_binary_size: Optional[int] = None,
+        upload_memory_limit_mb: int = 512,
+        max_inflight_jobs: int = 1,
+        staging_dir: Optional[str] = None,
+        load_batch_mb: int = 1024,
+        explicit_schema: bool = False,
+        schema_cache_dir: Optional[str] = None,
+        checkpoint_file: Optional[str] = None,
+        resume: bool = False,
+        watermark_column: Optional[str] = None,
+        watermark_state_file: Optional[str] = None,
+        merge_keys: Optional[Union[str, List[str]]] = None,
+        staging_table: Optional[str] = None,
+        sql_conn: Optional[Any] = None,
+        bq_client: Optional[bigquery.Client] = None,
+        exact_count: bool = False,
+        memory_budget_mb: Optional[int] = None,
+        metrics_file: Optional[str] = None,
+        prometheus_file: Optional[str] = None,
+        parquet_compression: Optional[str] = None,
+        parquet_compression_level: Optional[int] = None,
+        parquet_row_group_size: Optional[int] = None,
+        parquet_dictionary: bool = True,
+        parquet_statistics: bool = True,
+        narrow_types: bool = False,
+        max_retries: int = 3,
+        retry_backoff: float = 1.0,
+        retry_max_backoff: float = 60.0,
+        sql_pool: Optional[ConnectionPool] = None,
+        columns: Optional[Union[str, List[str]]] = None,
+        exclude_columns: Optional[Union[str, List[str]]] = None,
+        where: Optional[str] = None,
+        column_casts: Optional[Dict[str, str]] = None,
+        sink: str = "load-job",
+        sink_path: Optional[str] = None,
+        sink_partition_by: Optional[Union[str, List[str]]] = None,
+        storage_write_stream: str = "committed",
+        bq_write_client: Optional[Any] = None
     ):
-        """Initialize the transfer with connection parameters."""
+        """Initialize the transfer with connection parameters.
+
+        An open `sql_conn` or `bq_client` can be passed in to share connections
+        between transfers; a passed-in SQL connection is left open afterwards.
+        The BigQuery clients are only created once a sink or merge needs them.
+        """
         self.sql_server = sql_server
         self.sql_database = sql_database
         self.sql_query = sql_query
@@ -57,70 +359,295 @@ class SQLServerToBigQueryTransfer:
         self.sql_password = sql_password
         self.sql_driver = sql_driver
         self.write_mode = write_mode
+        self.read_mode = read_mode
+        self.queue_depth = queue_depth
+        self.upload_workers = upload_workers
+        self.parallelism = parallelism
+        self.reader_backend = reader_backend
+        self.upload_memory_limit_mb = upload_memory_limit_mb
+        self.max_inflight_jobs = max_inflight_jobs
+        self.staging_dir = staging_dir
+        self.load_batch_mb = load_batch_mb
+        self.sink_type = sink
+        self.sink_path = sink_path
+        self.storage_write_stream = storage_write_stream
+        self.sink: Optional[Sink] = None
+        self.parquet_encoding = ParquetEncoding(
+            compression=parquet_compression,
+            compression_level=parquet_compression_level,
+            row_group_size=parquet_row_group_size,
+            dictionary=parquet_dictionary,
+            statistics=parquet_statistics,
+            narrow=narrow_types
+        )
+        self.explicit_schema = explicit_schema
+        self.schema_cache_dir = schema_cache_dir
+        self.source_schema: Optional[SourceSchema] = None
+        self.bq_schema: Optional[List[bigquery.SchemaField]] = None
+        self.cast_plan: Optional[Dict[str, pl.DataType]] = None
+        self.checkpoint_file = checkpoint_file
+        self.resume = resume
+        self.checkpoint: Optional[Checkpoint] = None
+        self.watermark_column = watermark_column
+        self.watermark_state_file = watermark_state_file
+        self.watermark_state: Optional[WatermarkState] = None
+        self.watermark_range: Optional[Tuple[Any, Any]] = None
+        self.watermark_type: Optional[str] = None
+        self.arrow_options = {
+            "max_text_size": odbc_max_text_size,
+            "max_binary_size": odbc_max_binary_size,
+        }
+        self.partition_stats: List[Dict[str, Any]] = []
+        self.memory_budget_mb = memory_budget_mb
+        self.chunk_sizer: Optional[AdaptiveChunkSizer] = None
+        self._read_timings: Dict[str, float] = {}
+
+        if isinstance(key_column, str):
+            key_column = [c.strip() for c in key_column.split(",") if c.strip()]
+        self.key_columns: Optional[List[str]] = key_column or None
+
+        if isinstance(merge_keys, str):
+            merge_keys = [c.strip() for c in merge_keys.split(",") if c.strip()]
+        self.merge_keys: Optional[List[str]] = merge_keys or None
+
+        if isinstance(columns, str):
+            columns = [c.strip() for c in columns.split(",") if c.strip()]
+        self.columns: Optional[List[str]] = columns or None
+
+        if isinstance(exclude_columns, str):
+            exclude_columns = [c.strip() for c in exclude_columns.split(",") if c.strip()]
+        self.exclude_columns: List[str] = exclude_columns or []
+
+        if isinstance(sink_partition_by, str):
+            sink_partition_by = [c.strip() for c in sink_partition_by.split(",") if c.strip()]
+        self.sink_partition_by: List[str] = sink_partition_by or []
+
+        self.where = where
+        self.column_casts: Dict[str, str] = dict(column_casts or {})
+        self.projection: Optional[List[str]] = None
 
         if not sql_query and not sql_table:
             raise ValueError("Either sql_query or sql_table name must be provided")
 
+        if self.columns and self.exclude_columns:
+            raise ValueError("columns and exclude_columns cannot be combined")
+
+        invalid_casts = [f"{c}={t}" for c, t in self.column_casts.items() if not CAST_TYPE_PATTERN.match(t.strip())]
+        if invalid_casts:
+            raise ValueError(f"column_casts must map columns to SQL Server types, got: {', '.join(invalid_casts)}")
+
+        if self.columns:
+            selected = {c.lower() for c in self.columns}
+            missing = [c for c in self.column_casts if c.lower() not in selected]
+            if missing:
+                raise ValueError(f"column_casts refer to columns that are not selected: {', '.join(missing)}")
+
+        if write_mode not in WRITE_MODES:
+            raise ValueError(f"write_mode must be one of {', '.join(WRITE_MODES)}")
+
+        if read_mode not in READ_MODES:
+            raise ValueError(f"read_mode must be one of {', '.join(READ_MODES)}")
+
+        if reader_backend not in READER_BACKENDS:
+            raise ValueError(f"reader_backend must be one of {', '.join(READER_BACKENDS)}")
+
+        if queue_depth < 0 or upload_workers < 1:
+            raise ValueError("queue_depth must be >= 0 and upload_workers must be >= 1")
+
+        if parallelism < 1:
+            raise ValueError("parallelism must be >= 1")
+
+        if max_inflight_jobs < 1:
+            raise ValueError("max_inflight_jobs must be >= 1")
+
+        if sink not in SINKS:
+            raise ValueError(f"sink must be one of {', '.join(SINKS)}")
+
+        if storage_write_stream not in STORAGE_WRITE_STREAMS:
+            raise ValueError(f"storage_write_stream must be one of {', '.join(STORAGE_WRITE_STREAMS)}")
+
+        if sink == "storage-write" and storage_write_stream == "pending" and write_mode == "truncate_append":
+            raise ValueError("storage_write_stream pending requires write_mode append or merge")
+
+        if sink != "load-job" and (staging_dir or max_inflight_jobs > 1):
+            raise ValueError("staging_dir and max_inflight_jobs only apply to the load-job sink")
+
+        if sink == "parquet" and not sink_path:
+            raise ValueError("the parquet sink requires sink_path")
+
+        if sink == "parquet" and write_mode == "merge":
+            raise ValueError("write_mode merge requires a BigQuery sink")
+
+        if self.sink_partition_by and sink != "parquet":
+            raise ValueError("sink_partition_by only applies to the parquet sink")
+
+        # Narrowing picks types per chunk; only load jobs widen them back to one BigQuery type
+        if narrow_types and sink != "load-job":
+            raise ValueError("narrow_types only applies to the load-job sink")
+
+        if resume and not checkpoint_file:
+            raise ValueError("resume requires checkpoint_file")
+
+        if resume and (read_mode == "stream" or parallelism > 1):
+            raise ValueError("resume is only supported for offset or keyset reads without parallelism")
+
+        if parallelism > 1 and read_mode == "stream":
+            raise ValueError("parallelism cannot be combined with stream reads")
+
+        if memory_budget_mb is not None and memory_budget_mb <= 0:
+            raise ValueError("memory_budget_mb must be > 0")
+
+        if memory_budget_mb is not None and (read_mode == "stream" or parallelism > 1):
+            raise ValueError("memory_budget_mb requires offset or keyset reads without parallelism")
+
+        if (read_mode == "keyset" or parallelism > 1) and sql_query and not self.key_columns:
+            raise ValueError("key_column is required for keyset or parallel reads from sql_query")
+
+        if watermark_column and not watermark_state_file:
+            raise ValueError("watermark_column requires watermark_state_file")
+
+        if watermark_column and write_mode == "truncate_append":
+            raise ValueError("watermark_column requires write_mode append or merge")
+
+        if watermark_column and resume:
+            raise ValueError("resume cannot be combined with watermark_column; rerun from the stored watermark instead")
+
+        if write_mode == "merge" and sql_query and not (self.merge_keys or self.key_columns):
+            raise ValueError("merge_keys or key_column is required to merge rows from sql_query")
+
         # Full BigQuery table reference
         self.bq_table_ref = f"{self.bq_project}.{self.bq_dataset}.{self.bq_table}"
 
+        # Merges load into a staging table first and apply it to the target with one MERGE
+        self.staging_table_ref = f"{self.bq_project}.{self.bq_dataset}.{staging_table or self.bq_table + '_staging'}"
+        self.load_table_ref = self.staging_table_ref if write_mode == "merge" else self.bq_table_ref
+
+        self.metrics = TransferMetrics(metrics_file, prometheus_file, labels={"table": self.bq_table_ref})
+
         self.user_provided_total_rows = total_rows
+        self.exact_count = exact_count
+        self.estimated_rows: Optional[int] = None
+
+        self._sql_conn = sql_conn
+        self._bq_client = bq_client
+        self._bq_write_client = bq_write_client
+        self._client_lock = threading.Lock()
+        self._owns_sql_conn = sql_conn is None
+        self.sql_pool = sql_pool or ConnectionPool()
+        self._sql_conn_broken = False
+
+        self.retry_policy = RetryPolicy(max_retries, retry_backoff, retry_max_backoff)
+        self.retry_stats = RetryStats()
 
         # Initialize connections
         self._init_connections()
 
     def _init_connections(self):
-        """Initialize SQL Server and BigQuery connections."""
-        # SQL Server connection string
-        if self.sql_username and self.sql_password:
-            self.conn_str = (
-                f'DRIVER={{{self.sql_driver}}};'
-                f'SERVER={self.sql_server};'
-                f'DATABASE={self.sql_database};'
-                f'UID={self.sql_username};'
-                f'PWD={self.sql_password}'
-            )
-        else:
-            self.conn_str = (
-                f'DRIVER={{{self.sql_driver}}};'
-                f'SERVER={self.sql_server};'
-                f'DATABASE={self.sql_database};'
-                f'Trusted_Connection=yes'
-            )
+        """Build the SQL Server connection string; connections are opened on first use."""
+        self.conn_str = build_connection_string(
+            self.sql_server,
+            self.sql_database,
+            self.sql_username,
+            self.sql_password,
+            self.sql_driver
+        )
 
-        # Test SQL connection
-        try:
-            self.sql_conn = pyodbc.connect(self.conn_str)
-            logger.info("SQL Server connection established successfully")
-        except Exception as e:
-            logger.error(f"Failed to connect to SQL Server: {e}")
-            raise
+    @property
+    def sql_conn(self) -> Any:
+        """The SQL Server connection, acquired from the pool on first use."""
+        if self._sql_conn is None:
+            try:
+                self._sql_conn = self.sql_pool.acquire(self.conn_str)
+                logger.info("SQL Server connection established successfully")
+            except Exception as e:
+                logger.error(f"Failed to connect to SQL Server: {e}")
+                raise
+        return self._sql_conn
+
+    @sql_conn.setter
+    def sql_conn(self, conn: Any) -> None:
+        self._sql_conn = conn
 
-        # BigQuery connection
+    def _close_sql_conn(self) -> None:
+        """Close the SQL Server connection if this transfer opened one."""
+        if not self._owns_sql_conn or self._sql_conn is None:
+            return
         try:
-            self.credentials = service_account.Credentials.from_service_account_file(
-                self.key_path
-            )
-            self.bq_client = bigquery.Client.from_service_account_json(
-                self.key_path,
-                project=self.bq_project
-            )
-            logger.info("BigQuery connection established successfully")
-        except Exception as e:
-            logger.error(f"Failed to connect to BigQuery: {e}")
-            raise
+            self._sql_conn.close()
+            logger.info("SQL Server connection closed")
+        except:
+            pass
+        self._sql_conn = None
 
-    def _get_total_rows(self) -> int:
-        """Get the total number of rows to transfer."""
+    @property
+    def bq_client(self) -> bigquery.Client:
+        """The BigQuery client, connected on first use."""
+        with self._client_lock:
+            if self._bq_client is None:
+                from google.cloud import bigquery
+                from google.oauth2 import service_account
+
+                try:
+                    self.credentials = service_account.Credentials.from_service_account_file(
+                        self.key_path
+                    )
+                    self._bq_client = bigquery.Client.from_service_account_json(
+                        self.key_path,
+                        project=self.bq_project
+                    )
+                    logger.info("BigQuery connection established successfully")
+                except Exception as e:
+                    logger.error(f"Failed to connect to BigQuery: {e}")
+                    raise
+            return self._bq_client
+
+    @property
+    def bq_write_client(self) -> Any:
+        """The BigQuery Storage Write API client, connected on first use."""
+        with self._client_lock:
+            if self._bq_write_client is None:
+                from google.cloud.bigquery_storage_v1 import BigQueryWriteClient
+
+                self._bq_write_client = BigQueryWriteClient.from_service_account_file(self.key_path)
+                logger.info("BigQuery Storage Write API connection established successfully")
+            return self._bq_write_client
+
+    def _estimate_total_rows(self) -> Optional[int]:
+        """Return the row count used for progress reporting, or None when it is unknown.
+
+        Chunks are read until the source is exhausted, so this is only a hint: the
+        user-provided total, an exact COUNT(*) when `exact_count` is set, or the
+        catalog row count for unfiltered table sources. Queries and filtered sources
+        have no cheap estimate.
+        """
         if self.user_provided_total_rows is not None:
             logger.info(f"Using user-provided total row count: {self.user_provided_total_rows}")
             return self.user_provided_total_rows
 
+        if self.exact_count:
+            return self._get_total_rows()
+
+        # The projection does not change the row count, but any filter does
+        if self.sql_query or self.where or self.watermark_range is not None:
+            return None
+
+        try:
+            estimate = estimate_table_rows(self.sql_conn, self.sql_table)
+        except Exception as e:
+            logger.warning(f"Could not read the catalog row count for {self.sql_table}: {e}")
+            return None
+        if estimate is not None:
+            logger.info(f"Catalog row count for {self.sql_table}: about {estimate} rows")
+        return estimate
+
+    def _get_total_rows(self) -> int:
+        """Count the rows to transfer with a COUNT(*) over the source."""
         try:
             cursor = self.sql_conn.cursor()
 
-            if self.sql_query:
-                count_query = f"SELECT COUNT(*) FROM ({self.sql_query}) AS subquery"
+            source_query = self._source_query()
+            if source_query:
+                count_query = f"SELECT COUNT(*) FROM ({source_query}) AS subquery"
             else:
                 count_query = f"SELECT COUNT(*) FROM {self.sql_table}"
 
@@ -133,157 +660,1123 @@ class SQLServerToBigQueryTransfer:
         finally:
             cursor.close()
 
-    def _read_chunk(self, offset: int, limit: int) -> pl.DataFrame:
-        """Read a chunk of data from SQL Server."""
-        if self.sql_query:
-            chunk_query = f"""
-            SELECT subquery.* FROM ({self.sql_query}) AS subquery
+    def _offset_query(self, offset: int, limit: int) -> str:
+        """Build the OFFSET/FETCH query reading `limit` rows starting at `offset`."""
+        source_query = self._source_query()
+        if source_query:
+            return f"""
+            SELECT subquery.* FROM ({source_query}) AS subquery
             ORDER BY (SELECT NULL)
             OFFSET {offset} ROWS
             FETCH NEXT {limit} ROWS ONLY
             """
-        else:
-            chunk_query = f"""
+        return f"""
             SELECT * FROM {self.sql_table}
             ORDER BY (SELECT NULL)
             OFFSET {offset} ROWS
             FETCH NEXT {limit} ROWS ONLY
             """
 
+    def _read_chunk(self, offset: int, limit: int) -> pl.DataFrame:
+        """Read a chunk of data from SQL Server."""
+        chunk_query = self._offset_query(offset, limit)
+
+        self._read_timings = {}
+        if self.reader_backend == "arrow-odbc":
+            return _read_arrow_chunk(
+                self.conn_str, chunk_query, limit, timings=self._read_timings, **self.arrow_options
+            )
+        import polars as pl
+
+        self._ensure_sql_conn()
+        fetch_start = time.time()
+        df = pl.read_database(query=chunk_query, connection=self.sql_conn)
+        self._read_timings["fetch"] = time.time() - fetch_start
+        return df
+
+    def _ensure_sql_conn(self) -> None:
+        """Replace the SQL Server connection if a failed read left it in an unknown state."""
+        if not self._sql_conn_broken:
+            return
+        self.sql_pool.release(self.conn_str, self._sql_conn, reusable=False)
+        self._sql_conn = None
+        self._sql_conn = self.sql_pool.acquire(self.conn_str)
+        self._sql_conn_broken = False
+        logger.info("Reconnected to SQL Server")
+
+    def _read_with_retry(self, description: str, read: Callable[[], pl.DataFrame]) -> pl.DataFrame:
+        """Run a chunk read, retrying transient failures on a fresh connection."""
+        def mark_broken(error: BaseException) -> None:
+            self._sql_conn_broken = True
+
         try:
-            df = pl.read_database(query=chunk_query, connection=self.sql_conn)
-            return df
+            return self.retry_policy.call(
+                read, is_retryable_sql_error, description, "read", self.retry_stats, on_retry=mark_broken
+            )
         except Exception as e:
-            logger.error(f"Error reading chunk offset {offset}, limit: {limit}: {e}")
-            try:
-                self.sql_conn = pyodbc.connect(self.conn_str)
-            except:
-                pass
+            logger.error(f"Error {description[0].lower()}{description[1:]}: {e}")
+            self._sql_conn_broken = True
             raise
 
-    def _upload_to_bigquery(self, df: pl.DataFrame, is_first_chunk: bool) -> None:
-        """Upload a Polars DataFrame to BigQuery with improved file handling."""
-        if df.is_empty():
-            logger.info("Skipping empty chunk")
+    def _resolve_key_columns(self) -> List[str]:
+        """Return the keyset columns, looking up the table's unique clustered or primary key if needed."""
+        if self.key_columns:
+            return self.key_columns
+
+        key_query = """
+        SELECT i.index_id, c.name
+        FROM sys.indexes i
+        JOIN sys.index_columns ic ON ic.object_id = i.object_id AND ic.index_id = i.index_id
+        JOIN sys.columns c ON c.object_id = ic.object_id AND c.column_id = ic.column_id
+        WHERE i.object_id = OBJECT_ID(?)
+          AND ic.key_ordinal > 0
+          AND (i.is_primary_key = 1 OR (i.type = 1 AND i.is_unique = 1))
+        ORDER BY CASE WHEN i.type = 1 THEN 0 ELSE 1 END, i.index_id, ic.key_ordinal
+        """
+
+        cursor = self.sql_conn.cursor()
+        try:
+            cursor.execute(key_query, self.sql_table)
+            rows = cursor.fetchall()
+        finally:
+            cursor.close()
+
+        if not rows:
+            raise ValueError(
+                f"No unique clustered index or primary key found on {self.sql_table}; "
+                "pass key_column to use keyset reads"
+            )
+
+        index_id = rows[0][0]
+        self.key_columns = [row[1] for row in rows if row[0] == index_id]
+        logger.info(f"Using key column(s) {', '.join(self.key_columns)} for keyset reads")
+        return self.key_columns
+
+    def _source_query(self) -> Optional[str]:
+        """Return the source as a query, or None when the table can be read directly.
+
+        The query selects only the projected columns, with their casts, and only
+        the rows matching `where`. During an incremental run the rows are further
+        narrowed to those between the stored watermark and the upper bound
+        captured at the start of the run.
+        """
+        if self.projection is None and not self.where and self.watermark_range is None:
+            return self.sql_query
+
+        source, alias = self._base_source()
+        conditions = []
+        if self.where:
+            conditions.append(f"({self.where})")
+
+        if self.watermark_range is not None:
+            column = f"{alias}{_quote_identifier(self.watermark_column)}"
+            lower, upper = self.watermark_range
+            if lower is not None:
+                conditions.append(f"{column} > {sql_literal(lower, self.watermark_type)}")
+            if upper is not None:
+                conditions.append(f"{column} <= {sql_literal(upper, self.watermark_type)}")
+            else:
+                # The source was empty when the upper bound was captured
+                conditions.append("1 = 0")
+
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        return f"SELECT {self._select_list(alias)} FROM {source}{where}"
+
+    def _base_source(self) -> Tuple[str, str]:
+        """Return the unfiltered table or query to select from and the column prefix used to reference it."""
+        if self.sql_query:
+            return f"({self.sql_query}) AS src", "src."
+        return self.sql_table, ""
+
+    def _select_list(self, alias: str) -> str:
+        """Return the projected columns, with any casts, or every column when nothing is projected."""
+        if self.projection is None:
+            return f"{alias}*"
+        items = []
+        for name in self.projection:
+            column = f"{alias}{_quote_identifier(name)}"
+            cast = self.column_casts.get(name)
+            items.append(f"CAST({column} AS {cast.strip()}) AS {_quote_identifier(name)}" if cast else column)
+        return ", ".join(items)
+
+    def _projection_query(self) -> Optional[str]:
+        """Return the projected columns of the unfiltered source as a query, or None without a projection."""
+        if self.projection is None:
+            return None
+        source, alias = self._base_source()
+        return f"SELECT {self._select_list(alias)} FROM {source}"
+
+    def _resolve_projection(self) -> None:
+        """Resolve `columns`, `exclude_columns` and `column_casts` to the columns selected from SQL Server.
+
+        Excluding columns, or casting without a column list, needs the source's
+        column names, which are read from the same metadata as the explicit schema.
+        """
+        if self.columns is None and not self.exclude_columns and not self.column_casts:
             return
 
-        temp_dir = tempfile.gettempdir()
-        unique_id = str(uuid.uuid4())
-        temp_file = os.path.join(temp_dir, f"bq_upload_{unique_id}.parquet")
+        if self.columns is not None:
+            names = list(self.columns)
+        else:
+            source_schema = SourceSchema.from_sql_server(self.sql_conn, self.sql_table, self.sql_query)
+            names = [column["name"] for column in source_schema.columns]
+            known = {name.lower() for name in names}
+            unknown = [c for c in self.exclude_columns if c.lower() not in known]
+            if unknown:
+                raise ValueError(f"exclude_columns not found in the source: {', '.join(unknown)}")
+            excluded = {c.lower() for c in self.exclude_columns}
+            names = [name for name in names if name.lower() not in excluded]
+            if not names:
+                raise ValueError("exclude_columns leaves no columns to transfer")
+
+        # SQL Server identifiers are matched case-insensitively under the default collations
+        by_lower = {name.lower(): name for name in names}
+        unknown = [c for c in self.column_casts if c.lower() not in by_lower]
+        if unknown:
+            raise ValueError(f"column_casts refer to columns not found in the source: {', '.join(unknown)}")
+        self.column_casts = {by_lower[c.lower()]: cast for c, cast in self.column_casts.items()}
+
+        self.projection = names
+        logger.info(f"Selecting {len(names)} column(s) from SQL Server: {', '.join(names)}")
+
+    def _require_projected(self, columns: List[str], purpose: str) -> None:
+        """Fail early when columns the transfer depends on are left out of the projection."""
+        projected = {name.lower() for name in self.projection}
+        missing = [c for c in columns if c.lower() not in projected]
+        if missing:
+            raise ValueError(f"{purpose} {', '.join(missing)} must be included in the selected columns")
+
+    def _source_from(self) -> Tuple[str, str]:
+        """Return the FROM clause source and the column prefix used to reference it."""
+        source_query = self._source_query()
+        if source_query:
+            return f"({source_query}) AS subquery", "subquery."
+        return self.sql_table, ""
+
+    def _build_keyset_query(
+        self,
+        key_columns: List[str],
+        has_last_key: bool,
+        limit: int,
+        range_filter: str = ""
+    ) -> str:
+        """Build a seek query returning the next `limit` rows after the last seen key."""
+        source, alias = self._source_from()
+        quoted = [f"{alias}{_quote_identifier(col)}" for col in key_columns]
+
+        conditions = []
+        if range_filter:
+            conditions.append(f"({range_filter})")
+        if has_last_key:
+            # Expand (k1, k2, ...) > (?, ?, ...) since T-SQL has no row-value comparison
+            terms = []
+            for i, col in enumerate(quoted):
+                equals = [f"{prev} = ?" for prev in quoted[:i]]
+                terms.append("(" + " AND ".join(equals + [f"{col} > ?"]) + ")")
+            seek = " OR ".join(terms)
+            conditions.append(f"({seek})" if range_filter else seek)
+
+        where = "WHERE " + " AND ".join(conditions) if conditions else ""
+
+        return f"""
+            SELECT TOP ({limit}) {alias}* FROM {source}
+            {where}
+            ORDER BY {', '.join(quoted)}
+            """
+
+    def _read_keyset_chunk(self, last_key: Optional[Tuple[Any, ...]], limit: int) -> pl.DataFrame:
+        """Read the next chunk of data after `last_key` using keyset (seek) pagination."""
+        key_columns = self._resolve_key_columns()
+        chunk_query = self._build_keyset_query(key_columns, last_key is not None, limit)
+
+        parameters = _keyset_parameters(last_key) if last_key is not None else None
+        execute_options = {"parameters": parameters} if parameters else None
 
+        self._read_timings = {}
+        if self.reader_backend == "arrow-odbc":
+            return _read_arrow_chunk(
+                self.conn_str, chunk_query, limit, parameters, timings=self._read_timings, **self.arrow_options
+            )
+        import polars as pl
+
+        self._ensure_sql_conn()
+        fetch_start = time.time()
+        df = pl.read_database(
+            query=chunk_query,
+            connection=self.sql_conn,
+            execute_options=execute_options
+        )
+        self._read_timings["fetch"] = time.time() - fetch_start
+        return df
+
+    def _plan_partitions(self, key_column: str) -> List[Tuple[Any, Any]]:
+        """Split the source into key ranges of (exclusive lower, inclusive upper) bounds.
+
+        Numeric and date keys are split evenly between MIN and MAX; any other key type
+        falls back to NTILE boundaries. The first range has no lower bound and the last
+        has no upper bound.
+        """
+        source, alias = self._source_from()
+        key = f"{alias}{_quote_identifier(key_column)}"
+        n = self.parallelism
+
+        cursor = self.sql_conn.cursor()
         try:
-            if self.write_mode == "truncate_append":
-                write_disposition = (
-                    bigquery.WriteDisposition.WRITE_TRUNCATE if is_first_chunk 
-                    else bigquery.WriteDisposition.WRITE_APPEND
-                )
+            cursor.execute(f"SELECT MIN({key}), MAX({key}) FROM {source}")
+            low, high = cursor.fetchone()
+            if low is None:
+                return [(None, None)]
+
+            if isinstance(low, (int, float, Decimal, datetime.date)) and not isinstance(low, bool):
+                span = high - low
+                if isinstance(low, int):
+                    boundaries = [low + span * i // n for i in range(1, n)]
+                else:
+                    boundaries = [low + span * i / n for i in range(1, n)]
             else:
-                write_disposition = bigquery.WriteDisposition.WRITE_APPEND
+                cursor.execute(f"""
+                    SELECT MAX(k) FROM (
+                        SELECT {key} AS k, NTILE({n}) OVER (ORDER BY {key}) AS bucket FROM {source}
+                    ) AS tiles
+                    GROUP BY bucket
+                    ORDER BY bucket
+                    """)
+                boundaries = [row[0] for row in cursor.fetchall()][:-1]
+        finally:
+            cursor.close()
 
-            job_config = bigquery.LoadJobConfig(
-                source_format=bigquery.SourceFormat.PARQUET,
-                write_disposition=write_disposition,
-                autodetect=True,
+        boundaries = sorted(set(boundaries))
+        lowers = [None] + boundaries
+        uppers = boundaries + [None]
+        return list(zip(lowers, uppers))
+
+    @staticmethod
+    def _partition_filter(leading_key: str, lower: Any, upper: Any) -> Tuple[str, List[Any]]:
+        """Return the filter and parameters restricting a keyset query to one key range."""
+        bounds = []
+        range_params = []
+        if lower is not None:
+            bounds.append(f"{leading_key} > ?")
+            range_params.append(lower)
+        if upper is not None:
+            bounds.append(f"{leading_key} <= ?")
+            range_params.append(upper)
+        return " AND ".join(bounds), range_params
+
+    def _parallel_chunks(self) -> Iterator[pl.DataFrame]:
+        """Extract key ranges in worker processes and yield their chunks as they arrive."""
+        key_columns = self._resolve_key_columns()
+        partitions = self._plan_partitions(key_columns[0])
+        _, alias = self._source_from()
+        leading_key = f"{alias}{_quote_identifier(key_columns[0])}"
+
+        logger.info(f"Extracting {len(partitions)} key range(s) on {key_columns[0]} in parallel")
+
+        context = multiprocessing.get_context("spawn")
+        out_queue = context.Queue(maxsize=max(self.queue_depth, len(partitions)))
+        processes = {}
+        self.partition_stats = []
+
+        for partition_id, (lower, upper) in enumerate(partitions):
+            range_filter, range_params = self._partition_filter(leading_key, lower, upper)
+
+            self.partition_stats.append({
+                "partition": partition_id,
+                "lower": lower,
+                "upper": upper,
+                "rows": 0,
+                "chunks": 0,
+                "time_taken": None,
+            })
+
+            process = context.Process(
+                target=_extract_partition,
+                args=(
+                    self.conn_str,
+                    partition_id,
+                    self._build_keyset_query(key_columns, False, self.chunk_size, range_filter),
+                    self._build_keyset_query(key_columns, True, self.chunk_size, range_filter),
+                    range_params,
+                    key_columns,
+                    self.chunk_size,
+                    out_queue,
+                    self.reader_backend,
+                    self.arrow_options,
+                    self.retry_policy,
+                ),
+                name=f"sql-partition-{partition_id}",
+                daemon=True,
             )
+            process.start()
+            processes[partition_id] = process
 
-            df.write_parquet(temp_file)
+        pending = set(processes)
+        try:
+            while pending:
+                try:
+                    partition_id, payload = out_queue.get(timeout=1)
+                except queue.Empty:
+                    for partition_id in pending:
+                        if not processes[partition_id].is_alive():
+                            raise RuntimeError(
+                                f"Partition {partition_id} worker exited with code {processes[partition_id].exitcode}"
+                            )
+                    continue
 
-            with open(temp_file, "rb") as source_file:
-                job = self.bq_client.load_table_from_file(
-                    source_file,
-                    self.bq_table_ref,
-                    job_config=job_config
-                )
+                partition = self.partition_stats[partition_id]
+                if isinstance(payload, dict):
+                    partition["time_taken"] = payload["time_taken"]
+                    partition_retries = payload["retries"].get("read", 0)
+                    if partition_retries:
+                        partition["retries"] = partition_retries
+                        self.retry_stats.record("read", payload["retry_seconds"], partition_retries)
+                    pending.discard(partition_id)
+                    logger.info(f"Partition {partition_id} finished: {partition['rows']} rows "
+                                f"in {payload['time_taken']:.2f} seconds")
+                elif isinstance(payload, str):
+                    raise RuntimeError(f"Partition {partition_id} failed: {payload}")
+                else:
+                    partition["rows"] += payload.shape[0]
+                    partition["chunks"] += 1
+                    yield payload
+        finally:
+            for process in processes.values():
+                if process.is_alive():
+                    process.terminate()
+                process.join()
+
+    def _stream_chunks(self) -> Iterator[pl.DataFrame]:
+        """Run the source query once and yield record batches from a single cursor.
+
+        Running the query and fetching the first batch are retried on a fresh
+        connection like any other read. Once a batch has been yielded the stream
+        cannot be resumed, so a later failure ends the transfer.
+        """
+        query = self._source_query() or f"SELECT * FROM {self.sql_table}"
+
+        def open_stream() -> Tuple[Optional[pl.DataFrame], Iterator[pl.DataFrame]]:
+            if self.reader_backend == "arrow-odbc":
+                batches = _read_arrow_batches(self.conn_str, query, self.chunk_size, **self.arrow_options)
+            else:
+                import polars as pl
 
-            job.result()
+                self._ensure_sql_conn()
+                batches = pl.read_database(
+                    query=query,
+                    connection=self.sql_conn,
+                    iter_batches=True,
+                    batch_size=self.chunk_size
+                )
+            batches = iter(batches)
+            return next(batches, None), batches
 
-            logger.info(f"Uploaded {df.shape[0]} rows to BigQuery")
+        first_chunk, batches = self._read_with_retry("Streaming the source query", open_stream)
+        try:
+            if first_chunk is None:
+                return
+            yield first_chunk
 
+            for df_chunk in batches:
+                yield df_chunk
         except Exception as e:
-            logger.error(f"Error uploading to BigQuery: {e}")
+            logger.error(f"Error streaming from SQL Server: {e}")
+            self._sql_conn_broken = True
             raise
-
         finally:
+            # Release the cursor, or the arrow-odbc connection, as soon as the consumer stops
+            close = getattr(batches, "close", None)
+            if close is not None:
+                close()
+
+    def _iter_chunks(self, start_position: Any = None) -> Iterator[Tuple[pl.DataFrame, Any]]:
+        """Yield (chunk, position) pairs from SQL Server using the configured read mode.
+
+        The position is where reading would resume after the chunk: the next offset
+        for offset reads, the chunk's last key for keyset reads and the running row
+        count for streamed or parallel reads.
+        """
+        if self.parallelism > 1:
+            rows = 0
+            partitions = self._parallel_chunks()
             try:
-                if os.path.exists(temp_file):
-                    df = None
-                    gc.collect()
-
-                    for i in range(5):
-                        try:
-                            os.remove(temp_file)
-                            break
-                        except PermissionError:
-                            if i < 4:
-                                time.sleep(0.5)
-                            else:
-                                logger.warning(f"Could not remove temporary file: {temp_file}")
-            except Exception as cleanup_error:
-                logger.warning(f"Error during cleanup of temporary file: {cleanup_error}")
+                for df_chunk in partitions:
+                    # Reads are timed inside the worker processes, so only rows and bytes are recorded
+                    self._record_read(df_chunk, {})
+                    rows += df_chunk.shape[0]
+                    yield df_chunk, rows
+            finally:
+                # Stops the partition processes when the consumer gives up early
+                partitions.close()
+            return
 
-    def transfer_data(self) -> Dict[str, Any]:
-        """Transfer data from SQL Server to BigQuery in chunks."""
-        start_time = time.time()
-        bytes_transferred = 0
-        rows_transferred = 0
+        if self.read_mode == "stream":
+            logger.info(f"Streaming source query in batches of {self.chunk_size} rows")
+            rows = 0
+            batches = self._stream_chunks()
+            try:
+                while True:
+                    fetch_start = time.time()
+                    df_chunk = next(batches, None)
+                    if df_chunk is None:
+                        break
+                    self._record_read(df_chunk, {"fetch": time.time() - fetch_start})
+                    rows += df_chunk.shape[0]
+                    yield df_chunk, rows
+            finally:
+                batches.close()
+            return
+
+        if self.read_mode == "keyset":
+            key_columns = self._resolve_key_columns()
+            last_key = tuple(start_position) if start_position is not None else None
+            while True:
+                chunk_size = self._next_chunk_size()
+                logger.info(f"Processing keyset chunk after key {last_key} with limit {chunk_size}")
+                df_chunk = self._read_with_retry(
+                    f"Reading keyset chunk after key {last_key}",
+                    lambda: self._read_keyset_chunk(last_key, chunk_size)
+                )
+                self._record_read(df_chunk, self._read_timings)
+                if not df_chunk.is_empty():
+                    last_key = df_chunk.select(key_columns).row(-1)
+                yield df_chunk, last_key
 
+                if df_chunk.shape[0] < chunk_size:
+                    break
+            return
+
+        # Read until a short chunk shows the source is exhausted, without relying on a row count
+        offset = start_position or 0
+        while True:
+            chunk_size = self._next_chunk_size()
+            logger.info(f"Processing chunk at offset {offset} with limit {chunk_size}")
+            df_chunk = self._read_with_retry(
+                f"Reading chunk at offset {offset}",
+                lambda: self._read_chunk(offset, chunk_size)
+            )
+            self._record_read(df_chunk, self._read_timings)
+            offset += df_chunk.shape[0]
+            yield df_chunk, offset
+
+            if df_chunk.shape[0] < chunk_size:
+                break
+
+    def _next_chunk_size(self) -> int:
+        """Return the row count for the next chunk, adapted to the memory budget if one is set."""
+        if self.chunk_sizer is None:
+            return self.chunk_size
+        return self.chunk_sizer.next_rows()
+
+    def _record_read(self, df_chunk: pl.DataFrame, timings: Dict[str, float]) -> None:
+        """Record a chunk read with its stage timings, and feed it to the chunk sizer."""
+        rows = df_chunk.shape[0]
+        chunk_bytes = self._chunk_bytes(df_chunk)
+        self.metrics.record("read", timings, rows=rows, bytes=chunk_bytes)
+        if self.chunk_sizer is not None:
+            self.chunk_sizer.record_read(rows, chunk_bytes, sum(timings.values()))
+
+    def _record_upload(self, rows: int, seconds: float) -> None:
+        if self.chunk_sizer is not None:
+            self.chunk_sizer.record_upload(rows, seconds)
+
+    def _resolve_schema(self) -> SourceSchema:
+        """Read the source column types and derive the BigQuery schema and casts from them."""
+        if self.bq_schema is not None:
+            return self.source_schema
+
+        self._read_source_schema()
+        self.bq_schema = self.source_schema.bigquery_fields()
+        self.cast_plan = self.source_schema.cast_plan()
+        logger.info(f"Using explicit schema with {len(self.bq_schema)} columns")
+        return self.source_schema
+
+    def _read_source_schema(self, save_cache: bool = True) -> SourceSchema:
+        """Read the source column types once, reusing the on-disk cache for this source if present.
+
+        A schema read from SQL Server is written to the cache unless `save_cache` is False.
+        """
+        if self.source_schema is not None:
+            return self.source_schema
+
+        # With a projection the schema comes from the projected query, so casts set the column types
+        projection_query = self._projection_query()
+
+        cache_path = None
+        if self.schema_cache_dir:
+            source_parts = [self.sql_server, self.sql_database, self.sql_table, self.sql_query]
+            if projection_query:
+                source_parts.append(projection_query)
+            cache_path = SourceSchema.cache_path(self.schema_cache_dir, *source_parts)
+
+        if cache_path and os.path.exists(cache_path):
+            logger.info(f"Using cached schema from {cache_path}")
+            self.source_schema = SourceSchema.load(cache_path)
+        else:
+            if projection_query:
+                self.source_schema = SourceSchema.from_sql_server(self.sql_conn, sql_query=projection_query)
+            else:
+                self.source_schema = SourceSchema.from_sql_server(self.sql_conn, self.sql_table, self.sql_query)
+            if cache_path and save_cache:
+                self.source_schema.save(cache_path)
+                logger.info(f"Cached schema to {cache_path}")
+        return self.source_schema
+
+    def _open_sink(self) -> Sink:
+        """Create the sink chunks are written to, connecting to BigQuery only if it needs to."""
+        if self.sink is not None:
+            return self.sink
+
+        if self.sink_type == "parquet":
+            self.sink = ParquetDatasetSink(
+                self.sink_path,
+                self.write_mode,
+                self.parquet_encoding,
+                self.metrics,
+                partition_by=self.sink_partition_by
+            )
+            logger.info(f"Writing chunks to a Parquet dataset at {self.sink_path}")
+        elif self.sink_type == "storage-write":
+            self.sink = StorageWriteSink(
+                self.bq_write_client,
+                self.bq_client,
+                self.load_table_ref,
+                self.write_mode,
+                self.retry_policy,
+                self.retry_stats,
+                self.metrics,
+                schema=self.bq_schema,
+                stream_type=self.storage_write_stream
+            )
+            logger.info(f"Appending chunks to {self.load_table_ref} with {self.storage_write_stream} write streams")
+        else:
+            self.sink = LoadJobSink(
+                self.bq_client,
+                self.load_table_ref,
+                self.write_mode,
+                self.parquet_encoding,
+                self.retry_policy,
+                self.retry_stats,
+                self.metrics,
+                schema=self.bq_schema,
+                upload_memory_limit_mb=self.upload_memory_limit_mb,
+                max_inflight_jobs=self.max_inflight_jobs,
+                staging_dir=self.staging_dir,
+                load_batch_mb=self.load_batch_mb
+            )
+        return self.sink
+
+    def _upload_to_bigquery(
+        self,
+        df: pl.DataFrame,
+        is_first_chunk: bool,
+        on_commit: Optional[Callable[[Any], None]] = None
+    ) -> None:
+        """Cast and narrow a chunk as configured and write it to the sink.
+
+        `on_commit` is called once the sink has made the chunk's rows durable.
+        """
+        if df.is_empty():
+            logger.info("Skipping empty chunk")
+            return
+
+        seconds = {}
+        counters = {"bytes_in_memory": self._chunk_bytes(df)}
+        if self.cast_plan is not None or self.parquet_encoding.narrow:
+            convert_start = time.time()
+            if self.cast_plan is not None:
+                df = df.cast(self.cast_plan)
+            if self.parquet_encoding.narrow:
+                df = self.parquet_encoding.prepare(df)
+                counters["bytes_narrowed"] = self._chunk_bytes(df)
+            seconds["convert"] = time.time() - convert_start
+
+        self._open_sink().write(df, is_first_chunk, on_commit, seconds, counters)
+
+    def _chunk_bytes(self, df_chunk: pl.DataFrame) -> int:
+        """Estimate the in-memory size of a chunk."""
         try:
-            # Get total rows
-            total_rows = self._get_total_rows()
-            logger.info(f"Starting transfer of {total_rows} rows with chunk size {self.chunk_size}")
+            return df_chunk.estimated_size()
+        except:
+            # Fallback if estimated_size() is not available
+            return df_chunk.shape[0] * 1000  # Rough estimate: 1KB per row
 
-            # Process in chunks
-            first_chunk = True
+    def _log_progress(self, rows_done: int, start_time: float) -> None:
+        """Log rows transferred so far, with percentage and ETA when a row estimate is known."""
+        elapsed = time.time() - start_time
+        if not self.estimated_rows:
+            logger.info(f"Progress: {rows_done} rows in {elapsed:.2f} seconds")
+            return
 
-            for offset in range(0, total_rows, self.chunk_size):
-                chunk_start_time = time.time()
-                limit = min(self.chunk_size, total_rows - offset)
+        percent = min(rows_done / self.estimated_rows, 1.0) * 100
+        rate = rows_done / elapsed if elapsed > 0 else 0
+        remaining = max(self.estimated_rows - rows_done, 0)
+        eta = f"{remaining / rate:.0f} seconds" if rate > 0 else "unknown"
+        logger.info(f"Progress: {rows_done} of about {self.estimated_rows} rows ({percent:.1f}%), ETA {eta}")
+
+    def _filter_identity(self) -> Dict[str, Any]:
+        """Return the column and row filters that make a checkpoint or watermark specific to this selection.
+
+        Unset options are left out so that state files written without them still match.
+        """
+        identity = {
+            "columns": self.columns,
+            "exclude_columns": self.exclude_columns,
+            "where": self.where,
+            "column_casts": self.column_casts,
+        }
+        return {key: value for key, value in identity.items() if value}
+
+    def _open_checkpoint(self) -> Checkpoint:
+        """Load the checkpoint to resume from, or start a new one for this transfer."""
+        source = {
+            "sql_server": self.sql_server,
+            "sql_database": self.sql_database,
+            "sql_table": self.sql_table,
+            "sql_query": self.sql_query,
+            "bq_table": self.bq_table_ref,
+            "read_mode": self.read_mode,
+            **self._filter_identity(),
+        }
+        if self.read_mode == "keyset":
+            source["key_columns"] = self._resolve_key_columns()
+
+        if self.resume and os.path.exists(self.checkpoint_file):
+            checkpoint = Checkpoint.load(self.checkpoint_file)
+            if checkpoint.source != source:
+                raise ValueError(f"Checkpoint {self.checkpoint_file} was written for a different transfer")
+            if not checkpoint.completed:
+                logger.info(f"Resuming from checkpoint after {checkpoint.rows_loaded} rows "
+                            f"({checkpoint.chunks_loaded} chunks)")
+                if self.read_mode == "offset":
+                    logger.warning("Offset reads have no guaranteed order; use keyset reads for reliable resumes")
+                return checkpoint
+            logger.info("Checkpoint shows the previous transfer completed, starting a new transfer")
+
+        checkpoint = Checkpoint(self.checkpoint_file, source)
+        checkpoint.save()
+        return checkpoint
 
-                logger.info(f"Processing chunk at offset {offset} with limit {limit}")
+    def _commit_callback(self, seq: int, position: Any, rows: int) -> Optional[Callable[[Any], None]]:
+        """Return the callback that checkpoints chunk `seq` once its load job commits."""
+        if self.checkpoint is None:
+            return None
+        checkpoint = self.checkpoint
+        return lambda job: checkpoint.mark_committed(seq, position, rows, getattr(job, "job_id", None))
 
-                # Read chunk
-                df_chunk = self._read_chunk(offset, limit)
+    def _open_watermark(self) -> None:
+        """Load the stored watermark and capture the current maximum as this run's upper bound.
 
+        Rows changed after the upper bound is read are left for the next run instead
+        of being half-seen by a long extraction.
+        """
+        source = {
+            "sql_server": self.sql_server,
+            "sql_database": self.sql_database,
+            "sql_table": self.sql_table,
+            "sql_query": self.sql_query,
+            "bq_table": self.bq_table_ref,
+            "watermark_column": self.watermark_column,
+            **self._filter_identity(),
+        }
+        self.watermark_state = WatermarkState.load(self.watermark_state_file, source)
+
+        # The watermark column need not be projected, so read it from the unprojected source
+        source_from, alias = self._base_source()
+        where = f" WHERE ({self.where})" if self.where else ""
+        cursor = self.sql_conn.cursor()
+        try:
+            cursor.execute(f"SELECT MAX({alias}{_quote_identifier(self.watermark_column)}) FROM {source_from}{where}")
+            upper = cursor.fetchone()[0]
+        finally:
+            cursor.close()
+
+        lower = self.watermark_state.watermark
+        if upper is None:
+            upper = lower
+        if isinstance(upper, datetime.datetime) or isinstance(lower, datetime.datetime):
+            self.watermark_type = self._watermark_column_type()
+        self.watermark_range = (lower, upper)
+        logger.info(f"Extracting rows with {self.watermark_column} after {lower!r} up to {upper!r}")
+
+    def _watermark_column_type(self) -> Optional[str]:
+        """Look up the watermark column's date/time type so its bounds compare at the same precision."""
+        source_schema = SourceSchema.from_sql_server(self.sql_conn, self.sql_table, self.sql_query)
+        for column in source_schema.columns:
+            if column["name"].lower() == self.watermark_column.lower():
+                return sql_datetime_type(column)
+        logger.warning(f"Could not find the type of {self.watermark_column}, comparing its bounds as DATETIME2(7)")
+        return None
+
+    def _merge_staging(self, staged_rows: int) -> int:
+        """Apply the staging table to the target with a single MERGE, then drop the staging table.
+
+        The target is created from the staged rows when it does not exist yet.
+        Returns the number of target rows inserted or updated.
+        """
+        from google.api_core.exceptions import NotFound
+
+        keys = self.merge_keys or self._resolve_key_columns()
+        columns = [field.name for field in self.bq_client.get_table(self.staging_table_ref).schema]
+
+        try:
+            self.bq_client.get_table(self.bq_table_ref)
+            statement = build_merge_statement(self.bq_table_ref, self.staging_table_ref, columns, keys)
+            logger.info(f"Merging {staged_rows} staged rows into {self.bq_table_ref} on {', '.join(keys)}")
+        except NotFound:
+            statement = f"CREATE TABLE `{self.bq_table_ref}` AS SELECT * FROM `{self.staging_table_ref}`"
+            logger.info(f"{self.bq_table_ref} does not exist, creating it from {staged_rows} staged rows")
+
+        job = self.bq_client.query(statement)
+        job.result()
+        self.bq_client.delete_table(self.staging_table_ref, not_found_ok=True)
+
+        return job.num_dml_affected_rows if job.num_dml_affected_rows is not None else staged_rows
+
+    def _transfer_serial(
+        self,
+        chunks: Iterator[Tuple[pl.DataFrame, Any]],
+        stats: Dict[str, Any],
+        truncate_first: bool = True,
+        seq_base: int = 0
+    ) -> None:
+        """Read and upload chunks one after another on the calling thread."""
+        first_chunk = truncate_first
+        seq = seq_base
+        start_time = chunk_start_time = time.time()
+
+        try:
+            for df_chunk, position in chunks:
                 # Upload to BigQuery if not empty
                 if not df_chunk.is_empty():
                     chunk_rows = df_chunk.shape[0]
-                    try:
-                        chunk_bytes = df_chunk.estimated_size()
-                    except:
-                        # Fallback if estimated_size() is not available
-                        chunk_bytes = chunk_rows * 1000  # Rough estimate: 1KB per row
-
-                    bytes_transferred += chunk_bytes
+                    chunk_bytes = self._chunk_bytes(df_chunk)
+                    stats["bytes_transferred"] += chunk_bytes
 
                     logger.info(f"Read {chunk_rows} rows ({chunk_bytes / 1024 / 1024:.2f} MB)")
 
-                    self._upload_to_bigquery(df_chunk, first_chunk)
+                    commit = self._commit_callback(seq, position, chunk_rows)
+                    upload_start = time.time()
+                    self._upload_to_bigquery(df_chunk, first_chunk, on_commit=commit)
+                    self._record_upload(chunk_rows, time.time() - upload_start)
 
-                    rows_transferred += chunk_rows
+                    stats["rows_transferred"] += chunk_rows
                     first_chunk = False
-
-                    if chunk_rows < limit:
-                        logger.warning(f"Received {chunk_rows} rows when expecting {limit}, reached end of data")
-                        break
+                    seq += 1
+                    self._log_progress(stats["rows_transferred"], start_time)
                 else:
                     logger.info("Chunk is empty, skipping upload")
 
                 chunk_time = time.time() - chunk_start_time
                 logger.info(f"Chunk processed in {chunk_time:.2f} seconds")
+                chunk_start_time = time.time()
+        finally:
+            # A failed upload leaves the reader suspended; close it to release its connections now
+            chunks.close()
+
+    def _transfer_pipelined(
+        self,
+        chunks: Iterator[Tuple[pl.DataFrame, Any]],
+        stats: Dict[str, Any],
+        truncate_first: bool = True,
+        seq_base: int = 0
+    ) -> None:
+        """Read chunks on a background thread while upload workers drain a bounded queue.
+
+        The first chunk is loaded before any other worker starts uploading so that a
+        WRITE_TRUNCATE always lands before the appends.
+        """
+        chunk_queue: "queue.Queue[Optional[Tuple[int, pl.DataFrame, Any]]]" = queue.Queue(maxsize=self.queue_depth)
+        stop = threading.Event()
+        first_loaded = threading.Event()
+        lock = threading.Lock()
+        errors: List[BaseException] = []
+        start_time = time.time()
+
+        def fail(error: BaseException) -> None:
+            with lock:
+                errors.append(error)
+            stop.set()
+
+        def put(item: Optional[Tuple[int, pl.DataFrame, Any]]) -> bool:
+            # Block while the queue is full, but give up once a worker has failed
+            while not stop.is_set():
+                try:
+                    chunk_queue.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def reader() -> None:
+            seq = 0
+            try:
+                for df_chunk, position in chunks:
+                    if stop.is_set():
+                        break
+                    if df_chunk.is_empty():
+                        logger.info("Chunk is empty, skipping upload")
+                        continue
+
+                    chunk_bytes = self._chunk_bytes(df_chunk)
+                    with lock:
+                        stats["bytes_transferred"] += chunk_bytes
+                    logger.info(f"Read {df_chunk.shape[0]} rows ({chunk_bytes / 1024 / 1024:.2f} MB)")
+
+                    if not put((seq, df_chunk, position)):
+                        break
+                    seq += 1
+            except Exception as e:
+                fail(e)
+            finally:
+                # Close the reader on the thread that runs it, so partition processes and
+                # cursors are released as soon as an uploader fails
+                try:
+                    chunks.close()
+                except Exception as e:
+                    logger.warning(f"Error closing the chunk reader: {e}")
+                for _ in range(self.upload_workers):
+                    put(None)
+
+        def uploader() -> None:
+            while True:
+                try:
+                    item = chunk_queue.get(timeout=0.1)
+                except queue.Empty:
+                    if stop.is_set():
+                        return
+                    continue
+
+                if item is None:
+                    return
+
+                seq, df_chunk, position = item
+                if seq > 0:
+                    while not first_loaded.wait(0.1):
+                        if stop.is_set():
+                            return
+
+                chunk_start_time = time.time()
+                try:
+                    commit = self._commit_callback(seq_base + seq, position, df_chunk.shape[0])
+                    self._upload_to_bigquery(df_chunk, seq == 0 and truncate_first, on_commit=commit)
+                except Exception as e:
+                    fail(e)
+                    return
+                self._record_upload(df_chunk.shape[0], time.time() - chunk_start_time)
+
+                with lock:
+                    stats["rows_transferred"] += df_chunk.shape[0]
+                    self._log_progress(stats["rows_transferred"], start_time)
+                if seq == 0:
+                    first_loaded.set()
+                logger.info(f"Chunk {seq} uploaded in {time.time() - chunk_start_time:.2f} seconds")
+
+        logger.info(f"Pipelining reads and uploads with queue depth {self.queue_depth} "
+                    f"and {self.upload_workers} upload worker(s)")
+
+        threads = [threading.Thread(target=reader, name="sql-reader", daemon=True)]
+        threads += [
+            threading.Thread(target=uploader, name=f"bq-uploader-{i}", daemon=True)
+            for i in range(self.upload_workers)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        if errors:
+            raise errors[0]
+
+    def _prepare_source(self) -> None:
+        """Resolve the projection, check it keeps the key columns, and capture the watermark range."""
+        self._resolve_projection()
+        if self.projection is not None:
+            if self.read_mode == "keyset" or self.parallelism > 1:
+                self._require_projected(self._resolve_key_columns(), "Key column(s)")
+            if self.write_mode == "merge":
+                self._require_projected(self.merge_keys or self._resolve_key_columns(), "Merge key(s)")
+
+        if self.watermark_column:
+            self._open_watermark()
+
+    def plan(self) -> Dict[str, Any]:
+        """Describe the transfer without transferring any rows or touching the sink.
+
+        SQL Server is asked for column types, key columns and the row estimate,
+        which is a COUNT(*) with `exact_count`. Incremental plans run the watermark
+        MAX over the source, and parallel plans look up the key range boundaries,
+        which for keys that cannot be split arithmetically is an NTILE over the
+        whole key column. The result lists the generated chunk queries, the
+        estimated rows and chunk count, and the target schema. Nothing is written:
+        not the schema cache, checkpoints or watermark state.
+        """
+        try:
+            self._prepare_source()
+            estimated_rows = self._estimate_total_rows()
+            chunks = -(-estimated_rows // self.chunk_size) if estimated_rows is not None else None
+
+            queries: List[Dict[str, Any]] = []
+            if self.parallelism > 1:
+                read_mode = "parallel"
+                key_columns = self._resolve_key_columns()
+                _, alias = self._source_from()
+                leading_key = f"{alias}{_quote_identifier(key_columns[0])}"
+                for partition_id, (lower, upper) in enumerate(self._plan_partitions(key_columns[0])):
+                    range_filter, range_params = self._partition_filter(leading_key, lower, upper)
+                    queries.append({
+                        "partition": partition_id,
+                        "lower": lower,
+                        "upper": upper,
+                        "first": self._build_keyset_query(key_columns, False, self.chunk_size, range_filter),
+                        "next": self._build_keyset_query(key_columns, True, self.chunk_size, range_filter),
+                        "parameters": range_params,
+                    })
+            elif self.read_mode == "stream":
+                read_mode = "stream"
+                queries.append({"query": self._source_query() or f"SELECT * FROM {self.sql_table}"})
+            elif self.read_mode == "keyset":
+                read_mode = "keyset"
+                key_columns = self._resolve_key_columns()
+                queries.append({"first": self._build_keyset_query(key_columns, False, self.chunk_size)})
+                queries.append({"next": self._build_keyset_query(key_columns, True, self.chunk_size)})
+            else:
+                read_mode = "offset"
+                # Without an estimate the number of chunks is only known once the source runs out
+                listed = min(chunks, PLAN_MAX_QUERIES) if chunks is not None else 1
+                for i in range(listed):
+                    offset = i * self.chunk_size
+                    queries.append({"offset": offset, "query": self._offset_query(offset, self.chunk_size)})
+
+            source_schema = self._read_source_schema(save_cache=False)
+            return {
+                "source": self.sql_table or self.sql_query,
+                "target": self.sink_path if self.sink_type == "parquet" else self.bq_table_ref,
+                "sink": self.sink_type,
+                "write_mode": self.write_mode,
+                "read_mode": read_mode,
+                "parallelism": self.parallelism,
+                "columns": self.projection,
+                "watermark": list(self.watermark_range) if self.watermark_range is not None else None,
+                "estimated_rows": estimated_rows,
+                "chunk_size": self.chunk_size,
+                "chunks": chunks,
+                "queries": queries,
+                "queries_omitted": chunks - len(queries) if read_mode == "offset" and chunks else 0,
+                "schema_mode": "explicit" if self.explicit_schema else "autodetect",
+                "schema": [{"name": name, "type": field_type} for name, field_type in source_schema.bigquery_types()],
+            }
+        finally:
+            self._close_sql_conn()
+
+    def transfer_data(self) -> Dict[str, Any]:
+        """Transfer data from SQL Server to BigQuery in chunks."""
+        start_time = time.time()
+        stats = {"rows_transferred": 0, "bytes_transferred": 0}
+
+        try:
+            self._prepare_source()
+
+            # Every read mode runs until the source is exhausted; the estimate only drives progress
+            self.estimated_rows = self._estimate_total_rows()
+            estimate = self.estimated_rows if self.estimated_rows is not None else "an unknown number of"
+            logger.info(f"Starting transfer of {estimate} rows with chunk size {self.chunk_size}")
+
+            if self.explicit_schema:
+                self._resolve_schema()
+
+            self.sink = None
+            self._open_sink()
+
+            if self.memory_budget_mb is not None:
+                # Chunks queued for or being uploaded are held alongside the one being read
+                chunks_in_memory = 1 + (self.queue_depth + self.upload_workers if self.queue_depth > 0 else 0)
+                self.chunk_sizer = AdaptiveChunkSizer(
+                    self.memory_budget_mb * 1024 * 1024,
+                    self.chunk_size,
+                    chunks_in_memory=chunks_in_memory
+                )
+                logger.info(f"Sizing chunks to a {self.memory_budget_mb} MB memory budget "
+                            f"across {chunks_in_memory} chunk(s) in memory")
+
+            # Resume after the last committed chunk, appending instead of truncating
+            start_position = None
+            truncate_first = True
+            seq_base = 0
+            if self.checkpoint_file:
+                self.checkpoint = self._open_checkpoint()
+                if self.checkpoint.chunks_loaded > 0:
+                    start_position = self.checkpoint.position
+                    truncate_first = False
+                    seq_base = self.checkpoint.chunks_loaded
+                    stats["rows_resumed"] = self.checkpoint.rows_loaded
+
+            # Process in chunks
+            chunks = self._iter_chunks(start_position)
+            if self.queue_depth > 0:
+                self._transfer_pipelined(chunks, stats, truncate_first, seq_base)
+            else:
+                self._transfer_serial(chunks, stats, truncate_first, seq_base)
+
+            self.sink.finish()
+
+            # Nothing staged means the staging table still holds a previous run's rows
+            if self.write_mode == "merge" and stats["rows_transferred"] > 0:
+                stats["rows_merged"] = self._merge_staging(stats["rows_transferred"])
+
+            # Only advance the watermark once its rows are in the target
+            if self.watermark_state is not None and self.watermark_range[1] is not None:
+                self.watermark_state.save(self.watermark_range[1])
+
+            if self.checkpoint is not None:
+                self.checkpoint.mark_completed()
 
             # Get final statistics
             total_time = time.time() - start_time
-            mb_transferred = bytes_transferred / (1024 * 1024)
+            rows_transferred = stats["rows_transferred"]
+            mb_transferred = stats["bytes_transferred"] / (1024 * 1024)
+
+            mb_uploaded = self.metrics.counters.get("bytes_uploaded", 0) / (1024 * 1024)
 
             result = {
                 "success": True,
                 "rows_transferred": rows_transferred,
-                "total_rows": total_rows,
+                "total_rows": rows_transferred + stats.get("rows_resumed", 0),
                 "time_taken": total_time,
                 "rows_per_second": rows_transferred / total_time if total_time > 0 else 0,
                 "mb_transferred": mb_transferred,
                 "mb_per_second": mb_transferred / total_time if total_time > 0 else 0,
+                "mb_uploaded": mb_uploaded,
+                "load_jobs": len(self.sink.job_stats),
+                "load_job_stats": self.sink.job_stats,
+                "stage_metrics": self.metrics.summary(),
+                **self.retry_stats.as_dict(),
+                **self.sink.summary(),
             }
+            peak_rss = peak_rss_bytes()
+            if peak_rss is not None:
+                result["peak_rss_mb"] = peak_rss / (1024 * 1024)
+            if "bytes_narrowed" in self.metrics.counters:
+                result["mb_narrowed"] = self.metrics.counters["bytes_narrowed"] / (1024 * 1024)
+            if self.chunk_sizer is not None:
+                result["chunk_sizes"] = self.chunk_sizer.chunk_sizes
+            if self.estimated_rows is not None:
+                result["estimated_rows"] = self.estimated_rows
+            if "rows_resumed" in stats:
+                result["rows_resumed"] = stats["rows_resumed"]
+            if self.partition_stats:
+                result["partitions"] = self.partition_stats
+            if "rows_merged" in stats:
+                result["rows_merged"] = stats["rows_merged"]
+            if self.watermark_range is not None:
+                result["watermark"] = {"previous": self.watermark_range[0], "current": self.watermark_range[1]}
+
+            self.metrics.finish({
+                "success": 1,
+                "rows_transferred": rows_transferred,
+                "time_taken_seconds": total_time,
+                "retries": sum(result["retries"].values()),
+                "retry_seconds": result["retry_seconds"],
+            })
 
             logger.info(f"Transfer completed: {rows_transferred} rows in {total_time:.2f} seconds")
             return result
@@ -291,17 +1784,29 @@ class SQLServerToBigQueryTransfer:
         except Exception as e:
             logger.error(f"Transfer failed: {e}")
             total_time = time.time() - start_time
+            if self.sink is not None and self.sink.committed_rows is not None:
+                # Only count rows the sink actually committed
+                stats["rows_transferred"] = self.sink.committed_rows
+            retries = self.retry_stats.as_dict()
+            self.metrics.finish({
+                "success": 0,
+                "rows_transferred": stats["rows_transferred"],
+                "time_taken_seconds": total_time,
+                "retries": sum(retries["retries"].values()),
+                "retry_seconds": retries["retry_seconds"],
+            })
             return {
                 "success": False,
                 "error": str(e),
                 "time_taken": total_time,
-                "rows_transferred": rows_transferred,
-                "mb_transferred": bytes_transferred / (1024 * 1024)
+                "rows_transferred": stats["rows_transferred"],
+                "mb_transferred": stats["bytes_transferred"] / (1024 * 1024),
+                "stage_metrics": self.metrics.summary(),
+                **retries
             }
         finally:
+            if self.sink is not None:
+                self.sink.close()
+
             # Close connections
-            try:
-                self.sql_conn.close()
-                logger.info("SQL Server connection closed")
-            except:
-                pass
+            self._close_sql_conn()
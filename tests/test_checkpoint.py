@@ -0,0 +1,67 @@
+import datetime
+import json
+import os
+import tempfile
+import unittest
+from decimal import Decimal
+
+from sql_to_bq.checkpoint import Checkpoint
+
+
+class TestCheckpoint(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, "transfer.checkpoint.json")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_out_of_order_commits_only_advance_the_committed_prefix(self):
+        checkpoint = Checkpoint(self.path, {"sql_table": "orders"})
+
+        checkpoint.mark_committed(1, 200, 100, "job-1")
+        assert checkpoint.chunks_loaded == 0
+        assert not os.path.exists(self.path)
+
+        checkpoint.mark_committed(0, 100, 100, "job-0")
+        assert checkpoint.chunks_loaded == 2
+        assert checkpoint.position == 200
+        assert checkpoint.rows_loaded == 200
+
+        with open(self.path) as f:
+            state = json.load(f)
+        assert state["last_job_id"] == "job-1"
+        assert state["completed"] is False
+
+    def test_key_positions_round_trip(self):
+        key = (datetime.datetime(2024, 5, 1, 12, 30, 15, 123000), Decimal("10.50"), b"\x00\xff", "abc", 7)
+        checkpoint = Checkpoint(self.path, {"sql_table": "orders"})
+        checkpoint.mark_committed(0, key, 10, "job-0")
+        checkpoint.mark_committed(1, key, 10, "job-0")
+        checkpoint.mark_completed()
+
+        loaded = Checkpoint.load(self.path)
+
+        assert loaded.position == key
+        assert loaded.rows_loaded == 20
+        assert loaded.last_job_id == "job-0"
+        assert loaded.completed is True
+        assert loaded.source == {"sql_table": "orders"}
+
+    def test_loads_job_id_list_from_older_files(self):
+        state = {
+            "source": {"sql_table": "orders"},
+            "position": 100,
+            "rows_loaded": 100,
+            "chunks_loaded": 2,
+            "job_ids": ["job-0", "job-1"],
+            "completed": False,
+        }
+        with open(self.path, "w") as f:
+            json.dump(state, f)
+
+        assert Checkpoint.load(self.path).last_job_id == "job-1"
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+import io
+import os
+import tempfile
+import unittest
+
+import polars as pl
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from sql_to_bq.encoding import ParquetEncoding, narrow_types
+from sql_to_bq.staging import ParquetSpool
+
+
+class TestNarrowTypes(unittest.TestCase):
+    def test_narrows_small_integers_and_repeated_strings(self):
+        df = pl.DataFrame({
+            "id": list(range(100)),
+            "big": [2 ** 40 + i for i in range(100)],
+            "status": ["open", "closed"] * 50,
+            "name": [f"customer {i}" for i in range(100)],
+            "empty": pl.Series([None] * 100, dtype=pl.Int64),
+        })
+
+        narrowed = narrow_types(df)
+
+        assert dict(narrowed.schema) == {
+            "id": pl.Int32,
+            "big": pl.Int64,
+            "status": pl.Categorical,
+            "name": pl.String,
+            "empty": pl.Int32,
+        }
+        assert narrowed.estimated_size() < df.estimated_size()
+        assert narrowed.cast({"id": pl.Int64, "status": pl.String, "empty": pl.Int64}).equals(df)
+
+    def test_empty_chunk_is_unchanged(self):
+        df = pl.DataFrame({"name": pl.Series([], dtype=pl.String)})
+        assert narrow_types(df).schema == df.schema
+
+
+class TestParquetEncoding(unittest.TestCase):
+    def setUp(self):
+        self.df = pl.DataFrame({"id": list(range(1000)), "status": ["open", "closed"] * 500})
+
+    def test_default_keeps_polars_writer(self):
+        buffer = io.BytesIO()
+        ParquetEncoding().write(self.df, buffer)
+
+        metadata = pq.ParquetFile(io.BytesIO(buffer.getvalue())).metadata
+        assert metadata.row_group(0).column(0).compression == "ZSTD"
+
+    def test_write_options(self):
+        encoding = ParquetEncoding(compression="gzip", compression_level=9, row_group_size=250, statistics=False)
+        buffer = io.BytesIO()
+        encoding.write(self.df, buffer)
+
+        metadata = pq.ParquetFile(io.BytesIO(buffer.getvalue())).metadata
+        assert metadata.num_row_groups == 4
+        column = metadata.row_group(0).column(0)
+        assert column.compression == "GZIP"
+        assert not column.is_stats_set
+
+    def test_disable_dictionary(self):
+        buffer = io.BytesIO()
+        ParquetEncoding(dictionary=False).write(self.df, buffer)
+
+        column = pq.ParquetFile(io.BytesIO(buffer.getvalue())).metadata.row_group(0).column(1)
+        assert not column.has_dictionary_page
+
+    def test_spool_uses_options(self):
+        encoding = ParquetEncoding(compression="uncompressed", row_group_size=400)
+        with tempfile.TemporaryDirectory() as temp_dir:
+            spool = ParquetSpool(temp_dir, 1024 * 1024, encoding)
+            spool.append(self.df, is_first_chunk=True)
+            batch = spool.close()
+
+            metadata = pq.ParquetFile(batch["path"]).metadata
+            assert metadata.num_row_groups == 3
+            assert metadata.row_group(0).column(0).compression == "UNCOMPRESSED"
+            os.remove(batch["path"])
+
+    def test_narrowed_chunks_load_as_bigquery_types(self):
+        buffer = io.BytesIO()
+        encoding = ParquetEncoding(narrow=True)
+        encoding.write(encoding.prepare(self.df), buffer)
+
+        schema = pq.read_schema(io.BytesIO(buffer.getvalue()))
+        assert schema.field("id").type == pa.int32()
+        # Dictionary-encoded strings are plain UTF8 columns in the Parquet file itself
+        physical = pq.ParquetFile(io.BytesIO(buffer.getvalue())).schema.column(1)
+        assert physical.physical_type == "BYTE_ARRAY"
+        assert physical.logical_type.type == "STRING"
+
+    def test_invalid_options(self):
+        with self.assertRaises(ValueError):
+            ParquetEncoding(compression="lzma")
+        with self.assertRaises(ValueError):
+            ParquetEncoding(compression="snappy", compression_level=3)
+        with self.assertRaises(ValueError):
+            ParquetEncoding(row_group_size=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
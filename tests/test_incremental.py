@@ -0,0 +1,68 @@
+import datetime
+import os
+import tempfile
+import unittest
+from decimal import Decimal
+
+from sql_to_bq.incremental import WatermarkState, build_merge_statement, sql_datetime_type, sql_literal
+
+
+class TestIncremental(unittest.TestCase):
+    def test_sql_literals(self):
+        assert sql_literal(42) == "42"
+        assert sql_literal(Decimal("10.50")) == "10.50"
+        assert sql_literal(b"\x00\x00\x00\x00\x00\x00\x07\xd1") == "0x00000000000007D1"
+        assert sql_literal("O'Brien") == "N'O''Brien'"
+        assert sql_literal(datetime.date(2024, 5, 1)) == "CAST('2024-05-01' AS DATE)"
+        assert sql_literal(datetime.datetime(2024, 5, 1, 12, 30, 15, 123456)) == \
+            "CAST('2024-05-01 12:30:15.123456' AS DATETIME2(7))"
+
+        # DATETIME bounds are rounded to the column's 1/300 second steps, like the stored values
+        assert sql_datetime_type({"type": "datetime", "scale": 3}) == "DATETIME"
+        assert sql_datetime_type({"type": "datetime2", "scale": 3}) == "DATETIME2(3)"
+        assert sql_datetime_type({"type": "int", "scale": 0}) is None
+        assert sql_literal(datetime.datetime(2024, 5, 1, 12, 30, 15, 3000), "DATETIME") == \
+            "CAST(CAST('2024-05-01 12:30:15.003000' AS DATETIME2(7)) AS DATETIME)"
+        assert sql_literal(datetime.datetime(2024, 5, 1), "DATETIME2(7)") == "CAST('2024-05-01 00:00:00' AS DATETIME2(7))"
+
+        with self.assertRaises(ValueError):
+            sql_literal(object())
+
+    def test_merge_statement(self):
+        statement = build_merge_statement(
+            "p.d.orders", "p.d.orders_staging", ["id", "region", "amount"], ["id", "region"]
+        )
+
+        assert statement.startswith("MERGE `p.d.orders` T\nUSING `p.d.orders_staging` S\n")
+        assert "ON T.`id` = S.`id` AND T.`region` = S.`region`" in statement
+        assert "WHEN MATCHED THEN UPDATE SET `amount` = S.`amount`" in statement
+        assert "INSERT (`id`, `region`, `amount`) VALUES (S.`id`, S.`region`, S.`amount`)" in statement
+
+        # Key-only tables have nothing to update
+        assert "WHEN MATCHED" not in build_merge_statement("t", "s", ["id"], ["id"])
+
+        # Keys match the staged columns regardless of case
+        statement = build_merge_statement("t", "s", ["ID", "amount"], ["id"])
+        assert "ON T.`ID` = S.`ID`" in statement
+        assert "UPDATE SET `amount` = S.`amount`" in statement
+
+        with self.assertRaises(ValueError):
+            build_merge_statement("t", "s", ["id"], ["missing"])
+
+    def test_watermark_state_round_trip(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "orders.watermark.json")
+            source = {"sql_table": "orders", "watermark_column": "rv"}
+
+            state = WatermarkState.load(path, source)
+            assert state.watermark is None
+
+            state.save(b"\x00\x00\x00\x00\x00\x00\x07\xd1")
+            assert WatermarkState.load(path, source).watermark == b"\x00\x00\x00\x00\x00\x00\x07\xd1"
+
+            with self.assertRaises(ValueError):
+                WatermarkState.load(path, {"sql_table": "customers", "watermark_column": "rv"})
+
+
+if __name__ == "__main__":
+    unittest.main()
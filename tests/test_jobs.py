@@ -0,0 +1,85 @@
+import threading
+import unittest
+from unittest.mock import MagicMock
+
+from sql_to_bq.jobs import LoadJobWindow
+
+
+class FakeJob:
+    """Load job stand-in that finishes when told to."""
+
+    def __init__(self, job_id, error=None):
+        self.job_id = job_id
+        self.error = error
+        self.finished = threading.Event()
+
+    def done(self):
+        return self.finished.is_set()
+
+    def result(self):
+        self.finished.wait()
+        if self.error:
+            raise self.error
+
+
+class TestLoadJobWindow(unittest.TestCase):
+    def test_window_blocks_when_full(self):
+        window = LoadJobWindow(2, poll_interval=0.01)
+        jobs = [FakeJob(i) for i in range(3)]
+
+        window.submit(jobs[0], 10)
+        window.submit(jobs[1], 10)
+
+        submitted = threading.Event()
+
+        def submit_third():
+            window.submit(jobs[2], 10)
+            submitted.set()
+
+        thread = threading.Thread(target=submit_third)
+        thread.start()
+
+        assert not submitted.wait(0.1)
+        jobs[1].finished.set()
+        assert submitted.wait(1)
+
+        jobs[0].finished.set()
+        jobs[2].finished.set()
+        window.drain()
+        thread.join()
+        window.close()
+
+        assert window.jobs_submitted == 3
+        assert window.committed_rows == 30
+
+    def test_wait_finishes_job_before_returning(self):
+        window = LoadJobWindow(4, poll_interval=0.01)
+        job = MagicMock()
+
+        window.submit(job, 5, wait=True)
+        window.close()
+
+        job.result.assert_called_once()
+        assert window.committed_rows == 5
+
+    def test_first_failure_is_raised(self):
+        window = LoadJobWindow(4, poll_interval=0.01)
+        failing = FakeJob("bad", error=RuntimeError("load failed"))
+        ok = FakeJob("ok")
+
+        window.submit(failing, 10)
+        window.submit(ok, 10)
+        failing.finished.set()
+        ok.finished.set()
+
+        with self.assertRaises(RuntimeError):
+            window.drain()
+        with self.assertRaises(RuntimeError):
+            window.submit(FakeJob("later"), 10)
+        window.close()
+
+        assert window.jobs_submitted == 2
+
+
+if __name__ == "__main__":
+    unittest.main()
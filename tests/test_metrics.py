@@ -0,0 +1,68 @@
+import datetime
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+
+from sql_to_bq.metrics import TransferMetrics, load_job_timings, percentile
+
+
+class TestTransferMetrics(unittest.TestCase):
+    def test_percentile(self):
+        values = [float(v) for v in range(1, 101)]
+        assert percentile(values, 50) == 50
+        assert percentile(values, 99) == 99
+        assert percentile([3.0], 90) == 3.0
+
+    def test_summary_and_exports(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            jsonl_path = os.path.join(temp_dir, "metrics.jsonl")
+            prometheus_path = os.path.join(temp_dir, "transfer.prom")
+            metrics = TransferMetrics(jsonl_path, prometheus_path, labels={"table": "p.d.orders"})
+
+            metrics.record("read", {"fetch": 0.2}, rows=100, bytes=4096)
+            metrics.record("read", {"fetch": 0.4}, rows=100, bytes=4096)
+            metrics.record("load_job", {"encode": 0.1, "upload": 1.5}, {"bytes_uploaded": 1000}, job_id="job-0")
+
+            summary = metrics.summary()
+            assert summary["stages"]["fetch"]["count"] == 2
+            assert summary["stages"]["fetch"]["p50"] == 0.2
+            assert summary["stages"]["fetch"]["max"] == 0.4
+            assert "query" not in summary["stages"]
+            assert summary["counters"] == {"bytes_uploaded": 1000}
+
+            metrics.finish({"success": 1, "rows_transferred": 200})
+
+            with open(jsonl_path) as f:
+                events = [json.loads(line) for line in f]
+            assert [e["event"] for e in events] == ["read", "read", "load_job"]
+            assert events[0]["fetch_seconds"] == 0.2
+            assert events[0]["table"] == "p.d.orders"
+            assert events[2]["bytes_uploaded"] == 1000
+
+            with open(prometheus_path) as f:
+                text = f.read()
+            assert 'sql_to_bq_stage_seconds_bucket{table="p.d.orders",stage="fetch",le="0.25"} 1' in text
+            assert 'sql_to_bq_stage_seconds_count{table="p.d.orders",stage="upload"} 1' in text
+            assert 'sql_to_bq_rows_transferred{table="p.d.orders"} 200' in text
+            assert 'sql_to_bq_bytes_uploaded{table="p.d.orders"} 1000' in text
+
+    def test_load_job_timings(self):
+        created = datetime.datetime(2024, 5, 1, 12, 0, 0)
+        job = MagicMock(
+            created=created,
+            started=created + datetime.timedelta(seconds=2),
+            ended=created + datetime.timedelta(seconds=7),
+        )
+        job._properties = {"statistics": {"totalSlotMs": "1234"}}
+
+        seconds, counters = load_job_timings(job)
+        assert seconds == {"job_pending": 2.0, "job_running": 5.0}
+        assert counters == {"slot_ms": 1234}
+
+        assert load_job_timings(MagicMock()) == ({}, {})
+
+
+if __name__ == "__main__":
+    unittest.main()
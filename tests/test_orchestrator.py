@@ -0,0 +1,145 @@
+import json
+import os
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+from sql_to_bq.orchestrator import TransferOrchestrator, load_manifest
+
+
+class FakeTransfer:
+    """SQLServerToBigQueryTransfer stand-in that records how many transfers overlap."""
+
+    lock = threading.Lock()
+    active = {}
+    peak = {}
+    started = []
+    connections = []
+
+    def __init__(self, **options):
+        self.options = options
+        self._sql_conn = options["sql_conn"]
+
+    def transfer_data(self):
+        server = self.options["sql_server"]
+        with self.lock:
+            self.started.append(self.options["sql_table"])
+            self.connections.append(self._sql_conn)
+            self.active[server] = self.active.get(server, 0) + 1
+            self.peak[server] = max(self.peak.get(server, 0), self.active[server])
+        time.sleep(0.02)
+        with self.lock:
+            self.active[server] -= 1
+
+        if self.options["sql_table"] == "broken":
+            return {"success": False, "error": "load failed", "time_taken": 0.02, "rows_transferred": 0}
+        return {"success": True, "rows_transferred": 10, "time_taken": 0.02}
+
+
+class TestTransferOrchestrator(unittest.TestCase):
+    def setUp(self):
+        FakeTransfer.active = {}
+        FakeTransfer.peak = {}
+        FakeTransfer.started = []
+        FakeTransfer.connections = []
+
+    @patch('sql_to_bq.orchestrator.SQLServerToBigQueryTransfer', FakeTransfer)
+    @patch('google.cloud.bigquery.Client.from_service_account_json')
+    @patch('pyodbc.connect')
+    def test_largest_first_with_server_limit(self, mock_pyodbc_connect, mock_bq_client_from_json):
+        mock_pyodbc_connect.side_effect = lambda conn_str: MagicMock()
+        defaults = {"sql_database": "db", "bq_project": "p", "bq_dataset": "d", "key_path": "key.json"}
+        jobs = [
+            {"sql_server": "a", "sql_table": "small", "bq_table": "small", "estimated_rows": 10},
+            {"sql_server": "a", "sql_table": "large", "bq_table": "large", "estimated_rows": 1000},
+            {"sql_server": "a", "sql_table": "broken", "bq_table": "broken", "estimated_rows": 500},
+            {"sql_server": "b", "sql_table": "other", "bq_table": "other", "estimated_rows": 100},
+        ]
+
+        summary = TransferOrchestrator(jobs, defaults, max_workers=1, max_per_server=1).run()
+
+        assert FakeTransfer.started == ["large", "broken", "other", "small"]
+        assert summary["tables"] == 4
+        assert summary["succeeded"] == 3
+        assert summary["failed"] == 1
+        assert summary["success"] is False
+        assert summary["rows_transferred"] == 30
+        assert [r["name"] for r in summary["results"] if not r["success"]] == ["broken"]
+
+        # One BigQuery client for every job, and server a's connection reused after successes
+        mock_bq_client_from_json.assert_called_once_with("key.json", project="p")
+        assert mock_pyodbc_connect.call_count == 3
+
+    @patch('sql_to_bq.orchestrator.SQLServerToBigQueryTransfer', FakeTransfer)
+    @patch('google.cloud.bigquery.Client.from_service_account_json')
+    @patch('pyodbc.connect')
+    def test_concurrent_extractions_capped_per_server(self, mock_pyodbc_connect, mock_bq_client_from_json):
+        mock_pyodbc_connect.side_effect = lambda conn_str: MagicMock()
+        defaults = {"sql_database": "db", "bq_project": "p", "bq_dataset": "d", "key_path": "key.json"}
+        jobs = [
+            {"sql_server": server, "sql_table": f"{server}{i}", "bq_table": f"{server}{i}", "estimated_rows": i}
+            for server in ("a", "b") for i in range(4)
+        ]
+
+        summary = TransferOrchestrator(jobs, defaults, max_workers=6, max_per_server=2, server_limits={"b": 1}).run()
+
+        assert summary["success"] is True
+        assert FakeTransfer.peak == {"a": 2, "b": 1}
+
+    @patch('google.cloud.bigquery.Client.from_service_account_json')
+    @patch('pyodbc.connect')
+    def test_failed_reconnect_does_not_stop_the_batch(self, mock_pyodbc_connect, mock_bq_client_from_json):
+        import pyodbc
+
+        lost = pyodbc.OperationalError("08S01", "Communication link failure")
+        # The first job connects, then the server goes away for good
+        mock_pyodbc_connect.side_effect = [MagicMock()] + [lost] * 10
+        defaults = {"sql_server": "a", "sql_database": "db", "bq_project": "p", "bq_dataset": "d",
+                    "key_path": "key.json", "max_retries": 1, "retry_backoff": 0, "total_rows": 10}
+        jobs = [
+            {"sql_table": "first", "bq_table": "first", "estimated_rows": 2},
+            {"sql_table": "second", "bq_table": "second", "estimated_rows": 1},
+        ]
+
+        with patch('polars.read_database', side_effect=lost):
+            summary = TransferOrchestrator(jobs, defaults, max_workers=1).run()
+
+        assert [r["name"] for r in summary["results"]] == ["first", "second"]
+        assert summary["failed"] == 2
+
+    @patch('pyodbc.connect')
+    def test_table_estimates_from_catalog(self, mock_pyodbc_connect):
+        mock_conn = MagicMock()
+        mock_pyodbc_connect.return_value = mock_conn
+        mock_conn.cursor.return_value.fetchone.return_value = [42]
+
+        orchestrator = TransferOrchestrator([])
+        job = {"sql_server": "a", "sql_database": "db", "sql_table": "dbo.orders"}
+
+        assert orchestrator._estimate_rows(job) == 42
+        assert "sys.dm_db_partition_stats" in mock_conn.cursor.return_value.execute.call_args.args[0]
+        assert orchestrator._estimate_rows({**job, "sql_table": None, "sql_query": "SELECT 1"}) == 0
+
+    def test_load_json_manifest(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "nightly.json")
+            with open(path, "w") as f:
+                json.dump({"max_workers": 8, "defaults": {"sql_server": "a"}, "jobs": [{"sql_table": "orders"}]}, f)
+
+            assert load_manifest(path)["jobs"] == [{"sql_table": "orders"}]
+
+            orchestrator = TransferOrchestrator.from_manifest(path, max_per_server=3)
+            assert orchestrator.max_workers == 8
+            assert orchestrator.max_per_server == 3
+            assert orchestrator.jobs == [{"sql_server": "a", "sql_table": "orders"}]
+
+            with open(path, "w") as f:
+                json.dump({"jobs": []}, f)
+            with self.assertRaises(ValueError):
+                load_manifest(path)
+
+
+if __name__ == "__main__":
+    unittest.main()
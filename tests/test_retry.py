@@ -0,0 +1,118 @@
+import unittest
+from unittest.mock import MagicMock, patch
+
+import pyodbc
+from google.api_core import exceptions as api_exceptions
+
+from sql_to_bq.connections import ConnectionPool
+from sql_to_bq.retry import RetryPolicy, RetryStats, is_retryable_bigquery_error, is_retryable_sql_error
+
+
+class TestErrorClassification(unittest.TestCase):
+    def test_sql_errors(self):
+        deadlock = pyodbc.Error(
+            "40001",
+            "[40001] [Microsoft][ODBC Driver 17 for SQL Server][SQL Server]Transaction (Process ID 57) was "
+            "deadlocked on lock resources with another process (1205) (SQLExecDirectW)"
+        )
+        lock_timeout = pyodbc.Error(
+            "HY000", "[HY000] [Microsoft][ODBC Driver 17 for SQL Server][SQL Server]Lock request time out "
+            "period exceeded. (1222) (SQLExecDirectW)"
+        )
+        missing_table = pyodbc.Error(
+            "42S02", "[42S02] [Microsoft][ODBC Driver 17 for SQL Server][SQL Server]Invalid object name "
+            "'dbo.missing'. (208) (SQLExecDirectW)"
+        )
+        arrow_link_failure = RuntimeError("ODBC emitted an error calling 'SQLFetch': State: 08S01, Native error: 10054")
+
+        assert is_retryable_sql_error(pyodbc.OperationalError("08S01", "Communication link failure"))
+        assert is_retryable_sql_error(deadlock)
+        assert is_retryable_sql_error(lock_timeout)
+        assert is_retryable_sql_error(arrow_link_failure)
+        assert not is_retryable_sql_error(missing_table)
+        assert not is_retryable_sql_error(ValueError("bad key"))
+
+    def test_bigquery_errors(self):
+        backend_error = api_exceptions.BadRequest("job failed", errors=[{"reason": "backendError"}])
+        invalid = api_exceptions.BadRequest("bad schema", errors=[{"reason": "invalid"}])
+
+        assert is_retryable_bigquery_error(api_exceptions.ServiceUnavailable("unavailable"))
+        assert is_retryable_bigquery_error(api_exceptions.TooManyRequests("slow down"))
+        assert is_retryable_bigquery_error(api_exceptions.BadGateway("bad gateway"))
+        assert is_retryable_bigquery_error(backend_error)
+        assert is_retryable_bigquery_error(ConnectionResetError())
+        assert not is_retryable_bigquery_error(invalid)
+        assert not is_retryable_bigquery_error(api_exceptions.NotFound("no table"))
+
+
+class TestRetryPolicy(unittest.TestCase):
+    def test_retries_until_success(self):
+        operation = MagicMock(side_effect=[TimeoutError(), TimeoutError(), "done"])
+        on_retry = MagicMock()
+        stats = RetryStats()
+
+        result = RetryPolicy(max_retries=3, initial_backoff=0).call(
+            operation, is_retryable_sql_error, "Reading", "read", stats, on_retry=on_retry
+        )
+
+        assert result == "done"
+        assert operation.call_count == 3
+        assert on_retry.call_count == 2
+        assert stats.as_dict()["retries"] == {"read": 2}
+        assert stats.as_dict()["retry_seconds"] >= 0
+
+    def test_gives_up_after_max_retries(self):
+        operation = MagicMock(side_effect=TimeoutError())
+
+        with self.assertRaises(TimeoutError):
+            RetryPolicy(max_retries=2, initial_backoff=0).call(operation, is_retryable_sql_error, "Reading", "read")
+        assert operation.call_count == 3
+
+    def test_permanent_errors_are_not_retried(self):
+        operation = MagicMock(side_effect=ValueError("bad query"))
+
+        with self.assertRaises(ValueError):
+            RetryPolicy(initial_backoff=0).call(operation, is_retryable_sql_error, "Reading", "read")
+        assert operation.call_count == 1
+
+    def test_backoff_is_capped_and_jittered(self):
+        policy = RetryPolicy(initial_backoff=1.0, max_backoff=5.0)
+
+        with patch('random.uniform', side_effect=lambda low, high: high) as mock_uniform:
+            assert [policy.backoff(attempt) for attempt in (1, 2, 3, 4)] == [1.0, 2.0, 4.0, 5.0]
+        assert all(c.args[0] == 0 for c in mock_uniform.call_args_list)
+
+    def test_invalid_settings(self):
+        with self.assertRaises(ValueError):
+            RetryPolicy(max_retries=-1)
+        with self.assertRaises(ValueError):
+            RetryPolicy(initial_backoff=-1)
+
+
+class TestConnectionPool(unittest.TestCase):
+    @patch('pyodbc.connect')
+    def test_unhealthy_idle_connections_are_replaced(self, mock_pyodbc_connect):
+        stale = MagicMock()
+        stale.cursor.return_value.execute.side_effect = pyodbc.Error("08S01", "Communication link failure")
+        fresh = MagicMock()
+        mock_pyodbc_connect.return_value = fresh
+
+        pool = ConnectionPool()
+        pool.release("conn", stale)
+
+        assert pool.acquire("conn") is fresh
+        stale.close.assert_called_once()
+
+    @patch('pyodbc.connect')
+    def test_healthy_idle_connections_are_reused(self, mock_pyodbc_connect):
+        idle = MagicMock()
+        pool = ConnectionPool()
+        pool.release("conn", idle)
+
+        assert pool.acquire("conn") is idle
+        idle.cursor.return_value.execute.assert_called_once_with("SELECT 1")
+        mock_pyodbc_connect.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+
+import polars as pl
+
+from sql_to_bq.schema import SourceSchema
+
+
+class TestSourceSchema(unittest.TestCase):
+    def setUp(self):
+        self.conn = MagicMock()
+        self.cursor = self.conn.cursor.return_value
+        self.cursor.fetchall.return_value = [
+            ("id", "bigint", 19, 0, False),
+            ("flag", "bit", 1, 0, True),
+            ("price", "decimal", 18, 2, True),
+            ("ratio", "numeric", 38, 20, True),
+            ("created", "datetime2", 27, 7, True),
+            ("changed", "datetimeoffset", 34, 7, True),
+            ("guid", "uniqueidentifier", 0, 0, True),
+            ("name", "nvarchar", 0, 0, True),
+            ("payload", "varbinary", 0, 0, True),
+            ("version", "timestamp", 0, 0, False),
+        ]
+
+    def test_from_table(self):
+        schema = SourceSchema.from_sql_server(self.conn, sql_table="dbo.orders")
+
+        query, table = self.cursor.execute.call_args.args
+        assert "sys.columns" in query
+        assert table == "dbo.orders"
+
+        fields = {f.name: f.field_type for f in schema.bigquery_fields()}
+        assert fields == {
+            "id": "INTEGER",
+            "flag": "BOOLEAN",
+            "price": "NUMERIC",
+            "ratio": "BIGNUMERIC",
+            "created": "DATETIME",
+            "changed": "TIMESTAMP",
+            "guid": "STRING",
+            "name": "STRING",
+            "payload": "BYTES",
+            "version": "BYTES",
+        }
+        assert all(f.mode == "NULLABLE" for f in schema.bigquery_fields())
+
+        plan = schema.cast_plan()
+        assert plan["id"] == pl.Int64
+        assert plan["price"] == pl.Decimal(18, 2)
+        assert plan["created"] == pl.Datetime("us")
+        assert plan["changed"] == pl.Datetime("us", "UTC")
+        assert plan["payload"] == pl.Binary
+
+    def test_from_query(self):
+        SourceSchema.from_sql_server(self.conn, sql_query="SELECT * FROM orders")
+
+        query, source = self.cursor.execute.call_args.args
+        assert "sys.dm_exec_describe_first_result_set" in query
+        assert source == "SELECT * FROM orders"
+
+    def test_missing_metadata(self):
+        self.cursor.fetchall.return_value = []
+        with self.assertRaises(ValueError):
+            SourceSchema.from_sql_server(self.conn, sql_table="missing")
+
+    def test_cache_round_trip(self):
+        schema = SourceSchema.from_sql_server(self.conn, sql_table="dbo.orders")
+
+        with tempfile.TemporaryDirectory() as cache_dir:
+            path = SourceSchema.cache_path(cache_dir, "server", "db", "dbo.orders", None)
+            assert path != SourceSchema.cache_path(cache_dir, "server", "db", None, "SELECT 1")
+
+            schema.save(path)
+            loaded = SourceSchema.load(path)
+
+            assert os.listdir(cache_dir) == [os.path.basename(path)]
+            assert loaded.columns == schema.columns
+
+
+if __name__ == "__main__":
+    unittest.main()
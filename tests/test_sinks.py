@@ -0,0 +1,188 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+
+import polars as pl
+import pyarrow as pa
+from google.api_core.exceptions import NotFound, ServiceUnavailable
+from google.cloud import bigquery
+from google.cloud.bigquery_storage_v1 import types
+from google.rpc import status_pb2
+
+from sql_to_bq.encoding import ParquetEncoding
+from sql_to_bq.metrics import TransferMetrics
+from sql_to_bq.retry import RetryPolicy, RetryStats
+from sql_to_bq.sinks import ParquetDatasetSink, Sink, StorageWriteSink, bigquery_arrow_table
+
+
+class FakeWriteClient:
+    """Storage Write API stand-in that keeps appended batches by stream and offset."""
+
+    def __init__(self, lose_responses=0):
+        self.streams = {}
+        self.finalized = []
+        self.committed = []
+        self.lose_responses = lose_responses
+
+    def create_write_stream(self, parent, write_stream):
+        name = f"{parent}/streams/{len(self.streams)}"
+        self.streams[name] = {}
+        return types.WriteStream(name=name, type_=write_stream.type_)
+
+    def append_rows(self, requests, metadata=()):
+        responses = []
+        for request in requests:
+            if request.write_stream:
+                stream = request.write_stream
+                schema = pa.ipc.read_schema(pa.py_buffer(request.arrow_rows.writer_schema.serialized_schema))
+            batch = pa.ipc.read_record_batch(pa.py_buffer(request.arrow_rows.rows.serialized_record_batch), schema)
+            if request.offset in self.streams[stream]:
+                responses.append(types.AppendRowsResponse(error=status_pb2.Status(code=6, message="already exists")))
+            else:
+                self.streams[stream][request.offset] = batch
+                responses.append(types.AppendRowsResponse())
+
+        # The rows were written but the caller never hears back
+        if self.lose_responses:
+            self.lose_responses -= 1
+            raise ServiceUnavailable("connection reset")
+        return iter(responses)
+
+    def finalize_write_stream(self, name):
+        self.finalized.append(name)
+
+    def batch_commit_write_streams(self, request):
+        self.committed.extend(request.write_streams)
+        return types.BatchCommitWriteStreamsResponse()
+
+    def rows(self):
+        return sum(batch.num_rows for stream in self.streams.values() for batch in stream.values())
+
+
+class TestStorageWriteSink(unittest.TestCase):
+    def setUp(self):
+        self.client = MagicMock()
+        self.schema = [bigquery.SchemaField("id", "INTEGER"), bigquery.SchemaField("name", "STRING")]
+        self.df = pl.DataFrame({"id": [1, 2, 3], "name": ["a", "b", None]})
+
+    def make_sink(self, write_client, write_mode="truncate_append", stream_type="committed"):
+        return StorageWriteSink(
+            write_client, self.client, "p.d.t", write_mode,
+            RetryPolicy(max_retries=2, initial_backoff=0), RetryStats(), TransferMetrics(),
+            schema=self.schema, stream_type=stream_type
+        )
+
+    def test_committed_stream_appends_at_offsets(self):
+        write_client = FakeWriteClient()
+        sink = self.make_sink(write_client)
+        commits = []
+
+        sink.write(self.df, True, on_commit=commits.append, counters={"bytes_in_memory": 1})
+        sink.write(self.df, False, on_commit=commits.append, counters={"bytes_in_memory": 1})
+        sink.finish()
+
+        self.client.query.assert_called_once_with("TRUNCATE TABLE `p.d.t`")
+        [stream] = write_client.streams.values()
+        assert sorted(stream) == [0, 3]
+        assert stream[0].schema.field("name").type == pa.string()
+        assert commits == [None, None]
+        assert write_client.committed == []
+        assert sink.summary()["write_streams"][0]["rows"] == 6
+        assert sink.metrics.counters["bytes_uploaded"] > 0
+
+    def test_pending_stream_commits_on_finish(self):
+        write_client = FakeWriteClient()
+        sink = self.make_sink(write_client, write_mode="merge", stream_type="pending")
+        commits = []
+
+        sink.write(self.df, True, on_commit=commits.append, counters={"bytes_in_memory": 1})
+        assert commits == [] and sink.committed_rows == 0
+        self.client.query.assert_not_called()
+
+        sink.finish()
+        assert commits == [None]
+        assert sink.committed_rows == 3
+        assert write_client.committed == list(write_client.streams)
+        self.client.query.assert_called_once_with("TRUNCATE TABLE `p.d.t`")
+
+        # A failed commit after truncating would leave the table empty
+        with self.assertRaises(ValueError):
+            self.make_sink(write_client, stream_type="pending")
+
+    def test_retried_append_does_not_duplicate_rows(self):
+        write_client = FakeWriteClient(lose_responses=1)
+        sink = self.make_sink(write_client, write_mode="append")
+
+        sink.write(self.df, True, counters={"bytes_in_memory": 1})
+
+        assert write_client.rows() == 3
+        assert sink.retry_stats.as_dict()["retries"] == {"append": 1}
+
+    def test_creates_missing_table_from_schema(self):
+        self.client.get_table.side_effect = NotFound("missing")
+        sink = self.make_sink(FakeWriteClient(), write_mode="append")
+
+        sink.write(self.df, True, counters={"bytes_in_memory": 1})
+
+        table = self.client.create_table.call_args.args[0]
+        assert [field.name for field in table.schema] == ["id", "name"]
+
+        sink.schema = None
+        sink._table_ready = False
+        with self.assertRaises(ValueError):
+            sink.write(self.df, False, counters={"bytes_in_memory": 1})
+
+    def test_arrow_types(self):
+        df = pl.DataFrame({"status": ["open", "closed"]}).cast({"status": pl.Categorical})
+        assert bigquery_arrow_table(df).schema.field("status").type == pa.string()
+
+
+class TestParquetDatasetSink(unittest.TestCase):
+    def test_partitioned_dataset(self):
+        df = pl.DataFrame({"id": [1, 2, 3], "region": ["eu", "us", None]})
+        with tempfile.TemporaryDirectory() as path:
+            sink = ParquetDatasetSink(path, "truncate_append", ParquetEncoding(), TransferMetrics(), ["region"])
+            commits = []
+            sink.write(df, True, on_commit=commits.append, counters={"bytes_in_memory": 1})
+            sink.write(df, False, counters={"bytes_in_memory": 1})
+
+            assert commits == [None]
+            assert sorted(os.listdir(path)) == ["region=__HIVE_DEFAULT_PARTITION__", "region=eu", "region=us"]
+            assert len(os.listdir(os.path.join(path, "region=eu"))) == 2
+            assert sink.summary()["files_written"] == 6
+
+            written = pl.read_parquet(os.path.join(path, "region=eu", "*.parquet"))
+            assert written.columns == ["id"] and written["id"].to_list() == [1, 1]
+
+            # A new truncating run replaces what the previous one wrote
+            sink = ParquetDatasetSink(path, "truncate_append", ParquetEncoding(), TransferMetrics(), ["region"])
+            sink.write(df.head(1), True, counters={"bytes_in_memory": 1})
+            assert os.listdir(path) == ["region=eu"]
+
+    def test_append_keeps_existing_files(self):
+        df = pl.DataFrame({"id": [1, 2]})
+        with tempfile.TemporaryDirectory() as path:
+            ParquetDatasetSink(path, "append", ParquetEncoding(), TransferMetrics()).write(
+                df, True, counters={"bytes_in_memory": 1})
+            ParquetDatasetSink(path, "append", ParquetEncoding(), TransferMetrics()).write(
+                df, True, counters={"bytes_in_memory": 1})
+
+            assert pl.read_parquet(os.path.join(path, "*.parquet")).height == 4
+
+    def test_merge_is_rejected(self):
+        with self.assertRaises(ValueError):
+            ParquetDatasetSink("out", "merge", ParquetEncoding(), TransferMetrics())
+
+
+class TestSink(unittest.TestCase):
+    def test_sink_without_write_cannot_be_created(self):
+        class IncompleteSink(Sink):
+            pass
+
+        with self.assertRaises(TypeError):
+            IncompleteSink(TransferMetrics())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,52 @@
+import unittest
+
+from sql_to_bq.sizing import AdaptiveChunkSizer, peak_rss_bytes
+
+
+class TestAdaptiveChunkSizer(unittest.TestCase):
+    def test_first_chunk_uses_initial_size(self):
+        sizer = AdaptiveChunkSizer(100 * 1024 * 1024, 50000)
+
+        assert sizer.next_rows() == 50000
+        assert sizer.next_rows() == 50000
+        assert sizer.chunk_sizes == [50000, 50000]
+
+    def test_wide_rows_shrink_to_budget(self):
+        # 10 MB budget, one chunk in memory, half of it left after encoding overhead
+        sizer = AdaptiveChunkSizer(10 * 1024 * 1024, 100000, min_rows=100)
+        sizer.next_rows()
+        sizer.record_read(100000, 100000 * 1024, 1.0)
+
+        assert sizer.next_rows() == 5 * 1024
+
+    def test_grows_until_throughput_stops_improving(self):
+        sizer = AdaptiveChunkSizer(1024 * 1024 * 1024, 1000)
+        sizer.next_rows()
+
+        sizer.record_read(1000, 1000 * 10, 1.0)
+        assert sizer.next_rows() == 2000
+
+        # Twice the rows in less time: keep growing
+        sizer.record_read(2000, 2000 * 10, 1.0)
+        assert sizer.next_rows() == 4000
+
+        # No throughput gain from the larger chunk: hold the size
+        sizer.record_read(4000, 4000 * 10, 2.0)
+        assert sizer.next_rows() == 4000
+        sizer.record_read(4000, 4000 * 10, 2.0)
+        assert sizer.next_rows() == 4000
+
+    def test_in_flight_chunks_share_the_budget(self):
+        sizer = AdaptiveChunkSizer(8 * 1024 * 1024, 100000, chunks_in_memory=4, min_rows=1)
+        sizer.next_rows()
+        sizer.record_read(1000, 1000 * 1024, 0.1)
+
+        assert sizer.next_rows() == 1024
+
+    def test_peak_rss(self):
+        peak = peak_rss_bytes()
+        assert peak is None or peak > 0
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,6 @@
 import unittest
 from unittest.mock import patch, MagicMock, call
+import os
 import tempfile
 import json
 from sql_to_bq.transfer import SQLServerToBigQueryTransfer
@@ -56,8 +57,14 @@ class TestSQLServerToBigQueryTransfer(unittest.TestCase):
         # Create transfer object
         transfer = SQLServerToBigQueryTransfer(**self.params)
 
-        # Verify connections were initialized
+        # Verify both connections wait until they are needed
+        mock_pyodbc_connect.assert_not_called()
+        mock_bq_client_from_json.assert_not_called()
+
+        assert transfer.sql_conn is mock_conn
         mock_pyodbc_connect.assert_called_once()
+
+        assert transfer.bq_client is mock_bq_client_from_json.return_value
         mock_credentials.assert_called_once_with(self.temp_key_file.name)
         mock_bq_client_from_json.assert_called_once_with(
             self.temp_key_file.name,
@@ -108,6 +115,12 @@ class TestSQLServerToBigQueryTransfer(unittest.TestCase):
                         mock_df.estimated_size.return_value = 1024 * 1024  # 1 MB
                         mock_dfs.append(mock_df)
 
+                    # The source is read until a short chunk comes back
+                    empty_df = MagicMock()
+                    empty_df.is_empty.return_value = True
+                    empty_df.shape = (0, 10)
+                    mock_dfs.append(empty_df)
+
                     mock_read_database.side_effect = mock_dfs
                     result = transfer.transfer_data()
 
@@ -115,7 +128,8 @@ class TestSQLServerToBigQueryTransfer(unittest.TestCase):
                     assert result["success"] is True
                     assert result["rows_transferred"] == 100
                     assert result["total_rows"] == 100
-                    assert spy_read_chunk.call_count == 4
+                    assert result["estimated_rows"] == 100
+                    assert spy_read_chunk.call_count == 5
 
                     # Verify correct offsets were used
                     from unittest.mock import ANY
@@ -123,7 +137,8 @@ class TestSQLServerToBigQueryTransfer(unittest.TestCase):
                         call(0, 25),
                         call(25, 25),
                         call(50, 25),
-                        call(75, 25)
+                        call(75, 25),
+                        call(100, 25)
                     ]
 
                     spy_read_chunk.assert_has_calls(expected_calls, any_order=False)
@@ -162,6 +177,12 @@ class TestSQLServerToBigQueryTransfer(unittest.TestCase):
                         mock_df.estimated_size.return_value = 1024 * 1024  # 1 MB
                         mock_dfs.append(mock_df)
 
+                    # The source is read until a short chunk comes back
+                    empty_df = MagicMock()
+                    empty_df.is_empty.return_value = True
+                    empty_df.shape = (0, 10)
+                    mock_dfs.append(empty_df)
+
                     mock_read_database.side_effect = mock_dfs
                     result = transfer.transfer_data()
 
@@ -173,5 +194,1019 @@ class TestSQLServerToBigQueryTransfer(unittest.TestCase):
                     for call_args in cursor.execute.call_args_list:
                         assert "COUNT(*)" not in call_args[0][0]
 
-                    assert spy_read_chunk.call_count == 4
+                    assert spy_read_chunk.call_count == 5
                     assert mock_upload.call_count == 4
+
+    @patch('pyodbc.connect')
+    @patch('google.oauth2.service_account.Credentials.from_service_account_file')
+    @patch('google.cloud.bigquery.Client.from_service_account_json')
+    def test_keyset_chunking(self, mock_bq_client_from_json, mock_credentials, mock_pyodbc_connect):
+        """Test keyset reads seek past the last key instead of using OFFSET"""
+        import polars as pl
+
+        mock_conn = MagicMock()
+        mock_cursor = MagicMock()
+        mock_conn.cursor.return_value = mock_cursor
+        mock_pyodbc_connect.return_value = mock_conn
+        mock_cursor.fetchone.return_value = [60]
+        # Primary key lookup returns (index_id, column name) rows
+        mock_cursor.fetchall.return_value = [(1, 'id')]
+
+        transfer = SQLServerToBigQueryTransfer(
+            sql_server="mock-server",
+            sql_database="mock-db",
+            sql_table="mock_table",
+            chunk_size=25,
+            key_path=self.temp_key_file.name,
+            bq_project="test-project",
+            bq_dataset="test_dataset",
+            bq_table="test_table",
+            read_mode="keyset"
+        )
+
+        with patch.object(transfer, '_upload_to_bigquery') as mock_upload:
+            with patch('polars.read_database') as mock_read_database:
+                mock_read_database.side_effect = [
+                    pl.DataFrame({'id': list(range(1, 26))}),
+                    pl.DataFrame({'id': list(range(26, 51))}),
+                    pl.DataFrame({'id': list(range(51, 61))}),
+                ]
+                result = transfer.transfer_data()
+
+                assert result["success"] is True
+                assert result["rows_transferred"] == 60
+                assert mock_upload.call_count == 3
+
+                queries = [c.kwargs['query'] for c in mock_read_database.call_args_list]
+                params = [c.kwargs['execute_options'] for c in mock_read_database.call_args_list]
+                for query in queries:
+                    assert "OFFSET" not in query
+                    assert "ORDER BY [id]" in query
+                assert "WHERE" not in queries[0]
+                assert "WHERE ([id] > ?)" in queries[1]
+                assert params == [None, {"parameters": [25]}, {"parameters": [50]}]
+
+    @patch('pyodbc.connect')
+    @patch('google.oauth2.service_account.Credentials.from_service_account_file')
+    @patch('google.cloud.bigquery.Client.from_service_account_json')
+    def test_keyset_query_composite_key(self, mock_bq_client_from_json, mock_credentials, mock_pyodbc_connect):
+        """Test keyset predicate expansion for composite keys over a custom query"""
+        transfer = SQLServerToBigQueryTransfer(
+            sql_server="mock-server",
+            sql_database="mock-db",
+            sql_query="SELECT * FROM orders",
+            key_path=self.temp_key_file.name,
+            bq_project="test-project",
+            bq_dataset="test_dataset",
+            bq_table="test_table",
+            read_mode="keyset",
+            key_column="region, order_id"
+        )
+
+        query = transfer._build_keyset_query(transfer._resolve_key_columns(), True, 10)
+
+        assert "SELECT TOP (10) subquery.* FROM (SELECT * FROM orders) AS subquery" in query
+        assert ("WHERE (subquery.[region] > ?) OR "
+                "(subquery.[region] = ? AND subquery.[order_id] > ?)") in query
+        assert "ORDER BY subquery.[region], subquery.[order_id]" in query
+
+        with self.assertRaises(ValueError):
+            SQLServerToBigQueryTransfer(
+                sql_server="mock-server",
+                sql_database="mock-db",
+                sql_query="SELECT * FROM orders",
+                key_path=self.temp_key_file.name,
+                read_mode="keyset"
+            )
+
+    @patch('pyodbc.connect')
+    @patch('google.oauth2.service_account.Credentials.from_service_account_file')
+    @patch('google.cloud.bigquery.Client.from_service_account_json')
+    def test_stream_mode(self, mock_bq_client_from_json, mock_credentials, mock_pyodbc_connect):
+        """Test streaming runs the source query once without a COUNT(*)"""
+        import polars as pl
+
+        mock_conn = MagicMock()
+        mock_pyodbc_connect.return_value = mock_conn
+
+        transfer = SQLServerToBigQueryTransfer(
+            sql_server="mock-server",
+            sql_database="mock-db",
+            sql_table="mock_table",
+            chunk_size=25,
+            key_path=self.temp_key_file.name,
+            bq_project="test-project",
+            bq_dataset="test_dataset",
+            bq_table="test_table",
+            read_mode="stream"
+        )
+
+        with patch.object(transfer, '_upload_to_bigquery') as mock_upload:
+            with patch('polars.read_database') as mock_read_database:
+                mock_read_database.return_value = iter([
+                    pl.DataFrame({'id': list(range(25))}),
+                    pl.DataFrame({'id': list(range(25))}),
+                    pl.DataFrame({'id': list(range(5))}),
+                ])
+                result = transfer.transfer_data()
+
+                assert result["success"] is True
+                assert result["rows_transferred"] == 55
+                assert result["total_rows"] == 55
+                mock_read_database.assert_called_once_with(
+                    query="SELECT * FROM mock_table",
+                    connection=mock_conn,
+                    iter_batches=True,
+                    batch_size=25
+                )
+                for call_args in mock_conn.cursor.return_value.execute.call_args_list:
+                    assert "COUNT(*)" not in call_args[0][0]
+                assert [c.args[1] for c in mock_upload.call_args_list] == [True, False, False]
+
+    @patch('pyodbc.connect')
+    @patch('google.oauth2.service_account.Credentials.from_service_account_file')
+    @patch('google.cloud.bigquery.Client.from_service_account_json')
+    def test_pipelined_upload(self, mock_bq_client_from_json, mock_credentials, mock_pyodbc_connect):
+        """Test pipelined uploads load the truncating chunk before any append"""
+        import polars as pl
+
+        mock_pyodbc_connect.return_value = MagicMock()
+
+        transfer = SQLServerToBigQueryTransfer(
+            sql_server="mock-server",
+            sql_database="mock-db",
+            sql_table="mock_table",
+            chunk_size=10,
+            key_path=self.temp_key_file.name,
+            bq_project="test-project",
+            bq_dataset="test_dataset",
+            bq_table="test_table",
+            read_mode="stream",
+            queue_depth=2,
+            upload_workers=3
+        )
+
+        uploads = []
+
+        def record_upload(df, is_first_chunk, on_commit=None):
+            uploads.append(is_first_chunk)
+
+        with patch.object(transfer, '_upload_to_bigquery', side_effect=record_upload):
+            with patch('polars.read_database') as mock_read_database:
+                mock_read_database.return_value = iter(
+                    [pl.DataFrame({'id': list(range(10))}) for _ in range(8)]
+                )
+                result = transfer.transfer_data()
+
+        assert result["success"] is True
+        assert result["rows_transferred"] == 80
+        assert uploads[0] is True
+        assert uploads[1:] == [False] * 7
+
+    @patch('pyodbc.connect')
+    @patch('google.oauth2.service_account.Credentials.from_service_account_file')
+    @patch('google.cloud.bigquery.Client.from_service_account_json')
+    def test_pipelined_upload_failure(self, mock_bq_client_from_json, mock_credentials, mock_pyodbc_connect):
+        """Test an upload failure stops the pipeline and is reported"""
+        import polars as pl
+
+        mock_pyodbc_connect.return_value = MagicMock()
+
+        transfer = SQLServerToBigQueryTransfer(
+            sql_server="mock-server",
+            sql_database="mock-db",
+            sql_table="mock_table",
+            chunk_size=10,
+            key_path=self.temp_key_file.name,
+            bq_project="test-project",
+            bq_dataset="test_dataset",
+            bq_table="test_table",
+            read_mode="stream",
+            queue_depth=1
+        )
+
+        cursor_closed = []
+
+        def batches():
+            try:
+                for _ in range(50):
+                    yield pl.DataFrame({'id': list(range(10))})
+            finally:
+                cursor_closed.append(True)
+
+        with patch.object(transfer, '_upload_to_bigquery', side_effect=[None, RuntimeError("load failed")]):
+            with patch('polars.read_database') as mock_read_database:
+                mock_read_database.return_value = batches()
+                result = transfer.transfer_data()
+
+        assert result["success"] is False
+        assert result["error"] == "load failed"
+        assert result["rows_transferred"] == 10
+        # The reader is closed instead of left suspended on an open cursor
+        assert cursor_closed == [True]
+
+    @patch('pyodbc.connect')
+    @patch('google.oauth2.service_account.Credentials.from_service_account_file')
+    @patch('google.cloud.bigquery.Client.from_service_account_json')
+    def test_plan_partitions(self, mock_bq_client_from_json, mock_credentials, mock_pyodbc_connect):
+        """Test numeric keys are split evenly between MIN and MAX"""
+        mock_conn = MagicMock()
+        mock_pyodbc_connect.return_value = mock_conn
+        mock_conn.cursor.return_value.fetchone.return_value = (1, 101)
+
+        transfer = SQLServerToBigQueryTransfer(
+            sql_server="mock-server",
+            sql_database="mock-db",
+            sql_table="mock_table",
+            key_path=self.temp_key_file.name,
+            bq_project="test-project",
+            bq_dataset="test_dataset",
+            bq_table="test_table",
+            key_column="id",
+            parallelism=4
+        )
+
+        partitions = transfer._plan_partitions("id")
+
+        assert partitions == [(None, 26), (26, 51), (51, 76), (76, None)]
+        mock_conn.cursor.return_value.execute.assert_called_once_with(
+            "SELECT MIN([id]), MAX([id]) FROM mock_table"
+        )
+
+    @patch('pyodbc.connect')
+    def test_extract_partition(self, mock_pyodbc_connect):
+        """Test a partition worker pages through its range and reports completion"""
+        import queue
+        import polars as pl
+        from sql_to_bq.transfer import _extract_partition
+
+        out_queue = queue.Queue()
+        with patch('polars.read_database') as mock_read_database:
+            mock_read_database.side_effect = [
+                pl.DataFrame({'id': [27, 28]}),
+                pl.DataFrame({'id': [29]}),
+            ]
+            _extract_partition("conn", 1, "first", "next", [26, 51], ['id'], 2, out_queue)
+
+            params = [c.kwargs['execute_options'] for c in mock_read_database.call_args_list]
+            assert params == [{"parameters": [26, 51]}, {"parameters": [26, 51, 28]}]
+
+        items = [out_queue.get_nowait() for _ in range(3)]
+        assert [item[0] for item in items] == [1, 1, 1]
+        assert items[0][1].shape[0] == 2
+        assert items[1][1].shape[0] == 1
+        assert "time_taken" in items[2][1]
+        mock_pyodbc_connect.return_value.close.assert_called_once()
+
+    @patch('pyodbc.connect')
+    @patch('google.oauth2.service_account.Credentials.from_service_account_file')
+    @patch('google.cloud.bigquery.Client.from_service_account_json')
+    def test_arrow_odbc_backend(self, mock_bq_client_from_json, mock_credentials, mock_pyodbc_connect):
+        """Test the arrow-odbc backend maps column types to the pyodbc path's dtypes"""
+        import datetime
+        import sys
+        from decimal import Decimal
+        import polars as pl
+        import pyarrow as pa
+
+        batch = pa.RecordBatch.from_pydict({
+            'tiny': pa.array([1, 2], pa.uint8()),
+            'real': pa.array([1.5, 2.5], pa.float32()),
+            'amount': pa.array([Decimal("1.10"), Decimal("2.20")], pa.decimal128(10, 2)),
+            'created': pa.array([datetime.datetime(2024, 1, 1)] * 2, pa.timestamp('ns')),
+            'guid': pa.array(['6F9619FF-8B86-D011-B42D-00C04FC964FF'] * 2, pa.string()),
+            'name': pa.array(['a', 'b'], pa.large_string()),
+            'blob': pa.array([b'\x00', b'\x01'], pa.binary()),
+        })
+        arrow_odbc = MagicMock()
+        arrow_odbc.read_arrow_batches_from_odbc.return_value = iter([batch])
+
+        transfer = SQLServerToBigQueryTransfer(
+            sql_server="mock-server",
+            sql_database="mock-db",
+            sql_table="mock_table",
+            chunk_size=2,
+            key_path=self.temp_key_file.name,
+            bq_project="test-project",
+            bq_dataset="test_dataset",
+            bq_table="test_table",
+            reader_backend="arrow-odbc",
+            odbc_max_text_size=4096
+        )
+
+        with patch.dict(sys.modules, {'arrow_odbc': arrow_odbc}):
+            df = transfer._read_chunk(0, 2)
+
+        assert df.schema == pl.Schema({
+            'tiny': pl.Int64,
+            'real': pl.Float64,
+            'amount': pl.Decimal(10, 2),
+            'created': pl.Datetime('us'),
+            'guid': pl.String,
+            'name': pl.String,
+            'blob': pl.Binary,
+        })
+        kwargs = arrow_odbc.read_arrow_batches_from_odbc.call_args.kwargs
+        assert kwargs['connection_string'] == transfer.conn_str
+        assert kwargs['batch_size'] == 2
+        assert kwargs['max_text_size'] == 4096
+        assert "OFFSET 0 ROWS" in kwargs['query']
+
+    @patch('pyodbc.connect')
+    @patch('google.oauth2.service_account.Credentials.from_service_account_file')
+    @patch('google.cloud.bigquery.Client.from_service_account_json')
+    def test_upload_from_memory_buffer(self, mock_bq_client_from_json, mock_credentials, mock_pyodbc_connect):
+        """Test chunks are uploaded from a spooled buffer that only spills past the limit"""
+        import io
+        import polars as pl
+
+        mock_client = MagicMock()
+        mock_bq_client_from_json.return_value = mock_client
+
+        uploads = []
+
+        def capture_upload(source_file, table_ref, job_config):
+            uploads.append((source_file._rolled, pl.read_parquet(io.BytesIO(source_file.read()))))
+            return MagicMock()
+
+        mock_client.load_table_from_file.side_effect = capture_upload
+
+        transfer = SQLServerToBigQueryTransfer(**self.params)
+        df = pl.DataFrame({'id': list(range(1000)), 'name': ['x' * 100] * 1000})
+
+        transfer._upload_to_bigquery(df, True)
+        transfer.sink.upload_memory_limit_mb = 0
+        transfer._upload_to_bigquery(df, False)
+
+        assert [rolled for rolled, _ in uploads] == [False, True]
+        for _, uploaded in uploads:
+            assert uploaded.equals(df)
+
+    @patch('pyodbc.connect')
+    @patch('google.oauth2.service_account.Credentials.from_service_account_file')
+    @patch('google.cloud.bigquery.Client.from_service_account_json')
+    def test_inflight_load_jobs(self, mock_bq_client_from_json, mock_credentials, mock_pyodbc_connect):
+        """Test appends are left in flight while the truncating load is waited on"""
+        import polars as pl
+        from google.cloud import bigquery
+
+        mock_client = MagicMock()
+        mock_bq_client_from_json.return_value = mock_client
+        jobs = [MagicMock(job_id=f"job-{i}") for i in range(3)]
+        mock_client.load_table_from_file.side_effect = jobs
+
+        transfer = SQLServerToBigQueryTransfer(**{
+            **self.params,
+            'read_mode': 'stream',
+            'chunk_size': 10,
+            'max_inflight_jobs': 2
+        })
+
+        with patch('polars.read_database') as mock_read_database:
+            mock_read_database.return_value = iter(
+                [pl.DataFrame({'id': list(range(10))}) for _ in range(3)]
+            )
+            result = transfer.transfer_data()
+
+        assert result["success"] is True
+        assert result["rows_transferred"] == 30
+        assert result["load_jobs"] == 3
+
+        dispositions = [
+            c.kwargs['job_config'].write_disposition
+            for c in mock_client.load_table_from_file.call_args_list
+        ]
+        assert dispositions == [
+            bigquery.WriteDisposition.WRITE_TRUNCATE,
+            bigquery.WriteDisposition.WRITE_APPEND,
+            bigquery.WriteDisposition.WRITE_APPEND,
+        ]
+        # The truncating job is waited on directly; appends are retired by the poller
+        jobs[0].result.assert_called_once()
+        jobs[0].done.assert_not_called()
+        for job in jobs[1:]:
+            job.done.assert_called()
+
+    @patch('pyodbc.connect')
+    @patch('google.oauth2.service_account.Credentials.from_service_account_file')
+    @patch('google.cloud.bigquery.Client.from_service_account_json')
+    def test_staged_load_batches(self, mock_bq_client_from_json, mock_credentials, mock_pyodbc_connect):
+        """Test staged chunks are coalesced into one load job per byte budget"""
+        import os
+        import polars as pl
+        from google.cloud import bigquery
+
+        mock_client = MagicMock()
+        mock_bq_client_from_json.return_value = mock_client
+
+        loaded = []
+
+        def capture_upload(source_file, table_ref, job_config):
+            loaded.append((pl.read_parquet(source_file), job_config.write_disposition))
+            return MagicMock(job_id=f"job-{len(loaded)}")
+
+        mock_client.load_table_from_file.side_effect = capture_upload
+
+        with tempfile.TemporaryDirectory() as staging_dir:
+            for load_batch_mb, expected_jobs in [(1, 1), (0, 5)]:
+                loaded.clear()
+                transfer = SQLServerToBigQueryTransfer(**{
+                    **self.params,
+                    'read_mode': 'stream',
+                    'chunk_size': 10,
+                    'staging_dir': staging_dir,
+                    'load_batch_mb': load_batch_mb
+                })
+
+                with patch('polars.read_database') as mock_read_database:
+                    mock_read_database.return_value = iter(
+                        [pl.DataFrame({'id': list(range(i * 10, i * 10 + 10))}) for i in range(5)]
+                    )
+                    result = transfer.transfer_data()
+
+                assert result["success"] is True
+                assert result["rows_transferred"] == 50
+                assert result["load_jobs"] == expected_jobs
+                assert sum(job["chunks"] for job in result["load_job_stats"]) == 5
+                assert all(job["bytes"] > 0 for job in result["load_job_stats"])
+                assert pl.concat([df for df, _ in loaded])["id"].to_list() == list(range(50))
+                assert [d for _, d in loaded] == (
+                    [bigquery.WriteDisposition.WRITE_TRUNCATE]
+                    + [bigquery.WriteDisposition.WRITE_APPEND] * (expected_jobs - 1)
+                )
+                assert os.listdir(staging_dir) == []
+
+            # Staged chunks do not count as transferred until their batch is loaded
+            mock_client.load_table_from_file.side_effect = ValueError("load failed")
+            transfer = SQLServerToBigQueryTransfer(**{
+                **self.params,
+                'read_mode': 'stream',
+                'chunk_size': 10,
+                'staging_dir': staging_dir,
+                'load_batch_mb': 1
+            })
+            with patch('polars.read_database') as mock_read_database:
+                mock_read_database.return_value = iter(
+                    [pl.DataFrame({'id': list(range(i * 10, i * 10 + 10))}) for i in range(5)]
+                )
+                result = transfer.transfer_data()
+
+            assert result["success"] is False
+            assert result["rows_transferred"] == 0
+
+    @patch('pyodbc.connect')
+    @patch('google.oauth2.service_account.Credentials.from_service_account_file')
+    @patch('google.cloud.bigquery.Client.from_service_account_json')
+    def test_explicit_schema(self, mock_bq_client_from_json, mock_credentials, mock_pyodbc_connect):
+        """Test chunks are cast to the SQL Server derived schema and loaded without autodetect"""
+        import polars as pl
+
+        mock_conn = MagicMock()
+        mock_pyodbc_connect.return_value = mock_conn
+        mock_conn.cursor.return_value.fetchall.return_value = [
+            ("id", "int", 10, 0, False),
+            ("note", "nvarchar", 0, 0, True),
+        ]
+        mock_client = MagicMock()
+        mock_bq_client_from_json.return_value = mock_client
+
+        loaded = []
+
+        def capture_upload(source_file, table_ref, job_config):
+            loaded.append((pl.read_parquet(source_file), job_config))
+            return MagicMock()
+
+        mock_client.load_table_from_file.side_effect = capture_upload
+
+        with tempfile.TemporaryDirectory() as cache_dir:
+            transfer = SQLServerToBigQueryTransfer(**{
+                **self.params,
+                'read_mode': 'stream',
+                'explicit_schema': True,
+                'schema_cache_dir': cache_dir
+            })
+
+            with patch('polars.read_database') as mock_read_database:
+                # An all-NULL column would otherwise be autodetected differently per chunk
+                mock_read_database.return_value = iter([pl.DataFrame({'id': [1, 2], 'note': [None, None]})])
+                result = transfer.transfer_data()
+
+            assert result["success"] is True
+            df, job_config = loaded[0]
+            assert df.schema == pl.Schema({'id': pl.Int64, 'note': pl.String})
+            assert job_config.autodetect is False
+            assert [(f.name, f.field_type) for f in job_config.schema] == [("id", "INTEGER"), ("note", "STRING")]
+            assert len(os.listdir(cache_dir)) == 1
+
+    @patch('pyodbc.connect')
+    @patch('google.oauth2.service_account.Credentials.from_service_account_file')
+    @patch('google.cloud.bigquery.Client.from_service_account_json')
+    def test_resume_from_checkpoint(self, mock_bq_client_from_json, mock_credentials, mock_pyodbc_connect):
+        """Test a failed keyset transfer resumes after the last committed chunk in append mode"""
+        import polars as pl
+        from google.cloud import bigquery
+
+        mock_conn = MagicMock()
+        mock_pyodbc_connect.return_value = mock_conn
+        mock_conn.cursor.return_value.fetchone.return_value = [60]
+        mock_client = MagicMock()
+        mock_bq_client_from_json.return_value = mock_client
+
+        def chunk(start, stop):
+            return pl.DataFrame({'id': list(range(start, stop))})
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            params = {
+                **self.params,
+                'chunk_size': 25,
+                'read_mode': 'keyset',
+                'key_column': 'id',
+                'checkpoint_file': os.path.join(temp_dir, 'orders.checkpoint.json'),
+            }
+
+            mock_client.load_table_from_file.side_effect = [
+                MagicMock(job_id="job-0"), MagicMock(job_id="job-1"), RuntimeError("load failed")
+            ]
+            with patch('polars.read_database') as mock_read_database:
+                mock_read_database.side_effect = [chunk(1, 26), chunk(26, 51), chunk(51, 61)]
+                result = SQLServerToBigQueryTransfer(**params).transfer_data()
+
+            assert result["success"] is False
+            with open(params['checkpoint_file']) as f:
+                state = json.load(f)
+            assert state["position"] == [50]
+            assert state["rows_loaded"] == 50
+            assert state["last_job_id"] == "job-1"
+
+            # A different key would make the saved position meaningless
+            result = SQLServerToBigQueryTransfer(**{**params, 'key_column': 'order_id'}, resume=True).transfer_data()
+            assert result["success"] is False
+            assert "different transfer" in result["error"]
+
+            mock_client.load_table_from_file.reset_mock()
+            mock_client.load_table_from_file.side_effect = [MagicMock(job_id="job-2")]
+            with patch('polars.read_database') as mock_read_database:
+                mock_read_database.side_effect = [chunk(51, 61)]
+                result = SQLServerToBigQueryTransfer(**params, resume=True).transfer_data()
+
+                assert mock_read_database.call_args.kwargs['execute_options'] == {"parameters": [50]}
+
+            assert result["success"] is True
+            assert result["rows_transferred"] == 10
+            assert result["rows_resumed"] == 50
+            job_config = mock_client.load_table_from_file.call_args.kwargs['job_config']
+            assert job_config.write_disposition == bigquery.WriteDisposition.WRITE_APPEND
+
+            with open(params['checkpoint_file']) as f:
+                state = json.load(f)
+            assert state["completed"] is True
+            assert state["rows_loaded"] == 60
+
+    @patch('pyodbc.connect')
+    @patch('google.oauth2.service_account.Credentials.from_service_account_file')
+    @patch('google.cloud.bigquery.Client.from_service_account_json')
+    def test_incremental_merge(self, mock_bq_client_from_json, mock_credentials, mock_pyodbc_connect):
+        """Test rows past the watermark are staged, merged, and only then advance the watermark"""
+        import datetime
+        import polars as pl
+        from google.cloud import bigquery
+
+        mock_conn = MagicMock()
+        mock_pyodbc_connect.return_value = mock_conn
+        mock_cursor = mock_conn.cursor.return_value
+        mock_client = MagicMock()
+        mock_bq_client_from_json.return_value = mock_client
+        mock_client.get_table.return_value.schema = [
+            bigquery.SchemaField('id', 'INTEGER'), bigquery.SchemaField('modified', 'DATETIME')
+        ]
+
+        first_max = datetime.datetime(2024, 5, 1, 12, 0)
+        second_max = datetime.datetime(2024, 5, 2, 8, 30)
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            params = {
+                **self.params,
+                'write_mode': 'merge',
+                'key_column': 'id',
+                'watermark_column': 'modified',
+                'watermark_state_file': os.path.join(temp_dir, 'orders.watermark.json'),
+            }
+            chunk = pl.DataFrame({'id': [1, 2, 3], 'modified': [first_max] * 3})
+
+            mock_cursor.fetchone.side_effect = [[first_max]]
+            mock_client.query.return_value.num_dml_affected_rows = 3
+            with patch('polars.read_database', return_value=chunk):
+                result = SQLServerToBigQueryTransfer(**params).transfer_data()
+
+            assert result["success"] is True
+            assert result["rows_merged"] == 3
+            assert result["watermark"] == {"previous": None, "current": first_max}
+            load_target = mock_client.load_table_from_file.call_args.args[1]
+            assert load_target == "test-project.test_dataset.test_table_staging"
+            job_config = mock_client.load_table_from_file.call_args.kwargs['job_config']
+            assert job_config.write_disposition == bigquery.WriteDisposition.WRITE_TRUNCATE
+
+            statement = mock_client.query.call_args.args[0]
+            assert statement.startswith("MERGE `test-project.test_dataset.test_table` T")
+            assert "ON T.`id` = S.`id`" in statement
+            mock_client.delete_table.assert_called_once_with(
+                "test-project.test_dataset.test_table_staging", not_found_ok=True
+            )
+
+            # The next run only reads rows past the stored watermark; a failed merge keeps it in place
+            mock_cursor.fetchone.side_effect = [[second_max]]
+            mock_cursor.fetchall.return_value = [("id", "int", 10, 0, False), ("Modified", "datetime", 23, 3, True)]
+            mock_client.query.side_effect = RuntimeError("merge failed")
+            with patch('polars.read_database', return_value=chunk.head(1)) as mock_read_database:
+                result = SQLServerToBigQueryTransfer(**params).transfer_data()
+
+                chunk_query = mock_read_database.call_args.kwargs['query']
+
+            assert result["success"] is False
+            # Bounds on a DATETIME column are compared as DATETIME, not as exact DATETIME2 values
+            assert "[modified] > CAST(CAST('2024-05-01 12:00:00' AS DATETIME2(7)) AS DATETIME)" in chunk_query
+            assert "[modified] <= CAST(CAST('2024-05-02 08:30:00' AS DATETIME2(7)) AS DATETIME)" in chunk_query
+            with open(params['watermark_state_file']) as f:
+                state = json.load(f)
+            assert state["watermark"] == {"type": "datetime", "value": "2024-05-01T12:00:00"}
+
+    def test_watermark_requires_state_file(self):
+        with self.assertRaises(ValueError):
+            SQLServerToBigQueryTransfer(**self.params, write_mode='append', watermark_column='modified')
+
+    @patch('pyodbc.connect')
+    def test_shared_connections(self, mock_pyodbc_connect):
+        """Test passed-in connections are used as-is and the SQL connection is left open"""
+        import polars as pl
+
+        mock_conn = MagicMock()
+        mock_conn.cursor.return_value.fetchone.return_value = [2]
+        mock_client = MagicMock()
+
+        transfer = SQLServerToBigQueryTransfer(**self.params, sql_conn=mock_conn, bq_client=mock_client)
+        with patch('polars.read_database', return_value=pl.DataFrame({'id': [1, 2]})):
+            result = transfer.transfer_data()
+
+        assert result["success"] is True
+        mock_pyodbc_connect.assert_not_called()
+        mock_client.load_table_from_file.assert_called_once()
+        mock_conn.close.assert_not_called()
+
+    @patch('pyodbc.connect')
+    @patch('google.oauth2.service_account.Credentials.from_service_account_file')
+    @patch('google.cloud.bigquery.Client.from_service_account_json')
+    def test_row_estimates(self, mock_bq_client_from_json, mock_credentials, mock_pyodbc_connect):
+        """Test progress estimates come from the catalog unless an exact count is requested"""
+        mock_conn = MagicMock()
+        mock_pyodbc_connect.return_value = mock_conn
+        mock_cursor = mock_conn.cursor.return_value
+        mock_cursor.fetchone.return_value = [5000]
+
+        assert SQLServerToBigQueryTransfer(**self.params)._estimate_total_rows() == 5000
+        assert "sys.dm_db_partition_stats" in mock_cursor.execute.call_args.args[0]
+
+        assert SQLServerToBigQueryTransfer(**self.params, exact_count=True)._estimate_total_rows() == 5000
+        assert mock_cursor.execute.call_args.args[0] == "SELECT COUNT(*) FROM test_table"
+
+        mock_cursor.execute.reset_mock()
+        params = {**self.params, 'sql_table': None, 'sql_query': 'SELECT * FROM orders'}
+        assert SQLServerToBigQueryTransfer(**params)._estimate_total_rows() is None
+        mock_cursor.execute.assert_not_called()
+
+    @patch('pyodbc.connect')
+    @patch('google.oauth2.service_account.Credentials.from_service_account_file')
+    @patch('google.cloud.bigquery.Client.from_service_account_json')
+    def test_memory_budget_chunk_sizes(self, mock_bq_client_from_json, mock_credentials, mock_pyodbc_connect):
+        """Test a memory budget shrinks keyset chunks of wide rows and reports the sizes used"""
+        import polars as pl
+
+        mock_pyodbc_connect.return_value = MagicMock()
+        params = {**self.params, 'chunk_size': 300, 'read_mode': 'keyset', 'key_column': 'id', 'memory_budget_mb': 3}
+
+        def chunk(start, stop):
+            return pl.DataFrame({'id': list(range(start, stop)), 'body': ['x' * 10000] * (stop - start)})
+
+        transfer = SQLServerToBigQueryTransfer(**params)
+        with patch.object(transfer, '_upload_to_bigquery'):
+            with patch('polars.read_database') as mock_read_database:
+                mock_read_database.side_effect = [chunk(0, 300), chunk(300, 457), chunk(457, 460)]
+                result = transfer.transfer_data()
+
+                queries = [c.kwargs['query'] for c in mock_read_database.call_args_list]
+
+        assert result["success"] is True
+        assert result["rows_transferred"] == 460
+        assert result["chunk_sizes"] == [300, 157, 157]
+        assert "TOP (157)" in queries[1]
+        assert "peak_rss_mb" in result
+
+    def test_memory_budget_requires_chunked_reads(self):
+        with self.assertRaises(ValueError):
+            SQLServerToBigQueryTransfer(**self.params, read_mode='stream', memory_budget_mb=512)
+
+    @patch('pyodbc.connect')
+    @patch('google.oauth2.service_account.Credentials.from_service_account_file')
+    @patch('google.cloud.bigquery.Client.from_service_account_json')
+    def test_stage_metrics(self, mock_bq_client_from_json, mock_credentials, mock_pyodbc_connect):
+        """Test per-stage timings are summarised in the result and written as JSON lines"""
+        import polars as pl
+
+        mock_pyodbc_connect.return_value = MagicMock()
+        mock_client = MagicMock()
+        mock_bq_client_from_json.return_value = mock_client
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            metrics_file = os.path.join(temp_dir, 'metrics.jsonl')
+            transfer = SQLServerToBigQueryTransfer(**self.params, metrics_file=metrics_file)
+            with patch('polars.read_database', side_effect=[pl.DataFrame({'id': list(range(10))})]):
+                result = transfer.transfer_data()
+
+            assert result["success"] is True
+            stages = result["stage_metrics"]["stages"]
+            assert set(stages) == {"fetch", "encode", "upload", "job_wait"}
+            assert stages["fetch"]["count"] == 1
+            assert result["mb_uploaded"] * 1024 * 1024 == result["load_job_stats"][0]["bytes"]
+
+            with open(metrics_file) as f:
+                events = [json.loads(line) for line in f]
+            assert [e["event"] for e in events] == ["read", "load_job"]
+            assert events[0]["rows"] == 10
+            assert events[1]["bytes_uploaded"] == result["load_job_stats"][0]["bytes"]
+
+    @patch('pyodbc.connect')
+    @patch('google.oauth2.service_account.Credentials.from_service_account_file')
+    @patch('google.cloud.bigquery.Client.from_service_account_json')
+    def test_parquet_encoding_options(self, mock_bq_client_from_json, mock_credentials, mock_pyodbc_connect):
+        """Test chunks are narrowed and encoded with the configured codec, with sizes reported"""
+        import io
+        import polars as pl
+        import pyarrow.parquet as pq
+
+        mock_pyodbc_connect.return_value = MagicMock()
+        mock_client = MagicMock()
+        mock_bq_client_from_json.return_value = mock_client
+        uploaded = []
+        mock_client.load_table_from_file.side_effect = lambda f, *args, **kwargs: (
+            uploaded.append(f.read()) or MagicMock(job_id="job-1")
+        )
+
+        transfer = SQLServerToBigQueryTransfer(
+            **self.params, parquet_compression='gzip', parquet_row_group_size=5, narrow_types=True
+        )
+        chunk = pl.DataFrame({'id': list(range(10)), 'status': ['open'] * 10})
+        with patch('polars.read_database', side_effect=[chunk]):
+            result = transfer.transfer_data()
+
+        assert result["success"] is True
+        parquet_file = pq.ParquetFile(io.BytesIO(uploaded[0]))
+        assert parquet_file.metadata.num_row_groups == 2
+        assert parquet_file.metadata.row_group(0).column(0).compression == "GZIP"
+        assert parquet_file.schema_arrow.field("id").type == "int32"
+
+        counters = result["stage_metrics"]["counters"]
+        assert counters["bytes_in_memory"] == chunk.estimated_size()
+        assert counters["bytes_narrowed"] < counters["bytes_in_memory"]
+        assert counters["bytes_encoded"] == len(uploaded[0])
+        assert result["mb_narrowed"] * 1024 * 1024 == counters["bytes_narrowed"]
+
+    @patch('pyodbc.connect')
+    @patch('google.oauth2.service_account.Credentials.from_service_account_file')
+    @patch('google.cloud.bigquery.Client.from_service_account_json')
+    def test_chunk_read_retry(self, mock_bq_client_from_json, mock_credentials, mock_pyodbc_connect):
+        """Test a transient read error is retried on a new connection from the same offset"""
+        import polars as pl
+        import pyodbc
+
+        first_conn, second_conn = MagicMock(), MagicMock()
+        mock_pyodbc_connect.side_effect = [first_conn, second_conn]
+        mock_bq_client_from_json.return_value = MagicMock()
+
+        transfer = SQLServerToBigQueryTransfer(**{**self.params, "chunk_size": 2}, retry_backoff=0)
+        with patch('polars.read_database') as mock_read_database:
+            mock_read_database.side_effect = [
+                pl.DataFrame({'id': [1, 2]}),
+                pyodbc.OperationalError("08S01", "Communication link failure"),
+                pl.DataFrame({'id': [3]}),
+            ]
+            result = transfer.transfer_data()
+
+            queries = [c.kwargs['query'] for c in mock_read_database.call_args_list]
+            assert "OFFSET 2 ROWS" in queries[1] and "OFFSET 2 ROWS" in queries[2]
+            assert mock_read_database.call_args_list[2].kwargs['connection'] is second_conn
+
+        assert result["success"] is True
+        assert result["rows_transferred"] == 3
+        assert result["retries"] == {"read": 1}
+        assert result["retry_seconds"] >= 0
+        first_conn.close.assert_called_once()
+
+        # A stream is retried while it has yielded nothing yet
+        third_conn, fourth_conn = MagicMock(), MagicMock()
+        mock_pyodbc_connect.side_effect = [third_conn, fourth_conn]
+        transfer = SQLServerToBigQueryTransfer(**self.params, read_mode='stream', retry_backoff=0)
+        with patch('polars.read_database') as mock_read_database:
+            mock_read_database.side_effect = [
+                pyodbc.OperationalError("08S01", "Communication link failure"),
+                iter([pl.DataFrame({'id': [1, 2]}), pl.DataFrame({'id': [3]})]),
+            ]
+            result = transfer.transfer_data()
+            assert mock_read_database.call_args_list[1].kwargs['connection'] is fourth_conn
+
+        assert result["success"] is True
+        assert result["rows_transferred"] == 3
+        assert result["retries"] == {"read": 1}
+        third_conn.close.assert_called_once()
+
+    @patch('pyodbc.connect')
+    @patch('google.oauth2.service_account.Credentials.from_service_account_file')
+    @patch('google.cloud.bigquery.Client.from_service_account_json')
+    def test_load_job_retry(self, mock_bq_client_from_json, mock_credentials, mock_pyodbc_connect):
+        """Test failed load jobs are resubmitted only when the job itself failed transiently"""
+        import polars as pl
+        from google.api_core import exceptions as api_exceptions
+
+        mock_pyodbc_connect.return_value = MagicMock()
+        mock_client = MagicMock()
+        mock_bq_client_from_json.return_value = mock_client
+
+        failed_job = MagicMock(job_id="job-1", error_result={"reason": "backendError"})
+        failed_job.result.side_effect = api_exceptions.InternalServerError("backend error")
+        good_job = MagicMock(job_id="job-2")
+        uploads = []
+        jobs = iter([failed_job, good_job])
+        mock_client.load_table_from_file.side_effect = lambda f, *args, **kwargs: (
+            uploads.append(f.read()) or next(jobs)
+        )
+
+        transfer = SQLServerToBigQueryTransfer(**self.params, retry_backoff=0)
+        with patch('polars.read_database', side_effect=[pl.DataFrame({'id': [1, 2]})]):
+            result = transfer.transfer_data()
+
+        assert result["success"] is True
+        assert result["retries"] == {"load": 1}
+        assert [stats["job_id"] for stats in result["load_job_stats"]] == ["job-2"]
+        # The resubmitted job uploads the whole file again
+        assert len(uploads) == 2 and uploads[0] == uploads[1]
+
+        # A job whose outcome is unknown may still commit, so it is never loaded twice
+        unknown_job = MagicMock(job_id="job-3", error_result=None)
+        unknown_job.result.side_effect = api_exceptions.ServiceUnavailable("polling failed")
+        mock_client.load_table_from_file.side_effect = None
+        mock_client.load_table_from_file.return_value = unknown_job
+
+        transfer = SQLServerToBigQueryTransfer(**self.params, retry_backoff=0)
+        with patch('polars.read_database', side_effect=[pl.DataFrame({'id': [1, 2]})]):
+            result = transfer.transfer_data()
+
+        assert result["success"] is False
+        assert result["retries"] == {}
+        assert mock_client.load_table_from_file.call_count == 3
+
+    @patch('pyodbc.connect')
+    @patch('google.oauth2.service_account.Credentials.from_service_account_file')
+    @patch('google.cloud.bigquery.Client.from_service_account_json')
+    def test_column_projection(self, mock_bq_client_from_json, mock_credentials, mock_pyodbc_connect):
+        """Test selected columns, casts and filters are pushed into every generated query"""
+        import polars as pl
+
+        mock_conn = MagicMock()
+        mock_pyodbc_connect.return_value = mock_conn
+        mock_cursor = mock_conn.cursor.return_value
+        mock_cursor.fetchall.side_effect = [
+            # Column names used to resolve exclude_columns
+            [("id", "int", 10, 0, False), ("Amount", "decimal", 38, 10, True), ("payload", "varbinary", 0, 0, True)],
+            # Schema of the projected query
+            [("id", "int", 10, 0, False), ("Amount", "decimal", 18, 2, True)],
+        ]
+        mock_cursor.fetchone.return_value = [5]
+        mock_bq_client_from_json.return_value = MagicMock()
+
+        transfer = SQLServerToBigQueryTransfer(
+            **self.params,
+            exclude_columns='payload',
+            column_casts={'amount': 'DECIMAL(18, 2)'},
+            where="status = 'open'",
+            exact_count=True,
+            explicit_schema=True
+        )
+        with patch('polars.read_database') as mock_read_database:
+            mock_read_database.return_value = pl.DataFrame({'id': [1], 'Amount': [1.5]})
+            result = transfer.transfer_data()
+            read_query = mock_read_database.call_args.kwargs['query']
+
+        assert result["success"] is True
+        projected = "SELECT [id], CAST([Amount] AS DECIMAL(18, 2)) AS [Amount] FROM test_table"
+        assert f"FROM ({projected} WHERE (status = 'open')) AS subquery" in read_query
+        assert "payload" not in read_query
+
+        executed = [c.args for c in mock_cursor.execute.call_args_list]
+        assert f"SELECT COUNT(*) FROM ({projected} WHERE (status = 'open')) AS subquery" in [args[0] for args in executed]
+        # The explicit schema is described from the projected query without the row filter
+        assert any("dm_exec_describe_first_result_set" in args[0] and args[1] == projected for args in executed)
+        assert [f.name for f in transfer.bq_schema] == ["id", "Amount"]
+
+    @patch('pyodbc.connect')
+    @patch('google.oauth2.service_account.Credentials.from_service_account_file')
+    @patch('google.cloud.bigquery.Client.from_service_account_json')
+    def test_column_projection_validation(self, mock_bq_client_from_json, mock_credentials, mock_pyodbc_connect):
+        """Test projections keep the columns reads depend on and reject malformed casts"""
+        mock_conn = MagicMock()
+        mock_pyodbc_connect.return_value = mock_conn
+        mock_conn.cursor.return_value.fetchone.return_value = [42]
+        mock_bq_client_from_json.return_value = MagicMock()
+
+        with self.assertRaises(ValueError):
+            SQLServerToBigQueryTransfer(**self.params, columns='id', exclude_columns='payload')
+        with self.assertRaises(ValueError):
+            SQLServerToBigQueryTransfer(**self.params, column_casts={'id': 'INT; DROP TABLE x'})
+        with self.assertRaises(ValueError):
+            SQLServerToBigQueryTransfer(**self.params, columns='id', column_casts={'amount': 'INT'})
+
+        transfer = SQLServerToBigQueryTransfer(**self.params, columns='amount', read_mode='keyset', key_column='id')
+        result = transfer.transfer_data()
+        assert result["success"] is False
+        assert "id must be included in the selected columns" in result["error"]
+
+        # Selecting columns from a table keeps the cheap catalog row estimate
+        transfer = SQLServerToBigQueryTransfer(**self.params, columns='id,amount')
+        transfer._resolve_projection()
+        assert transfer._estimate_total_rows() == 42
+        assert transfer._source_query() == "SELECT [id], [amount] FROM test_table"
+
+    @patch('pyodbc.connect')
+    @patch('google.oauth2.service_account.Credentials.from_service_account_file')
+    @patch('google.cloud.bigquery.Client.from_service_account_json')
+    def test_parquet_sink(self, mock_bq_client_from_json, mock_credentials, mock_pyodbc_connect):
+        """Test a transfer to a local Parquet dataset never connects to BigQuery"""
+        import polars as pl
+
+        mock_conn = MagicMock()
+        mock_pyodbc_connect.return_value = mock_conn
+        mock_conn.cursor.return_value.fetchone.return_value = [4]
+
+        chunks = [pl.DataFrame({'id': [1, 2], 'region': ['eu', 'us']}),
+                  pl.DataFrame({'id': [3, 4], 'region': ['eu', 'eu']}),
+                  pl.DataFrame({'id': [], 'region': []}, schema={'id': pl.Int64, 'region': pl.String})]
+
+        with tempfile.TemporaryDirectory() as sink_path:
+            transfer = SQLServerToBigQueryTransfer(
+                **{**self.params, "chunk_size": 2},
+                sink='parquet',
+                sink_path=sink_path,
+                sink_partition_by='region',
+                queue_depth=2
+            )
+            with patch('polars.read_database', side_effect=chunks):
+                result = transfer.transfer_data()
+
+            assert result["success"] is True, result.get("error")
+            assert result["rows_transferred"] == 4
+            assert result["files_written"] == 3
+            assert result["load_jobs"] == 0
+            written = pl.read_parquet(sink_path, hive_partitioning=True).sort('id')
+            assert written['id'].to_list() == [1, 2, 3, 4]
+            assert written['region'].to_list() == ['eu', 'us', 'eu', 'eu']
+
+        mock_bq_client_from_json.assert_not_called()
+
+        with self.assertRaises(ValueError):
+            SQLServerToBigQueryTransfer(**self.params, sink='parquet')
+        with self.assertRaises(ValueError):
+            SQLServerToBigQueryTransfer(**self.params, sink='storage-write', max_inflight_jobs=2)
+        with self.assertRaises(ValueError):
+            SQLServerToBigQueryTransfer(**self.params, sink='parquet', sink_path='out', narrow_types=True)
+
+    @patch('pyodbc.connect')
+    @patch('google.oauth2.service_account.Credentials.from_service_account_file')
+    @patch('google.cloud.bigquery.Client.from_service_account_json')
+    def test_plan(self, mock_bq_client_from_json, mock_credentials, mock_pyodbc_connect):
+        """Test planning lists the chunk queries and target schema without reading rows"""
+        mock_conn = MagicMock()
+        mock_pyodbc_connect.return_value = mock_conn
+        mock_cursor = mock_conn.cursor.return_value
+        mock_cursor.fetchall.return_value = [("id", "int", 10, 0, False), ("Amount", "decimal", 18, 2, True)]
+        mock_cursor.fetchone.return_value = [2500]
+
+        with tempfile.TemporaryDirectory() as cache_dir:
+            transfer = SQLServerToBigQueryTransfer(
+                **self.params, columns='id,Amount', exact_count=True, schema_cache_dir=cache_dir
+            )
+            with patch('polars.read_database') as mock_read_database:
+                plan = transfer.plan()
+                mock_read_database.assert_not_called()
+            assert os.listdir(cache_dir) == []
+
+        assert plan["read_mode"] == "offset"
+        assert plan["estimated_rows"] == 2500 and plan["chunks"] == 3
+        assert [query["offset"] for query in plan["queries"]] == [0, 1000, 2000]
+        assert "SELECT [id], [Amount] FROM test_table" in plan["queries"][2]["query"]
+        assert "OFFSET 2000 ROWS" in plan["queries"][2]["query"]
+        assert plan["schema"] == [{"name": "id", "type": "INTEGER"}, {"name": "Amount", "type": "NUMERIC"}]
+        assert plan["target"] == "test-project.test_dataset.test_table"
+        mock_conn.close.assert_called_once()
+        mock_bq_client_from_json.assert_not_called()
+
+        transfer = SQLServerToBigQueryTransfer(**self.params, read_mode='keyset', key_column='id', total_rows=10)
+        plan = transfer.plan()
+        assert plan["chunks"] == 1
+        assert "TOP (1000)" in plan["queries"][0]["first"] and "[id] > ?" in plan["queries"][1]["next"]